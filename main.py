@@ -10,8 +10,9 @@ from pygame.math import Vector2
 import settings
 from src import *
 from src.assets import Player, Rectangle
+from src.drawer import Drawer
+from src.game_event_handler import handle_mousebuttondown, quit_game
 from src.neat import *
-from src.quadtree import QuadTree
 from src.utilities import *
 
 pygame.init()
@@ -322,7 +323,7 @@ async def main():
                 HIGH_SCORE
             )
 
-            QUADTREE = QuadTree(region, 4)
+            QUADTREE = get_spatial_index(region)
 
             for player in players_list:
                 if player.failed:
@@ -343,11 +344,12 @@ async def main():
                     QUADTREE.remove(player)
                     continue
 
-                nearby_players = QUADTREE.query(player.vision_boundary)
+                # get_inputs ranks by distance itself, so skip sorting here
+                nearby_players = QUADTREE.query(player.vision_boundary, ordered=False)
                 
                 process_player_collision(nearby_players, player)
 
-                nearby_food = QUADTREE.query(player.vision_boundary, "Food")
+                nearby_food = QUADTREE.query(player.vision_boundary, "Food", ordered=False)
                 for f in nearby_food:
                     if check_collision(f, player):
                         player.add_score(f.value)
@@ -367,8 +369,8 @@ async def main():
                 player.move(output, SCREEN_WIDTH, SCREEN_HEIGHT)
 
                 if player.selected:
-                    selected_player_nearby_players = nearby_players[:3]
-                    selected_player_nearby_food = nearby_food[:3]
+                    selected_player_nearby_players = QUADTREE.query(player.vision_boundary, limit=3)
+                    selected_player_nearby_food = QUADTREE.query(player.vision_boundary, "Food", limit=3)
                 
                 player.peak_score = max(player.score, player.peak_score)
 
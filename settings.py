@@ -19,7 +19,24 @@ game = dict(
     fps = 60,
     num_food = 450,
     max_score = 1000,
-    frame_limit = 2000
+    frame_limit = 2000,
+    spatial_index = "quadtree", # "quadtree" (QuadTree) or "grid" (SpatialHashGrid)
+    grid_cell_size = 0, # Cell size of the grid, 0 for half the players' vision distance
+)
+
+training = dict(
+    headless = False, # Train without a window; also enabled with --headless
+    width = 1920, # Arena size used when there is no display to measure
+    height = 1080,
+    turbo = False, # Step uncapped and only draw some frames; also enabled with --turbo
+    render_every = 10, # In turbo mode, draw every Nth step...
+    render_interval = 0, # ...or, if above 0, one step every this many seconds
+    network_cache_size = 300, # Networks kept for genomes that survive unchanged between generations
+    arena_seed = None, # Seed every arena with this to make evaluation repeatable, None for random arenas
+    fitness_cache_size = 1000, # With an arena seed and several arenas, arenas whose fitnesses are remembered instead of replayed
+    arenas = 1, # Split each generation into this many arenas, played in parallel; with a window one is shown
+    workers = 0, # Processes playing the arenas, 0 for one per CPU
+    steady_state = False, # With several arenas, breed into each arena as it finishes instead of waiting for all of them; none are shown
 )
 
 neat = dict(
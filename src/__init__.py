@@ -1,3 +1,3 @@
-from .drawer import *
-from .game_event_handler import *
-from .getters import *
\ No newline at end of file
+# Rendering modules (drawer, game_event_handler) import pygame and are imported
+# explicitly by the scripts that need them, so src.sim can run headless.
+from .getters import *
@@ -2,3 +2,6 @@ from .boundary_shape import BoundaryShape, Circle, Rectangle
 from .food import Food
 from .particle import Particle
 from .player import Player
+from .shared_world_state import SharedWorldState
+from .vector import Vector2
+from .world_state import WorldState, check_collisions
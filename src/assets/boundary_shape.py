@@ -1,7 +1,7 @@
-import pygame
-from pygame.math import Vector2
+import math
 
 from .particle import Particle
+from .vector import Vector2
 
 
 class BoundaryShape:
@@ -36,13 +36,48 @@ class Rectangle(BoundaryShape):
         Returns:
             bool: True if the particle is contained within the rectangle, False otherwise.
         """
-        x, y = particle.position
-        bx, by = self.position
-        w, h = self.size
-        if x >= bx and x <= bx+w and y >= by and y <= by+h:
-            return True
-        else:
-            return False
+        return self.contains_point(*particle.position)
+
+    def contains_point(self, x: float, y: float) -> bool:
+        """
+        Checks if a point is contained within the rectangle.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+
+        Returns:
+            bool: True if the point is contained within the rectangle, False otherwise.
+        """
+        return self.x <= x <= self.x + self.w and self.y <= y <= self.y + self.h
+
+    def overlaps(self, other: "Rectangle") -> bool:
+        """
+        Checks if the rectangle shares any area, edges included, with another rectangle.
+
+        Args:
+            other (Rectangle): The other rectangle to check.
+
+        Returns:
+            bool: True if the rectangles overlap, False otherwise.
+        """
+        return other.x <= self.x + self.w and self.x <= other.x + other.w and \
+            other.y <= self.y + self.h and self.y <= other.y + other.h
+
+    def distance_to_point(self, x: float, y: float) -> float:
+        """
+        Distance from a point to the nearest point of the rectangle.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+
+        Returns:
+            float: 0 if the point is within the rectangle, the distance to its closest edge otherwise.
+        """
+        dx = max(self.x - x, 0, x - self.x - self.w)
+        dy = max(self.y - y, 0, y - self.y - self.h)
+        return math.hypot(dx, dy)
 
     def intersects(self, other: BoundaryShape) -> bool:
         """
@@ -64,13 +99,15 @@ class Rectangle(BoundaryShape):
         else:
             return False
 
-    def draw(self, screen: pygame.Surface, colour = (255, 255, 255)):
+    def draw(self, screen, colour = (255, 255, 255)):
         """
         Draws the rectangle on the screen.
 
         Args:
             screen (pygame.Surface): The surface to draw on.
         """
+        import pygame
+
         pygame.draw.rect(screen, colour, [self.x, self.y, self.w, self.h], self.line_thickness)
         x = self.center[0]
         y = self.center[1]
@@ -113,5 +150,7 @@ class Circle(BoundaryShape):
 
         return (edges <= self.sqradius)
 
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen):
+        import pygame
+
         pygame.draw.circle(screen, self.color, self.position, self.radius, self.lineThickness)
@@ -1,24 +1,32 @@
 import random
 
-import pygame
-
 import settings as settings
 
 from ..utilities.general import get_random_colour
 from .particle import Particle
+from .world_state import WorldField, WorldState, WorldVector, bind_view
 
 
 class Food(Particle):
     radius = 2
+    position = WorldVector("food_positions")
+    value = WorldField("food_values")
 
-    def __init__(self, position, id):
+    def __init__(self, position, id, world=None, index=0):
+        bind_view(self, world if world is not None else WorldState(0, 1), index, ("food_positions",))
         super().__init__(id, position, self.radius)
+        self._world.food_active[index] = True
         self.name = f"Food_{id}"
         self.value = settings.food["value"]
         self.highlighted = False
         self.highlightColor = None
 
     
+    def attach(self, world, index):
+        """ Move this food item's state into slot index of world and view it there. """
+        world.copy_food(index, self._world, self._index)
+        bind_view(self, world, index, ("food_positions",))
+
     def highlight(self, colour = (255, 192, 203)):
         self.highlighted = True
         self.highlightColor = colour
@@ -33,6 +41,8 @@ class Food(Particle):
         Returns:
         - None
         """
+        import pygame
+
         r, g, b = self.colour
         if self.highlighted:
             r, g, b = self.highlightColor
@@ -1,6 +1,5 @@
 """ This file contains the Particle class. This class is used to create the circles that are used in the game. """
-import pygame
-from pygame.math import Vector2
+from .vector import Vector2
 
 
 class Particle:
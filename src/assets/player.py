@@ -3,8 +3,6 @@ import random
 import time
 
 import numpy as np
-import pygame
-from pygame.math import Vector2
 
 import settings as settings
 
@@ -12,24 +10,41 @@ from ..utilities.ai import adjust_output_with_noise
 from ..utilities.general import conflicting_moves, get_distance, get_random_colour
 from .boundary_shape import Rectangle
 from .particle import Particle
+from .vector import Vector2
+from .world_state import WorldField, WorldState, WorldVector, bind_view
+
 
-pygame.init()
 class Player(Particle):
     
-    font = pygame.font.SysFont(None, 15)
+    font = None # Created on first draw so headless runs never touch pygame
     vision_distance = 200
+
+    # State the game loop updates every frame lives in a WorldState slot
+    position = WorldVector("positions")
+    radius = WorldField("radii")
+    score = WorldField("scores")
+    peak_score = WorldField("peak_scores")
+    speed = WorldField("speeds")
+    angle_input = WorldField("angle_inputs")
+    movement_angle = WorldField("movement_angles")
+    movement_changes = WorldField("movement_changes")
+    players_eaten = WorldField("players_eaten")
+    food_eaten = WorldField("food_eaten")
     
-    def __init__(self, position, id):
+    def __init__(self, position, id, world=None, index=0):
         """
         Initialize a Player object.
 
         Parameters:
         - position (Position): The location of the player     
         - id (int): The id of the player (used to identify the player in the game)
+        - world (WorldState): The world holding this player's state, a new one if None
+        - index (int): The player's slot in the world
         
         Returns:
         - None
         """
+        bind_view(self, world if world is not None else WorldState(1, 0), index, ("positions",))
         super().__init__(id, position, settings.player["base_radius"])
         self.name = f"Player_{id}"
         self.score = 0
@@ -52,17 +67,27 @@ class Player(Particle):
         self.highlightColor = None
         self.movement_angle = 0
         self.angle_in_degrees = 0
-        # New
-        self.vision_boundary = Rectangle(Vector2(position.x - (self.vision_distance // 2) - self.radius, 
-                                                position.y - (self.vision_distance // 2) - self.radius), 
-                                        Vector2(self.vision_distance, 
-                                                self.vision_distance))
         self.nn_outputs = None
         self.movement_changes = 0
         self.no_change_count = 0
         self.punish_score = 1
 
-    def draw(self, screen):
+    def attach(self, world, index):
+        """ Move this player's state into slot index of world and view it there. """
+        world.copy_player(index, self._world, self._index)
+        bind_view(self, world, index, ("positions",))
+
+    @property
+    def failed(self) -> bool:
+        return not self._world.alive[self._index]
+
+    @failed.setter
+    def failed(self, value):
+        self._world.alive[self._index] = not value
+
+    @property
+    def vision_boundary(self) -> Rectangle:
+        """ The area around the player it can see, centred on its current position. """
         _radius = self.radius
         # Calculate the width and height of the rectangle based on vision_distance
         width = self.vision_distance + (2 * _radius)
@@ -72,7 +97,12 @@ class Player(Particle):
         top_left = Vector2(self.position.x - (self.vision_distance //  2) - _radius,  
                         self.position.y - (self.vision_distance //  2) - _radius)
         # Create the Rectangle object using the top-left corner and the width and height
-        self.vision_boundary = Rectangle(Vector2(top_left.x, top_left.y), Vector2(width, height))
+        return Rectangle(top_left, Vector2(width, height))
+
+    def draw(self, screen):
+        import pygame
+
+        _radius = self.radius
         # Create surface to draw the player
         surface = pygame.Surface((_radius*3, _radius*3), pygame.SRCALPHA, 32)
 
@@ -92,6 +122,8 @@ class Player(Particle):
         self.highlighted = False
         # Draw id
         if self.show_name:
+            if Player.font is None:
+                Player.font = pygame.font.SysFont(None, 15)
             text = self.font.render(str(self.id), 1, (255, 255, 255))
             screen.blit(text, (self.position.x - text.get_width() / 2, self.position.y - text.get_height() / 2))
         
@@ -104,45 +136,10 @@ class Player(Particle):
         if self.speed < 0:
             raise ValueError("Player speed must be a positive number.")
 
-        min_speed = 0
         self.nn_outputs = output
-        if self.angle_input != self.nn_outputs[0]:
-            self.movement_changes += 1
-        # else:
-            # self.no_change_count += 1
-        # if self.no_change_count > 150:
-        #     self.punish_score *= 0.9
-        self.angle_input = output[0]
-        # Convert the output between 0 and 1 to an angle in radians
-        angle_in_radians = (output[0] + 1) * math.pi
-
-        # Convert angle to value between 0 and 360
-        self.movement_angle = int(math.degrees(angle_in_radians) % 360)
-
-        self.set_max_speed()
-
-        # Convert the second of two outputs to a speed between 0 and 1
-        # self.speed = max(settings.player["min_speed"], output[1] * self.speed) # SIGMOID
-        # self.speed = round(min_speed + (output[1] + 1) * (settings.player["max_speed"] - min_speed) / 2, 2) # TANH / CLAMPED ACTIVATION FUNCTIONS
+        # Same rules as the whole-population step, applied to this player only
+        self._world.move_all(output[:1], width, height, [self._index])
 
-        # Calculate the new position using anglee
-        new_x = self.position.x  + math.cos(angle_in_radians) * self.speed
-        new_y = self.position.y + math.sin(angle_in_radians) * self.speed
-        
-        # Wrap around the boundaries of the map
-        if new_x < 0:
-            new_x = width
-        elif new_x > width:
-            new_x = 0
-
-        if new_y < 0:
-            new_y = height
-        elif new_y > height:
-            new_y = 0
-
-        self.position.x = new_x
-        self.position.y = new_y
-    
     def move_toward_food(self, food, width, height):
         # Calculate the difference in x and y coordinates
         dx = food.position.x - self.position.x
@@ -173,22 +170,14 @@ class Player(Particle):
         self.position.y = new_y
 
     def add_score(self, value):
-        self.score += math.ceil(value)
-        
-        if self.score >= 60:
-            self.radius = self.base_radius + self.score + math.ceil(value * 0.5)
-        elif self.score >= 90:
-            self.radius = self.base_radius + self.score + math.ceil(value * 0.25)
-        else:
-            self.radius = self.base_radius + self.score
-        self.peak_score = max(self.score, self.peak_score)
+        self._world.add_score(self._index, value)
 
     def highlight(self, colour=(255, 255, 0)):
         self.highlighted = True
         self.highlightColor = colour
 
     def punish(self):
-        self.score = self.score * settings.player['score_reduction'] if self.score >= 0.1 else 0
+        self._world.punish(self._index)
 
     def set_max_speed(self):
         # Ensure speed is a value between min_speed and max_speed based on the player's score
@@ -0,0 +1,85 @@
+""" WorldState stored in shared memory, so other processes can watch an arena. """
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .world_state import WorldState
+
+# Every array starts on a multiple of this many bytes
+ALIGNMENT = 16
+
+
+class SharedWorldState(WorldState):
+    """ WorldState whose arrays are views onto one multiprocessing.shared_memory block.
+
+    The process playing an arena and any process attached to the same block
+    by name see the same positions, radii, scores and food, with nothing
+    copied. Readers get no locking: a frame being stepped may be seen half
+    written, which is fine for drawing and statistics.
+
+    Besides the WorldState arrays the block holds a clock: the frame the
+    arena has reached and whether it has finished.
+    """
+    ARRAYS = ("clock",) + WorldState.PLAYER_ARRAYS + WorldState.FOOD_ARRAYS
+
+    def __init__(self, num_players, num_food, name=None):
+        """
+        Arguments:
+            num_players {int} -- Player slots
+            num_food {int} -- Food slots
+            name {str} -- Block to attach to, as created with the same sizes
+                elsewhere; if None a new block is created, holding the state a
+                new WorldState starts with, and unlinked when this is closed
+        """
+        template = WorldState(num_players, num_food)
+        template.clock = np.zeros(2, dtype=np.int64)
+
+        offsets, size = [], 0
+        for array_name in self.ARRAYS:
+            offsets.append(size)
+            size += -(-getattr(template, array_name).nbytes // ALIGNMENT) * ALIGNMENT
+
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=max(size, 1))
+        for array_name, offset in zip(self.ARRAYS, offsets):
+            array = getattr(template, array_name)
+            view = np.ndarray(array.shape, array.dtype, buffer=self.memory.buf, offset=offset)
+            if self.owner:
+                view[...] = array
+            setattr(self, array_name, view)
+
+    @property
+    def name(self) -> str:
+        """ What to pass to another process's SharedWorldState to attach to this block. """
+        return self.memory.name
+
+    @property
+    def frame(self) -> int:
+        return int(self.clock[0])
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.clock[1])
+
+    def snapshot(self) -> WorldState:
+        """ A private copy of the current state, taken in one go. """
+        world = WorldState(self.num_players, self.num_food)
+        for array_name in self.PLAYER_ARRAYS + self.FOOD_ARRAYS:
+            getattr(world, array_name)[...] = getattr(self, array_name)
+        return world
+
+    def close(self):
+        """ Detach from the block, and free it if this is the process that created it.
+
+        Player and Food views of this world must have been dropped first, or
+        the block stays mapped until they are.
+        """
+        for array_name in self.ARRAYS:
+            setattr(self, array_name, None)
+        try:
+            self.memory.close()
+        except BufferError:
+            pass
+        if self.owner:
+            self.memory.unlink()
+            self.owner = False
@@ -0,0 +1,75 @@
+""" A minimal 2D vector so the game logic does not depend on pygame. """
+import math
+
+
+class Vector2:
+    """ Drop-in subset of pygame.math.Vector2 used by the simulation.
+
+    Only the parts the game logic relies on are implemented: x/y access,
+    unpacking, indexing, equality and distance_to. pygame's own Vector2 can
+    still be passed anywhere a position is expected.
+    """
+    __slots__ = ("x", "y")
+
+    def __init__(self, x=0.0, y=None):
+        if y is None:
+            x, y = x
+        self.x = x
+        self.y = y
+
+    def distance_to(self, other) -> float:
+        ox, oy = other
+        return math.hypot(self.x - ox, self.y - oy)
+
+    def copy(self):
+        return Vector2(self.x, self.y)
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return (self.x, self.y)[index]
+
+    def __eq__(self, other):
+        try:
+            ox, oy = other
+        except (TypeError, ValueError):
+            return NotImplemented
+        return self.x == ox and self.y == oy
+
+    def __str__(self):
+        return f"[{self.x:g}, {self.y:g}]"
+
+    def __repr__(self):
+        return f"Vector2({self.x!r}, {self.y!r})"
+
+
+class Vector2View(Vector2):
+    """ A Vector2 whose x and y live in a row of a NumPy array.
+
+    Writing to x or y writes straight into the array, which is how Player and
+    Food positions stay views onto a WorldState.
+    """
+    __slots__ = ("_row",)
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def x(self):
+        return self._row[0]
+
+    @x.setter
+    def x(self, value):
+        self._row[0] = value
+
+    @property
+    def y(self):
+        return self._row[1]
+
+    @y.setter
+    def y(self, value):
+        self._row[1] = value
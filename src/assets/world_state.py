@@ -0,0 +1,252 @@
+""" Structure-of-arrays storage for the players and food of one arena. """
+import numpy as np
+
+import settings as settings
+
+from .vector import Vector2View
+
+BASE_RADIUS = settings.player["base_radius"]
+EAT_PLAYER_THRESHOLD = settings.player["eat_player_threshold"]
+SCORE_REDUCTION = settings.player["score_reduction"]
+MAX_SPEED = settings.player["max_speed"]
+MIN_SPEED = settings.player["min_speed"]
+SPEED_REDUCTION_RATE = settings.player["speed_reduction_rate"]
+
+
+def check_collisions(positions1, radii1, positions2, radii2):
+    """ Bulk version of check_collision.
+
+    Arguments:
+        positions1 {np.ndarray} -- (n, 2) centres
+        radii1 {np.ndarray | float} -- n radii, or one radius for all
+        positions2 {np.ndarray} -- (m, 2) centres
+        radii2 {np.ndarray | float} -- m radii, or one radius for all
+
+    Returns:
+        np.ndarray -- (n, m) bool matrix, True where the circles touch
+    """
+    delta = positions1[:, None, :] - positions2[None, :, :]
+    distance = np.sqrt((delta * delta).sum(axis=2))
+    threshold = np.add.outer(np.broadcast_to(radii1, len(positions1)),
+                             np.broadcast_to(radii2, len(positions2)))
+    return distance <= threshold
+
+
+class WorldState:
+    """ Contiguous NumPy arrays holding the state of every player and food item.
+
+    Player and Food objects are thin views onto one slot of a WorldState, so
+    per-frame rules can run as a handful of array operations.
+    """
+    PLAYER_ARRAYS = ("positions", "radii", "scores", "peak_scores", "speeds", "alive",
+                     "angle_inputs", "movement_angles", "movement_changes",
+                     "players_eaten", "food_eaten")
+    FOOD_ARRAYS = ("food_positions", "food_values", "food_active")
+
+    def __init__(self, num_players, num_food):
+        self.positions = np.zeros((num_players, 2))
+        self.radii = np.full(num_players, float(BASE_RADIUS))
+        self.scores = np.zeros(num_players)
+        self.peak_scores = np.zeros(num_players)
+        self.speeds = np.full(num_players, float(MAX_SPEED))
+        self.alive = np.ones(num_players, dtype=bool)
+        self.angle_inputs = np.zeros(num_players)
+        self.movement_angles = np.zeros(num_players, dtype=int)
+        self.movement_changes = np.zeros(num_players, dtype=int)
+        self.players_eaten = np.zeros(num_players, dtype=int)
+        self.food_eaten = np.zeros(num_players, dtype=int)
+
+        self.food_positions = np.zeros((num_food, 2))
+        self.food_values = np.full(num_food, float(settings.food["value"]))
+        self.food_active = np.zeros(num_food, dtype=bool)
+
+    @property
+    def num_players(self) -> int:
+        return len(self.positions)
+
+    @property
+    def num_food(self) -> int:
+        return len(self.food_positions)
+
+    def copy_player(self, index, other, other_index):
+        """ Copy one player's state from a slot of another world into this one. """
+        for name in self.PLAYER_ARRAYS:
+            getattr(self, name)[index] = getattr(other, name)[other_index]
+
+    def copy_food(self, index, other, other_index):
+        """ Copy one food item's state from a slot of another world into this one. """
+        for name in self.FOOD_ARRAYS:
+            getattr(self, name)[index] = getattr(other, name)[other_index]
+
+    def add_score(self, indices, values):
+        """ Award points to players, growing them to match.
+
+        indices may be a single index, an index array or a bool mask; an index
+        array must not repeat a player.
+        """
+        values = np.asarray(values, dtype=float)
+        scores = self.scores[indices] + np.ceil(values)
+        bonus = np.where(scores >= 60, np.ceil(values * 0.5), 0)
+        self.scores[indices] = scores
+        self.radii[indices] = BASE_RADIUS + scores + bonus
+        self.peak_scores[indices] = np.maximum(self.peak_scores[indices], scores)
+
+    def punish(self, indices):
+        """ Decay the score of the given players by the per-frame reduction. """
+        scores = self.scores[indices]
+        self.scores[indices] = np.where(scores >= 0.1, scores * SCORE_REDUCTION, 0)
+
+    def move_all(self, outputs, width, height, indices=None):
+        """ Steer and move players from their networks' angle outputs in one pass.
+
+        Arguments:
+            outputs {array-like} -- One angle output in [-1, 1] per moved player
+            width {int} -- Arena width, players leaving it wrap to the other side
+            height {int} -- Arena height
+            indices {array-like} -- Players the outputs belong to, every living
+                player if None
+        """
+        if indices is None:
+            indices = np.flatnonzero(self.alive)
+        indices = np.asarray(indices, dtype=int)
+        outputs = np.asarray(outputs, dtype=float).reshape(len(indices))
+
+        self.movement_changes[indices] += self.angle_inputs[indices] != outputs
+        self.angle_inputs[indices] = outputs
+        # Map the output in [-1, 1] to an angle in radians
+        angles = (outputs + 1) * np.pi
+        self.movement_angles[indices] = np.degrees(angles) % 360
+
+        # Bigger players are slower, down to the minimum speed
+        speeds = (1 - self.scores[indices] / SPEED_REDUCTION_RATE) * MAX_SPEED
+        speeds = np.maximum(speeds, MIN_SPEED)
+        self.speeds[indices] = speeds
+
+        new_x = self.positions[indices, 0] + np.cos(angles) * speeds
+        new_y = self.positions[indices, 1] + np.sin(angles) * speeds
+        # Wrap around the boundaries of the map
+        new_x = np.where(new_x < 0, width, np.where(new_x > width, 0, new_x))
+        new_y = np.where(new_y < 0, height, np.where(new_y > height, 0, new_y))
+        self.positions[indices, 0] = new_x
+        self.positions[indices, 1] = new_y
+
+    def player_collisions(self):
+        """ (n, n) bool matrix of living players touching each other. """
+        touching = check_collisions(self.positions, self.radii, self.positions, self.radii)
+        np.fill_diagonal(touching, False)
+        touching &= self.alive[:, None] & self.alive[None, :]
+        return touching
+
+    def food_collisions(self):
+        """ (n, m) bool matrix of living players touching food on the map. """
+        touching = check_collisions(self.positions, self.radii, self.food_positions, 0.0)
+        touching &= self.alive[:, None] & self.food_active[None, :]
+        return touching
+
+    def eat_players(self):
+        """ Let every player eat the touching players it is big enough to eat.
+
+        A player eaten this frame goes to the biggest player that can eat it,
+        which absorbs its score.
+
+        Returns:
+            tuple -- (eaters, victims) index arrays
+        """
+        can_eat = self.player_collisions()
+        can_eat &= self.radii[:, None] > self.radii[None, :] * (1 + EAT_PLAYER_THRESHOLD)
+        victims = np.flatnonzero(can_eat.any(axis=0))
+        if not victims.size:
+            return victims, victims
+
+        candidate_radii = np.where(can_eat[:, victims], self.radii[:, None], -np.inf)
+        eaters = candidate_radii.argmax(axis=0)
+        gained = np.bincount(eaters, weights=self.scores[victims], minlength=self.num_players)
+        eaten = np.bincount(eaters, minlength=self.num_players)
+
+        winners = np.flatnonzero(eaten)
+        self.add_score(winners, gained[winners])
+        self.players_eaten += eaten
+        self.alive[victims] = False
+        return eaters, victims
+
+    def eat_food(self):
+        """ Let living players eat the food they touch.
+
+        Food touched by several players goes to the one with the highest index,
+        matching the order the game loop has always processed players in.
+
+        Returns:
+            np.ndarray -- Indices of the food that was eaten
+        """
+        touching = self.food_collisions()
+        eaten = np.flatnonzero(touching.any(axis=0))
+        if not eaten.size:
+            return eaten
+
+        eaters = self.num_players - 1 - touching[::-1, eaten].argmax(axis=0)
+        gained = np.bincount(eaters, weights=self.food_values[eaten], minlength=self.num_players)
+        counts = np.bincount(eaters, minlength=self.num_players)
+
+        winners = np.flatnonzero(counts)
+        self.add_score(winners, gained[winners])
+        self.food_eaten += counts
+        self.food_active[eaten] = False
+        return eaten
+
+    def respawn_food(self, width, height, border):
+        """ Place every eaten food item back on the map, clear of any player.
+
+        Returns:
+            np.ndarray -- Indices of the food that was placed
+        """
+        empty = np.flatnonzero(~self.food_active)
+        respawned = empty
+        while empty.size:
+            candidates = np.column_stack((
+                np.random.randint(border, width - border + 1, empty.size),
+                np.random.randint(border, height - border + 1, empty.size),
+            )).astype(float)
+            blocked = check_collisions(candidates, 20.0, self.positions, self.radii).any(axis=1)
+            placed = empty[~blocked]
+            self.food_positions[placed] = candidates[~blocked]
+            self.food_active[placed] = True
+            empty = empty[blocked]
+        return respawned
+
+
+class WorldField:
+    """ Attribute of a view object that is stored in one of its world's arrays. """
+
+    def __init__(self, array_name):
+        self.array_name = array_name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj._world, self.array_name)[obj._index]
+
+    def __set__(self, obj, value):
+        getattr(obj._world, self.array_name)[obj._index] = value
+
+
+class WorldVector:
+    """ Vector2 attribute of a view object, read and written through its world's arrays. """
+
+    def __init__(self, array_name):
+        self.array_name = array_name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._vectors[self.array_name]
+
+    def __set__(self, obj, value):
+        vector = obj._vectors[self.array_name]
+        vector.x, vector.y = value
+
+
+def bind_view(obj, world, index, array_names):
+    """ Point a view object at slot index of world. """
+    obj._world = world
+    obj._index = index
+    obj._vectors = {name: Vector2View(getattr(world, name)[index]) for name in array_names}
@@ -1,5 +1,11 @@
+import time
+
 import pygame
 
+from .game_event_handler import check_for_game_events, quit_game
+from .sim import BaseObserver
+from .utilities import WindowInformationPacket
+
 
 class Drawer:
 
@@ -111,3 +117,121 @@ class Drawer:
         card_x = SCREEN_WIDTH - card_width - 10
         card_y = 10
         self.WIN.blit(card_surface, (card_x, card_y))
+
+
+class SimulationRenderer(BaseObserver):
+    """ Draws a running Simulation to a pygame window and handles its events.
+
+    With a fps_limit of 0 the simulation runs uncapped ("turbo") and only every
+    render_every-th step is drawn, or one step every render_interval seconds of
+    wall-clock time if that is set. Events are still handled on steps that are
+    not drawn, at most every event_interval seconds, so the window keeps
+    responding.
+    """
+
+    def __init__(self, WIN, fps_limit, generation=0, high_score=0, show_quadtree=False,
+                 render_every=1, render_interval=None, event_interval=1 / 60):
+        self.WIN = WIN
+        self.drawer = Drawer(WIN)
+        self.fps_limit = fps_limit
+        self.generation = generation
+        self.high_score = high_score
+        self.show_quadtree = show_quadtree
+        self.render_every = max(1, render_every)
+        self.render_interval = render_interval
+        self.event_interval = event_interval
+        self.clock = None
+        self.last_draw_time = 0
+        self.last_draw_frame = 0
+        self.last_event_time = 0
+
+    def start(self, simulation):
+        self.clock = pygame.time.Clock()
+        self.last_draw_time = self.last_event_time = time.perf_counter()
+        self.last_draw_frame = simulation.frame
+
+    def should_draw(self, simulation, now) -> bool:
+        if self.render_interval:
+            return now - self.last_draw_time >= self.render_interval
+        return simulation.frame % self.render_every == 0
+
+    def should_handle_events(self, now) -> bool:
+        return now - self.last_event_time >= self.event_interval
+
+    def update(self, simulation):
+        now = time.perf_counter()
+        if not self.should_draw(simulation, now):
+            if self.should_handle_events(now):
+                check_for_game_events(simulation.players)
+                self.last_event_time = now
+            return
+
+        check_for_game_events(simulation.players)
+        self.last_event_time = now
+        # Simulated frames per second since the last draw, not draws per second
+        elapsed = now - self.last_draw_time
+        steps = simulation.frame - self.last_draw_frame
+        fps = round(steps / elapsed) if elapsed > 0 else 0
+        self.last_draw_time = now
+        self.last_draw_frame = simulation.frame
+
+        info_packet = WindowInformationPacket(
+            simulation.width,
+            simulation.height,
+            self.generation,
+            fps,
+            simulation.game_time,
+            self.high_score
+        )
+        self.clock.tick(self.fps_limit)
+
+        quadtree = simulation.quadtree if self.show_quadtree else None
+        self.drawer.draw_game(info_packet, simulation.players, simulation.food, quadtree,
+                              simulation.selected_nearby_players, simulation.selected_nearby_food)
+
+
+class SharedWorldWatcher:
+    """ Draws one of the SharedWorldStates MultiArenaEvaluator passes to its watch callback.
+
+    Reads positions, radii, scores and food straight from shared memory while
+    the worker playing the arena steps it. The arena shown follows the number
+    keys; escape quits as in the game.
+    """
+
+    def __init__(self, WIN, generation=0):
+        self.WIN = WIN
+        self.font = pygame.font.SysFont(None, 30)
+        self.generation = generation
+        self.arena = 0
+
+    def __call__(self, worlds):
+        for event in pygame.event.get():
+            if event.type == pygame.KEYDOWN:
+                if pygame.K_1 <= event.key <= pygame.K_9:
+                    self.arena = event.key - pygame.K_1
+                if event.key == pygame.K_ESCAPE:
+                    quit_game()
+        if not worlds:
+            return
+        self.arena = min(self.arena, len(worlds) - 1)
+        world = worlds[self.arena]
+
+        self.WIN.fill((0, 0, 0))
+        max_score = max(world.scores.max(initial=0), 1)
+        for (x, y), radius, score in zip(world.positions[world.alive].tolist(), world.radii[world.alive].tolist(),
+                                         world.scores[world.alive].tolist()):
+            colour = (255 - int(score / max_score * 255), int(score / max_score * 255), 0)
+            pygame.draw.circle(self.WIN, colour, (int(x), int(y)), int(radius), 2)
+        for x, y in world.food_positions[world.food_active].tolist():
+            pygame.draw.circle(self.WIN, (255, 255, 255), (int(x), int(y)), 2, 1)
+
+        text_colour = (255, 255, 255)
+        lines = [
+            f"Arena: {self.arena + 1}/{len(worlds)}",
+            f"Frame: {world.frame}",
+            f"Players Remaining: {int(world.alive.sum())}",
+            f"Generation: {self.generation}",
+        ]
+        for row, line in enumerate(lines):
+            self.WIN.blit(self.font.render(line, True, text_colour), (10, 10 + 30 * row))
+        pygame.display.flip()
@@ -2,17 +2,20 @@
 import math
 import random
 
-import pygame
-from pygame.math import Vector2
-
 import settings
 
-from .assets import Food, Player
+from .assets import Food, Player, Rectangle, Vector2
 from .neat import *
+from .neat.nn import NetworkCache
+from .quadtree import PartitionedIndex, QuadTree, SpatialHashGrid
 
 GAME_BORDER = settings.game["padding"]
 FOOD_DETECTION = settings.player["food_detection"]
 PLAYER_DETECTION = settings.player["player_detection"]
+SPATIAL_INDEX = settings.game.get("spatial_index", "quadtree")
+
+# Elites and clones keep their network from one generation to the next
+NETWORK_CACHE = NetworkCache(nn.create, settings.training["network_cache_size"])
 
 def get_inputs(player, players_list, food_list):
     # TODO: Refactor this for better readability
@@ -32,6 +35,30 @@ def get_inputs(player, players_list, food_list):
     return inputs
 
 
+def get_knn_inputs(player, nearest_players, nearest_food):
+    """Builds the same inputs as get_inputs from the results of spatial index knn queries.
+
+    Args:
+        player (Player): The player the inputs are for.
+        nearest_players (list): (edge distance, player) pairs, nearest first.
+        nearest_food (list): (edge distance, food) pairs, nearest first.
+
+    Returns:
+        tuple: Position, player distances, whether each player is smaller and food distances.
+    """
+    # Fill the slots nothing was seen for with 9999
+    player_distances = [d for d, _ in nearest_players] + [9999] * (PLAYER_DETECTION - len(nearest_players))
+    player_bools = [player.radius > p.radius for _, p in nearest_players] + [0] * (PLAYER_DETECTION - len(nearest_players))
+    food_distances = [d for d, _ in nearest_food] + [9999] * (FOOD_DETECTION - len(nearest_food))
+
+    return tuple(
+        [player.position.x, player.position.y]
+        + player_distances
+        + player_bools
+        + food_distances
+    )
+
+
 # Create a function that measures the distance between the_player and each player in the list from the edge of the_player's circle to the edge of the other player's circle
 # This function will be used to determine the nearest players to the_player
 def get_nearest_particle_distances(the_player, players):
@@ -109,9 +136,9 @@ def get_neat_components(genomes, config, w, h) -> dict:
         counter += 1    
 
         # Create a neural network for each genome
-        model = nn.create(
+        model = NETWORK_CACHE.get(
             genome, config
-        )  # Set up the neural network for each genome using the configuration we set
+        )  # Set up the neural network for each genome, reusing it if the genome is unchanged
         models_list.append(model)  # Append the neural network in the list
 
     # Return a dictionary of lists
@@ -169,3 +196,21 @@ def get_fitness_components(player):
             player.distance_travelled * weights["distance_travelled"]
         ),
     }
+
+
+def get_spatial_index(region: Rectangle):
+    """Returns an empty spatial index covering region, of the kind chosen in settings.
+
+    Each particle type gets its own QuadTree or SpatialHashGrid inside it.
+
+    Args:
+        region (Rectangle): The area of the game.
+
+    Returns:
+        PartitionedIndex: The index the game loop inserts particles into.
+    """
+    if SPATIAL_INDEX == "grid":
+        return PartitionedIndex(region, lambda: SpatialHashGrid(region, settings.game["grid_cell_size"]))
+    if SPATIAL_INDEX == "quadtree":
+        return PartitionedIndex(region, lambda: QuadTree(region, 4))
+    raise ValueError(f"Unknown spatial index {SPATIAL_INDEX!r}, expected 'grid' or 'quadtree'")
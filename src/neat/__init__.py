@@ -2,6 +2,7 @@
 import os
 import sys
 
+from .array_genome import ArrayGenome
 from .checkpoint import Checkpointer
 from .config import Config
 from .ctrnn import CTRNN as ctrnn
@@ -11,7 +12,7 @@ from .distributed import host_is_local
 from .genome import DefaultGenome
 from .iznn import IZNN as iznn
 from .nn import FeedForwardNetwork as nn
-from .parallel import ParallelEvaluator
+from .parallel import ParallelEvaluator, PersistentEvaluator
 from .population import CompleteExtinctionException, Population
 from .reporting import StdOutReporter
 from .reproduction import DefaultReproduction
@@ -0,0 +1,453 @@
+"""
+A genome whose genes are stored as parallel NumPy arrays instead of dicts of
+gene objects, so crossover, attribute mutation and distance run as a handful of
+array operations.
+"""
+from collections.abc import Mapping
+from random import choice, random
+
+import numpy as np
+
+from .genes import DefaultConnectionGene, DefaultNodeGene
+from .genome import DefaultGenome
+from .graphs import creates_cycle
+
+# The attributes the arrays hold, as the gene classes define them
+ATTRIBUTES = dict((a.name, a) for a in DefaultNodeGene._gene_attributes + DefaultConnectionGene._gene_attributes)
+
+
+def connection_codes(inputs, outputs):
+    """ Packs (input, output) keys into int64s that sort like the key tuples; outputs are never negative. """
+    return (np.asarray(inputs, dtype=np.int64) << 32) + np.asarray(outputs, dtype=np.int64)
+
+
+def connection_keys(codes):
+    """ Unpacks connection_codes back into (inputs, outputs) arrays. """
+    return codes >> 32, codes & 0xFFFFFFFF
+
+
+def name_table(config, attribute):
+    """ Every name a string attribute such as activation can take, in a fixed order. """
+    names = list(getattr(config, attribute + '_options'))
+    default = getattr(config, attribute + '_default')
+    if default.lower() not in ('none', 'random'):
+        names.append(default)
+    return tuple(dict.fromkeys(names))
+
+
+def mutate_names(ids, attribute, config, names):
+    """ StringAttribute.mutate_value applied to every name id at once. """
+    mutate_rate = getattr(config, attribute + '_mutate_rate')
+    if mutate_rate <= 0:
+        return ids
+    mutated = np.random.random(len(ids)) < mutate_rate
+    if not mutated.any():
+        return ids
+    options = np.array([names.index(o) for o in getattr(config, attribute + '_options')], dtype=ids.dtype)
+    ids = ids.copy()
+    ids[mutated] = np.random.choice(options, int(mutated.sum()))
+    return ids
+
+
+def matching_positions(keys1, keys2):
+    """ For each of keys1, where it is or would go in keys2, and whether it is there; both are sorted. """
+    if not len(keys2):
+        return np.zeros(len(keys1), dtype=np.intp), np.zeros(len(keys1), dtype=bool)
+    positions = np.minimum(np.searchsorted(keys2, keys1), len(keys2) - 1)
+    return positions, keys2[positions] == keys1
+
+
+def homologous_genes(keys1, keys2):
+    """ Indices into keys1 and keys2 of the keys both contain. """
+    positions, homologous = matching_positions(keys1, keys2)
+    return np.flatnonzero(homologous), positions[homologous]
+
+
+def inherit(values1, values2, homologous, positions):
+    """ BaseGene.crossover for one attribute: homologous genes take either parent's value at random. """
+    values = values1.copy()
+    from_parent2 = homologous & (np.random.random(len(values1)) <= 0.5)
+    values[from_parent2] = values2[positions[from_parent2]]
+    return values
+
+
+class NodeGenes(Mapping):
+    """ Read-only view of an ArrayGenome's nodes as DefaultNodeGene objects, for code written against DefaultGenome. """
+
+    def __init__(self, genome):
+        self.genome = genome
+
+    def __len__(self):
+        return len(self.genome.node_keys)
+
+    def __iter__(self):
+        return iter(self.genome.node_keys.tolist())
+
+    def __contains__(self, key):
+        return self.genome.node_index(key) >= 0
+
+    def __getitem__(self, key):
+        g = self.genome
+        i = g.node_index(key)
+        if i < 0:
+            raise KeyError(key)
+        gene = DefaultNodeGene(int(key))
+        gene.bias = float(g.bias[i])
+        gene.response = float(g.response[i])
+        gene.activation = g.activation_names[g.activation[i]]
+        gene.aggregation = g.aggregation_names[g.aggregation[i]]
+        return gene
+
+
+class ConnectionGenes(Mapping):
+    """ Read-only view of an ArrayGenome's connections as DefaultConnectionGene objects. """
+
+    def __init__(self, genome):
+        self.genome = genome
+
+    def __len__(self):
+        return len(self.genome.connection_codes)
+
+    def __iter__(self):
+        inputs, outputs = connection_keys(self.genome.connection_codes)
+        return zip(inputs.tolist(), outputs.tolist())
+
+    def __contains__(self, key):
+        return self.genome.connection_index(key) >= 0
+
+    def __getitem__(self, key):
+        g = self.genome
+        i = g.connection_index(key)
+        if i < 0:
+            raise KeyError(key)
+        gene = DefaultConnectionGene((int(key[0]), int(key[1])))
+        gene.weight = float(g.weight[i])
+        gene.enabled = bool(g.enabled[i])
+        return gene
+
+
+class ArrayGenome(object):
+    """
+    Drop-in alternative to DefaultGenome, configured from the same parameters,
+    that keeps its genes in parallel arrays sorted by key: node keys, biases,
+    responses and activation/aggregation ids, and connection keys, weights and
+    enabled flags.
+
+    Mutation and crossover follow DefaultGenome's rules, but attribute values
+    are drawn from NumPy's global random generator, so a seeded run does not
+    reproduce DefaultGenome's genomes. nodes and connections are read-only
+    views; change genes through the genome's methods.
+    """
+
+    @classmethod
+    def parse_config(cls, param_dict):
+        return DefaultGenome.parse_config(param_dict)
+
+    @classmethod
+    def write_config(cls, f, config):
+        DefaultGenome.write_config(f, config)
+
+    def __init__(self, key):
+        # Unique identifier for a genome instance.
+        self.key = key
+
+        self.node_keys = np.empty(0, dtype=np.int64)
+        self.bias = np.empty(0)
+        self.response = np.empty(0)
+        self.activation = np.empty(0, dtype=np.int16)
+        self.aggregation = np.empty(0, dtype=np.int16)
+        self.activation_names = ()
+        self.aggregation_names = ()
+
+        self.connection_codes = np.empty(0, dtype=np.int64)
+        self.weight = np.empty(0)
+        self.enabled = np.empty(0, dtype=bool)
+
+        # Fitness results.
+        self.fitness = None
+
+    @property
+    def nodes(self):
+        return NodeGenes(self)
+
+    @property
+    def connections(self):
+        return ConnectionGenes(self)
+
+    def node_index(self, key):
+        """ Position of a node key in the arrays, or -1. """
+        i = int(np.searchsorted(self.node_keys, key))
+        return i if i < len(self.node_keys) and self.node_keys[i] == key else -1
+
+    def connection_index(self, key):
+        """ Position of an (input, output) key in the arrays, or -1. """
+        code = int(connection_codes(*key))
+        i = int(np.searchsorted(self.connection_codes, code))
+        return i if i < len(self.connection_codes) and self.connection_codes[i] == code else -1
+
+    def set_genes(self, nodes, connections, config):
+        """ Replaces the genes with those in dicts of node and connection gene objects. """
+        self.activation_names = name_table(config, 'activation')
+        self.aggregation_names = name_table(config, 'aggregation')
+
+        nodes = sorted(nodes.items())
+        self.node_keys = np.array([k for k, _ in nodes], dtype=np.int64)
+        self.bias = np.array([ng.bias for _, ng in nodes], dtype=float)
+        self.response = np.array([ng.response for _, ng in nodes], dtype=float)
+        self.activation = np.array([self.activation_names.index(ng.activation) for _, ng in nodes], dtype=np.int16)
+        self.aggregation = np.array([self.aggregation_names.index(ng.aggregation) for _, ng in nodes], dtype=np.int16)
+
+        connections = sorted(connections.items())
+        self.connection_codes = connection_codes([i for (i, _), _ in connections], [o for (_, o), _ in connections])
+        self.weight = np.array([cg.weight for _, cg in connections], dtype=float)
+        self.enabled = np.array([cg.enabled for _, cg in connections], dtype=bool)
+
+    @classmethod
+    def from_genome(cls, genome, config):
+        """ Creates an ArrayGenome with the same key, fitness and genes as a DefaultGenome. """
+        new_genome = cls(genome.key)
+        new_genome.set_genes(genome.nodes, genome.connections, config)
+        new_genome.fitness = genome.fitness
+        return new_genome
+
+    def to_genome(self):
+        """ Returns a DefaultGenome with the same key, fitness and genes. """
+        genome = DefaultGenome(self.key)
+        genome.nodes = dict(self.nodes.items())
+        genome.connections = dict(self.connections.items())
+        genome.fitness = self.fitness
+        return genome
+
+    def configure_new(self, config):
+        """Configure a new genome based on the given configuration."""
+        # The initial topology is built exactly as DefaultGenome builds it
+        genome = DefaultGenome(self.key)
+        genome.configure_new(config)
+        self.set_genes(genome.nodes, genome.connections, config)
+
+    def configure_crossover(self, genome1, genome2, config):
+        """ Configure a new genome by crossover from two parent genomes. """
+        if genome1.fitness > genome2.fitness:
+            parent1, parent2 = genome1, genome2
+        else:
+            parent1, parent2 = genome2, genome1
+
+        # Genes only the fittest parent has are copied; homologous genes mix both.
+        positions, homologous = matching_positions(parent1.connection_codes, parent2.connection_codes)
+        self.connection_codes = parent1.connection_codes.copy()
+        self.weight = inherit(parent1.weight, parent2.weight, homologous, positions)
+        self.enabled = inherit(parent1.enabled, parent2.enabled, homologous, positions)
+
+        positions, homologous = matching_positions(parent1.node_keys, parent2.node_keys)
+        self.node_keys = parent1.node_keys.copy()
+        self.bias = inherit(parent1.bias, parent2.bias, homologous, positions)
+        self.response = inherit(parent1.response, parent2.response, homologous, positions)
+        self.activation = inherit(parent1.activation, parent2.activation, homologous, positions)
+        self.aggregation = inherit(parent1.aggregation, parent2.aggregation, homologous, positions)
+        self.activation_names = parent1.activation_names
+        self.aggregation_names = parent1.aggregation_names
+
+    def mutate(self, config):
+        """ Mutates this genome. """
+
+        if config.single_structural_mutation:
+            div = max(1, (config.node_add_prob + config.node_delete_prob +
+                          config.conn_add_prob + config.conn_delete_prob))
+            r = random()
+            if r < (config.node_add_prob / div):
+                self.mutate_add_node(config)
+            elif r < ((config.node_add_prob + config.node_delete_prob) / div):
+                self.mutate_delete_node(config)
+            elif r < ((config.node_add_prob + config.node_delete_prob +
+                       config.conn_add_prob) / div):
+                self.mutate_add_connection(config)
+            elif r < ((config.node_add_prob + config.node_delete_prob +
+                       config.conn_add_prob + config.conn_delete_prob) / div):
+                self.mutate_delete_connection()
+        else:
+            if random() < config.node_add_prob:
+                self.mutate_add_node(config)
+
+            if random() < config.node_delete_prob:
+                self.mutate_delete_node(config)
+
+            if random() < config.conn_add_prob:
+                self.mutate_add_connection(config)
+
+            if random() < config.conn_delete_prob:
+                self.mutate_delete_connection()
+
+        self.mutate_attributes(config)
+
+    def mutate_attributes(self, config):
+        """ Mutates every connection's weight and enabled flag and every node's attributes. """
+        self.weight = ATTRIBUTES['weight'].mutate_values(self.weight, config)
+        self.enabled = ATTRIBUTES['enabled'].mutate_values(self.enabled, config)
+        self.bias = ATTRIBUTES['bias'].mutate_values(self.bias, config)
+        self.response = ATTRIBUTES['response'].mutate_values(self.response, config)
+        self.activation = mutate_names(self.activation, 'activation', config, self.activation_names)
+        self.aggregation = mutate_names(self.aggregation, 'aggregation', config, self.aggregation_names)
+
+    def insert_node(self, node):
+        """ Adds a DefaultNodeGene's values to the arrays. """
+        i = int(np.searchsorted(self.node_keys, node.key))
+        self.node_keys = np.insert(self.node_keys, i, node.key)
+        self.bias = np.insert(self.bias, i, node.bias)
+        self.response = np.insert(self.response, i, node.response)
+        self.activation = np.insert(self.activation, i, self.activation_names.index(node.activation))
+        self.aggregation = np.insert(self.aggregation, i, self.aggregation_names.index(node.aggregation))
+
+    def insert_connection(self, key, weight, enabled):
+        """ Adds a connection, or overwrites it if the key is already present. """
+        code = int(connection_codes(*key))
+        i = int(np.searchsorted(self.connection_codes, code))
+        if i < len(self.connection_codes) and self.connection_codes[i] == code:
+            self.weight[i] = weight
+            self.enabled[i] = enabled
+            return
+        self.connection_codes = np.insert(self.connection_codes, i, code)
+        self.weight = np.insert(self.weight, i, weight)
+        self.enabled = np.insert(self.enabled, i, enabled)
+
+    def delete_connections(self, mask):
+        keep = ~mask
+        self.connection_codes = self.connection_codes[keep]
+        self.weight = self.weight[keep]
+        self.enabled = self.enabled[keep]
+
+    def mutate_add_node(self, config):
+        if not len(self.connection_codes):
+            if config.check_structural_mutation_surer():
+                self.mutate_add_connection(config)
+            return
+
+        # Choose a random connection to split
+        split = choice(range(len(self.connection_codes)))
+        new_node_id = config.get_new_node_key(self.nodes)
+        self.insert_node(DefaultGenome.create_node(config, new_node_id))
+
+        # Disable this connection and create two new connections joining its nodes via
+        # the given node.  The new node+connections have roughly the same behavior as
+        # the original connection (depending on the activation function of the new node).
+        self.enabled[split] = False
+        weight = float(self.weight[split])
+        i, o = (int(k) for k in connection_keys(self.connection_codes[split]))
+        self.add_connection(config, i, new_node_id, 1.0, True)
+        self.add_connection(config, new_node_id, o, weight, True)
+
+    def add_connection(self, config, input_key, output_key, weight, enabled):
+        assert isinstance(input_key, int)
+        assert isinstance(output_key, int)
+        assert output_key >= 0
+        assert isinstance(enabled, bool)
+        self.insert_connection((input_key, output_key), weight, enabled)
+
+    def mutate_add_connection(self, config):
+        """
+        Attempt to add a new connection, the only restriction being that the output
+        node cannot be one of the network input pins.
+        """
+        possible_outputs = self.node_keys.tolist()
+        out_node = choice(possible_outputs)
+
+        possible_inputs = possible_outputs + config.input_keys
+        in_node = choice(possible_inputs)
+
+        # Don't duplicate connections.
+        key = (in_node, out_node)
+        i = self.connection_index(key)
+        if i >= 0:
+            if config.check_structural_mutation_surer():
+                self.enabled[i] = True
+            return
+
+        # Don't allow connections between two output nodes
+        if in_node in config.output_keys and out_node in config.output_keys:
+            return
+
+        # For feed-forward networks, avoid creating cycles.
+        if config.feed_forward and creates_cycle(self.connections, key):
+            return
+
+        cg = DefaultGenome.create_connection(config, in_node, out_node)
+        self.insert_connection(key, cg.weight, cg.enabled)
+
+    def mutate_delete_node(self, config):
+        # Do nothing if there are no non-output nodes.
+        available_nodes = [k for k in self.node_keys.tolist() if k not in config.output_keys]
+        if not available_nodes:
+            return -1
+
+        del_key = choice(available_nodes)
+        inputs, outputs = connection_keys(self.connection_codes)
+        self.delete_connections((inputs == del_key) | (outputs == del_key))
+
+        keep = self.node_keys != del_key
+        self.node_keys = self.node_keys[keep]
+        self.bias = self.bias[keep]
+        self.response = self.response[keep]
+        self.activation = self.activation[keep]
+        self.aggregation = self.aggregation[keep]
+
+        return del_key
+
+    def mutate_delete_connection(self):
+        if len(self.connection_codes):
+            mask = np.zeros(len(self.connection_codes), dtype=bool)
+            mask[choice(range(len(mask)))] = True
+            self.delete_connections(mask)
+
+    def distance(self, other, config):
+        """
+        Returns the genetic distance between this genome and the other. This distance value
+        is used to compute genome compatibility for speciation.
+        """
+
+        # Compute node gene distance component.
+        node_distance = 0.0
+        if len(self.node_keys) or len(other.node_keys):
+            i0, i1 = homologous_genes(self.node_keys, other.node_keys)
+            d = np.abs(self.bias[i0] - other.bias[i1]) + np.abs(self.response[i0] - other.response[i1])
+            d = d + (self.activation[i0] != other.activation[i1])
+            d = d + (self.aggregation[i0] != other.aggregation[i1])
+            disjoint_nodes = len(self.node_keys) + len(other.node_keys) - 2 * len(i0)
+            max_nodes = max(len(self.node_keys), len(other.node_keys))
+            node_distance = (float(d.sum()) * config.compatibility_weight_coefficient +
+                             (config.compatibility_disjoint_coefficient * disjoint_nodes)) / max_nodes
+
+        # Compute connection gene differences.
+        connection_distance = 0.0
+        if len(self.connection_codes) or len(other.connection_codes):
+            i0, i1 = homologous_genes(self.connection_codes, other.connection_codes)
+            d = np.abs(self.weight[i0] - other.weight[i1]) + (self.enabled[i0] != other.enabled[i1])
+            disjoint_connections = len(self.connection_codes) + len(other.connection_codes) - 2 * len(i0)
+            max_conn = max(len(self.connection_codes), len(other.connection_codes))
+            connection_distance = (float(d.sum()) * config.compatibility_weight_coefficient +
+                                   (config.compatibility_disjoint_coefficient * disjoint_connections)) / max_conn
+
+        distance = node_distance + connection_distance
+        return distance
+
+    def size(self):
+        """
+        Returns genome 'complexity', taken to be
+        (number of nodes, number of enabled connections)
+        """
+        return len(self.node_keys), int(self.enabled.sum())
+
+    def structural_key(self):
+        """ Same contract as DefaultGenome.structural_key, built from the arrays' bytes. """
+        return (self.node_keys.tobytes(), self.bias.tobytes(), self.response.tobytes(),
+                tuple(self.activation_names[i] for i in self.activation.tolist()),
+                tuple(self.aggregation_names[i] for i in self.aggregation.tolist()),
+                self.connection_codes[self.enabled].tobytes(), self.weight[self.enabled].tobytes())
+
+    def structural_hash(self):
+        """ Same contract as DefaultGenome.structural_hash. """
+        return hash(self.structural_key())
+
+    def __str__(self):
+        return str(self.to_genome())
+
+    def get_pruned_copy(self, genome_config):
+        return self.to_genome().get_pruned_copy(genome_config)
@@ -1,6 +1,8 @@
 """Deals with the attributes (variable parameters) of genes"""
 from random import choice, gauss, randint, random, uniform
 
+import numpy as np
+
 from .config import ConfigParameter
 
 # TODO: There is probably a lot of room for simplification of these classes using metaprogramming.
@@ -78,6 +80,44 @@ class FloatAttribute(BaseAttribute):
 
         return value
 
+    def init_values(self, config, n):
+        """ n values drawn as init_value draws them, as a NumPy array. """
+        mean = getattr(config, self.init_mean_name)
+        stdev = getattr(config, self.init_stdev_name)
+        init_type = getattr(config, self.init_type_name).lower()
+
+        if ('gauss' in init_type) or ('normal' in init_type):
+            return np.clip(np.random.normal(mean, stdev, n),
+                           getattr(config, self.min_value_name), getattr(config, self.max_value_name))
+
+        if 'uniform' in init_type:
+            min_value = max(getattr(config, self.min_value_name),
+                            (mean - (2 * stdev)))
+            max_value = min(getattr(config, self.max_value_name),
+                            (mean + (2 * stdev)))
+            return np.random.uniform(min_value, max_value, n)
+
+        raise RuntimeError(f"Unknown init_type {getattr(config, self.init_type_name)!r} for {self.init_type_name!s}")
+
+    def mutate_values(self, values, config):
+        """ mutate_value applied to a sequence of values, drawing each random step for all of them at once. """
+        values = np.array(values, dtype=float)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        replace_rate = getattr(config, self.replace_rate_name)
+
+        r = np.random.random(len(values))
+        mutated = np.flatnonzero(r < mutate_rate)
+        if mutated.size:
+            mutate_power = getattr(config, self.mutate_power_name)
+            values[mutated] = np.clip(values[mutated] + np.random.normal(0.0, mutate_power, mutated.size),
+                                      getattr(config, self.min_value_name), getattr(config, self.max_value_name))
+
+        replaced = np.flatnonzero((r >= mutate_rate) & (r < replace_rate + mutate_rate))
+        if replaced.size:
+            values[replaced] = self.init_values(config, replaced.size)
+
+        return values
+
     def validate(self, config):
         min_value = getattr(config, self.min_value_name)
         max_value = getattr(config, self.max_value_name)
@@ -122,6 +162,32 @@ class IntegerAttribute(BaseAttribute):
 
         return value
 
+    def init_values(self, config, n):
+        """ n values drawn as init_value draws them, as a NumPy array. """
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        return np.random.randint(min_value, max_value + 1, n)
+
+    def mutate_values(self, values, config):
+        """ mutate_value applied to a sequence of values, drawing each random step for all of them at once. """
+        values = np.array(values, dtype=int)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        replace_rate = getattr(config, self.replace_rate_name)
+
+        r = np.random.random(len(values))
+        mutated = np.flatnonzero(r < mutate_rate)
+        if mutated.size:
+            mutate_power = getattr(config, self.mutate_power_name)
+            steps = np.rint(np.random.normal(0.0, mutate_power, mutated.size)).astype(int)
+            values[mutated] = np.clip(values[mutated] + steps,
+                                      getattr(config, self.min_value_name), getattr(config, self.max_value_name))
+
+        replaced = np.flatnonzero((r >= mutate_rate) & (r < replace_rate + mutate_rate))
+        if replaced.size:
+            values[replaced] = self.init_values(config, replaced.size)
+
+        return values
+
     def validate(self, config):
         min_value = getattr(config, self.min_value_name)
         max_value = getattr(config, self.max_value_name)
@@ -167,6 +233,18 @@ class BoolAttribute(BaseAttribute):
 
         return value
 
+    def mutate_values(self, values, config):
+        """ mutate_value applied to a sequence of values, drawing each random step for all of them at once. """
+        values = np.array(values, dtype=bool)
+        mutate_rate = getattr(config, self.mutate_rate_name) + np.where(
+            values, getattr(config, self.rate_to_false_add_name), getattr(config, self.rate_to_true_add_name))
+
+        mutated = np.flatnonzero(np.random.random(len(values)) < mutate_rate)
+        if mutated.size:
+            values[mutated] = np.random.random(mutated.size) < 0.5
+
+        return values
+
     def validate(self, config):
         default = str(getattr(config, self.default_name)).lower()
         if default not in ('1', 'on', 'yes', 'true', '0', 'off', 'no', 'false', 'random', 'none'):
@@ -202,6 +280,19 @@ class StringAttribute(BaseAttribute):
 
         return value
 
+    def mutate_values(self, values, config):
+        """ mutate_value applied to a sequence of values, drawing each random step for all of them at once. """
+        values = np.array(values, dtype=object)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+
+        if mutate_rate > 0:
+            mutated = np.flatnonzero(np.random.random(len(values)) < mutate_rate)
+            if mutated.size:
+                options = getattr(config, self.options_name)
+                values[mutated] = [options[i] for i in np.random.randint(len(options), size=mutated.size)]
+
+        return values
+
     def validate(self, config):
         default = getattr(config, self.default_name)
         if default not in ('none', 'random'):
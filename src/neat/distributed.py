@@ -52,15 +52,28 @@ a primary node or as a secondary node with MODE_AUTO.
 
 ``chunked(data, chunksize)``: splits data into a list of chunks with at most
 ``chunksize`` elements.
+
+``adaptive_chunksize(num_tasks, genome_time, chunk_time, workers, nodes)``
+returns the chunk size used when ``secondary_chunksize`` is None.
+
+Scheduling:
+Chunks are taken from a shared queue by whichever secondary is free, so a fast
+secondary takes more of them. Unless ``secondary_chunksize`` is given, the chunk
+size follows the measured evaluation time per genome, aiming at chunks taking
+about ``chunk_time`` seconds. Once every chunk has been taken, a chunk which has
+run for ``straggler_factor`` times as long as expected is queued again, so an
+idle secondary can race the straggler; whichever copy finishes first is used.
 """
 
 import multiprocessing
+import os
 import queue
 import socket
 import sys
 import time
 import warnings
 from argparse import Namespace
+from multiprocessing import managers
 
 # Some of this code is based on
 # http://eli.thegreenplace.net/2012/01/24/distributed-computing-in-python-with-multiprocessing
@@ -159,6 +172,25 @@ def chunked(data, chunksize):
     return res
 
 
+def adaptive_chunksize(num_tasks, genome_time, chunk_time, workers=1, nodes=1):
+    """
+    Returns the number of genomes to send a secondary at once, so a chunk takes
+    about ``chunk_time`` seconds on a secondary with ``workers`` worker
+    processes, given ``genome_time`` seconds of evaluation per genome (None if
+    not yet measured). Chunks are kept small enough that the ``num_tasks``
+    genomes make at least two chunks for each of ``nodes`` secondaries, to
+    even out the load.
+    """
+    if genome_time is None:
+        chunksize = workers
+    elif genome_time <= 0:
+        chunksize = num_tasks
+    else:
+        chunksize = int(chunk_time * workers / genome_time)
+    most = -(-num_tasks // (2 * max(1, nodes)))
+    return max(1, min(chunksize, most))
+
+
 class _ExtendedManager(object):
     """A class for managing the multiprocessing.managers.SyncManager"""
     __safe_for_unpickling__ = True  # this may not be safe for unpickling,
@@ -316,10 +348,12 @@ class DistributedEvaluator(object):
             addr,
             authkey,
             eval_function,
-            secondary_chunksize=1,
+            secondary_chunksize=None,
             num_workers=None,
             worker_timeout=60,
             mode=MODE_AUTO,
+            chunk_time=1.0,
+            straggler_factor=2.0,
     ):
         """
         ``addr`` should be a tuple of (hostname, port) pointing to the machine
@@ -334,7 +368,8 @@ class DistributedEvaluator(object):
         ``eval_function`` should take two arguments (a genome object and the
         configuration) and return a single float (the genome's fitness).
         'secondary_chunksize' specifies the number of genomes that will be sent to
-        a secondary at any one time.
+        a secondary at any one time. If None, it is chosen each generation by
+        `adaptive_chunksize` from the evaluation times measured so far.
         ``num_workers`` is the number of child processes to use if in secondary
         mode. It defaults to None, which means `multiprocessing.cpu_count()`
         is used to determine this value. If 1 in a secondary node, the process creating
@@ -342,6 +377,11 @@ class DistributedEvaluator(object):
         ``worker_timeout`` specifies the timeout (in seconds) for a secondary node
         getting the results from a worker subprocess; if None, there is no timeout.
         ``mode`` specifies the mode to run in; it defaults to MODE_AUTO.
+        ``chunk_time`` is the time (in seconds) an adaptively sized chunk
+        should take to evaluate.
+        ``straggler_factor`` is how many times its expected time a chunk may
+        run, once no chunks are left waiting, before a second copy of it is
+        queued for an idle secondary; if None, chunks are never re-executed.
         """
         self.addr = addr
         self.authkey = authkey
@@ -358,6 +398,14 @@ class DistributedEvaluator(object):
                       file=sys.stderr)
                 self.num_workers = 1
         self.worker_timeout = worker_timeout
+        self.chunk_time = chunk_time
+        self.straggler_factor = straggler_factor
+        # Measured seconds of evaluation per genome, and the worker count of each secondary seen
+        self.genome_time = None
+        self.secondaries = {}
+        # Evaluations started, and chunks queued again because they were straggling
+        self.evaluation = 0
+        self.speculated = 0
         self.mode = _determine_mode(self.addr, mode)
         self.em = _ExtendedManager(self.addr, self.authkey, mode=self.mode, start=False)
         self.inqueue = None
@@ -467,6 +515,8 @@ class DistributedEvaluator(object):
             pool = multiprocessing.Pool(self.num_workers)
         else:
             pool = None
+        # Identifies this secondary to the primary, with how many genomes it evaluates at once
+        secondary = (f"{socket.gethostname()}:{os.getpid()}", self.num_workers)
         should_reconnect = True
         while should_reconnect:
             i = 0
@@ -506,6 +556,11 @@ class DistributedEvaluator(object):
                             ('AuthenticationError' in repr(e))):  # Second for Python 3.X, Third for 3.6+
                         break
                     raise
+                chunk_id, tasks = tasks
+                # Announce the chunk, so the primary can tell when it is straggling
+                if not self._send((chunk_id, secondary, None, None)):
+                    break
+                start = time.perf_counter()
                 if pool is None:
                     res = []
                     for genome_id, genome, config in tasks:
@@ -524,18 +579,9 @@ class DistributedEvaluator(object):
                     results = [
                         job.get(timeout=self.worker_timeout) for job in jobs
                     ]
-                    res = zip(genome_ids, results)
-                try:
-                    self.outqueue.put(res)
-                except (socket.error, EOFError, IOError, OSError, socket.gaierror, TypeError):
+                    res = list(zip(genome_ids, results))
+                if not self._send((chunk_id, secondary, res, time.perf_counter() - start)):
                     break
-                except (managers.RemoteError, multiprocessing.ProcessError) as e:
-                    if ('Empty' in repr(e)) or ('TimeoutError' in repr(e)):
-                        continue
-                    if (('EOFError' in repr(e)) or ('PipeError' in repr(e)) or
-                            ('AuthenticationError' in repr(e))):  # Second for Python 3.X, Third for 3.6+
-                        break
-                    raise
 
             if not reconnect:
                 should_reconnect = False
@@ -543,6 +589,36 @@ class DistributedEvaluator(object):
         if pool is not None:
             pool.terminate()
 
+    def _send(self, message):
+        """
+        Puts a message on the outqueue.
+        Returns False if the connection to the primary has been lost.
+        """
+        try:
+            self.outqueue.put(message)
+        except (socket.error, EOFError, IOError, OSError, socket.gaierror, TypeError):
+            return False
+        except (managers.RemoteError, multiprocessing.ProcessError) as e:
+            if ('Empty' in repr(e)) or ('TimeoutError' in repr(e)):
+                return True
+            if (('EOFError' in repr(e)) or ('PipeError' in repr(e)) or
+                    ('AuthenticationError' in repr(e))):  # Second for Python 3.X, Third for 3.6+
+                return False
+            raise
+        return True
+
+    def _drain_inqueue(self):
+        """Removes the chunks no secondary has taken yet."""
+        while True:
+            try:
+                self.inqueue.get(block=False)
+            except (queue.Empty, managers.RemoteError):
+                return
+
+    def _expected_time(self, size, workers):
+        """Seconds a secondary with ``workers`` worker processes should need for ``size`` genomes."""
+        return self.genome_time * size / max(1, min(workers, size))
+
     def evaluate(self, genomes, config):
         """
         Evaluates the genomes.
@@ -551,22 +627,70 @@ class DistributedEvaluator(object):
         """
         if self.mode != MODE_PRIMARY:
             raise ModeError("Not in primary mode!")
+        # Chunks are tagged with the evaluation they belong to, so late results
+        # of earlier evaluations are told apart and dropped
+        self.evaluation += 1
         tasks = [(genome_id, genome, config) for genome_id, genome in genomes]
         id2genome = {genome_id: genome for genome_id, genome in genomes}
-        tasks = chunked(tasks, self.secondary_chunksize)
-        n_tasks = len(tasks)
-        for task in tasks:
-            self.inqueue.put(task)
-        tresults = []
-        while len(tresults) < n_tasks:
+        chunksize = self.secondary_chunksize
+        if chunksize is None:
+            workers = max(self.secondaries.values()) if self.secondaries else 1
+            chunksize = adaptive_chunksize(len(tasks), self.genome_time, self.chunk_time,
+                                           workers, len(self.secondaries))
+        chunks = {}
+        for index, chunk in enumerate(chunked(tasks, chunksize)):
+            chunks[(self.evaluation, index)] = chunk
+            self.inqueue.put(((self.evaluation, index), chunk))
+        queued = len(chunks)
+        # When each unfinished chunk was taken, and by a secondary with how many workers
+        started = {}
+        copied = set()
+        taken = 0
+
+        while chunks:
+            timeout = None
+            if taken >= queued and self.genome_time is not None and self.straggler_factor is not None:
+                # Every chunk has been taken, so the secondaries done with theirs are idle
+                deadlines = [(started[chunk_id][0] +
+                              self.straggler_factor * self._expected_time(len(chunk), started[chunk_id][1]),
+                              chunk_id)
+                             for chunk_id, chunk in chunks.items()
+                             if chunk_id in started and chunk_id not in copied]
+                if deadlines:
+                    deadline, chunk_id = min(deadlines)
+                    if deadline <= time.time():
+                        # Race the straggler with a copy; the first result in wins
+                        self.inqueue.put((chunk_id, chunks[chunk_id]))
+                        copied.add(chunk_id)
+                        queued += 1
+                        self.speculated += 1
+                        continue
+                    timeout = deadline - time.time()
             try:
-                sr = self.outqueue.get(block=True, timeout=0.2)
+                chunk_id, secondary, results, elapsed = self.outqueue.get(block=True, timeout=timeout)
             except (queue.Empty, managers.RemoteError):
                 continue
-            tresults.append(sr)
-        results = []
-        for sr in tresults:
-            results += sr
-        for genome_id, fitness in results:
-            genome = id2genome[genome_id]
-            genome.fitness = fitness
+            if chunk_id[0] != self.evaluation:
+                continue
+            secondary_id, workers = secondary
+            self.secondaries[secondary_id] = workers
+            if results is None:
+                taken += 1
+                started.setdefault(chunk_id, (time.time(), workers))
+                continue
+            if chunk_id not in chunks:
+                # The other copy finished first
+                continue
+            chunk = chunks.pop(chunk_id)
+            genome_time = elapsed * min(workers, len(chunk)) / len(chunk)
+            if self.genome_time is None:
+                self.genome_time = genome_time
+            else:
+                self.genome_time = 0.7 * self.genome_time + 0.3 * genome_time
+            for genome_id, fitness in results:
+                genome = id2genome[genome_id]
+                genome.fitness = fitness
+
+        # Copies of chunks which have since finished are not needed any more
+        if copied:
+            self._drain_inqueue()
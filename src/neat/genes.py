@@ -56,6 +56,18 @@ class BaseGene(object):
             v = getattr(self, a.name)
             setattr(self, a.name, a.mutate_value(v, config))
 
+    @classmethod
+    def mutate_many(cls, genes, config):
+        """ Mutates genes of this class as mutate does, one attribute at a time across all of them. """
+        for a in cls._gene_attributes:
+            if not hasattr(a, 'mutate_values'):
+                for gene in genes:
+                    setattr(gene, a.name, a.mutate_value(getattr(gene, a.name), config))
+                continue
+            values = a.mutate_values([getattr(gene, a.name) for gene in genes], config)
+            for gene, v in zip(genes, values.tolist()):
+                setattr(gene, a.name, v)
+
     def copy(self):
         new_gene = self.__class__(self.key)
         for a in self._gene_attributes:
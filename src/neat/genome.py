@@ -169,9 +169,18 @@ class DefaultGenome(object):
         self.connections = {}
         self.nodes = {}
 
+        # Outgoing and incoming adjacency of the connections, see connection_index.
+        self._index = None
+
         # Fitness results.
         self.fitness = None
 
+    def __getstate__(self):
+        # The connection index is rebuilt when needed rather than pickled or copied
+        state = self.__dict__.copy()
+        state['_index'] = None
+        return state
+
     def configure_new(self, config):
         """Configure a new genome based on the given configuration."""
 
@@ -262,7 +271,35 @@ class DefaultGenome(object):
 
     def mutate(self, config):
         """ Mutates this genome. """
+        self.mutate_structure(config)
+
+        # Mutate connection genes.
+        for cg in self.connections.values():
+            cg.mutate(config)
 
+        # Mutate node genes (bias, response, etc.).
+        for ng in self.nodes.values():
+            ng.mutate(config)
+
+    @classmethod
+    def mutate_many(cls, genomes, config):
+        """
+        Mutates each genome as mutate does, but mutates the attributes of all
+        their genes together, one random draw per attribute.
+        """
+        by_type = {}
+        for genome in genomes:
+            genome.mutate_structure(config)
+            for gene in genome.connections.values():
+                by_type.setdefault(type(gene), []).append(gene)
+            for gene in genome.nodes.values():
+                by_type.setdefault(type(gene), []).append(gene)
+
+        for gene_type, genes in by_type.items():
+            gene_type.mutate_many(genes, config)
+
+    def mutate_structure(self, config):
+        """ Adds or deletes nodes and connections, as configured. """
         if config.single_structural_mutation:
             div = max(1, (config.node_add_prob + config.node_delete_prob +
                           config.conn_add_prob + config.conn_delete_prob))
@@ -290,14 +327,6 @@ class DefaultGenome(object):
             if random() < config.conn_delete_prob:
                 self.mutate_delete_connection()
 
-        # Mutate connection genes.
-        for cg in self.connections.values():
-            cg.mutate(config)
-
-        # Mutate node genes (bias, response, etc.).
-        for ng in self.nodes.values():
-            ng.mutate(config)
-
     def mutate_add_node(self, config):
         if not self.connections:
             if config.check_structural_mutation_surer():
@@ -331,6 +360,38 @@ class DefaultGenome(object):
         connection.weight = weight
         connection.enabled = enabled
         self.connections[key] = connection
+        self.index_connection(key)
+
+    def connection_index(self):
+        """
+        Returns (outgoing, incoming) dicts mapping each node to the set of nodes it
+        feeds and is fed by. The index is built on first use and then kept up to
+        date by the methods that add and delete connections, so cycle checks do
+        not scan every connection; it is rebuilt if the connections dict is replaced.
+        """
+        index = getattr(self, '_index', None)
+        if index is None or index[0] is not self.connections:
+            outgoing = {}
+            incoming = {}
+            for i, o in self.connections:
+                outgoing.setdefault(i, set()).add(o)
+                incoming.setdefault(o, set()).add(i)
+            index = self._index = (self.connections, outgoing, incoming)
+        return index[1], index[2]
+
+    def index_connection(self, key):
+        index = getattr(self, '_index', None)
+        if index is not None and index[0] is self.connections:
+            i, o = key
+            index[1].setdefault(i, set()).add(o)
+            index[2].setdefault(o, set()).add(i)
+
+    def unindex_connection(self, key):
+        index = getattr(self, '_index', None)
+        if index is not None and index[0] is self.connections:
+            i, o = key
+            index[1][i].discard(o)
+            index[2][o].discard(i)
 
     def mutate_add_connection(self, config):
         """
@@ -359,11 +420,12 @@ class DefaultGenome(object):
         # they cannot be the output end of a connection (see above).
 
         # For feed-forward networks, avoid creating cycles.
-        if config.feed_forward and creates_cycle(list(self.connections), key):
+        if config.feed_forward and creates_cycle(self.connections, key, self.connection_index()[0]):
             return
 
         cg = self.create_connection(config, in_node, out_node)
         self.connections[cg.key] = cg
+        self.index_connection(cg.key)
 
     def mutate_delete_node(self, config):
         # Do nothing if there are no non-output nodes.
@@ -373,13 +435,13 @@ class DefaultGenome(object):
 
         del_key = choice(available_nodes)
 
-        connections_to_delete = set()
-        for k, v in self.connections.items():
-            if del_key in v.key:
-                connections_to_delete.add(v.key)
+        outgoing, incoming = self.connection_index()
+        connections_to_delete = set((i, del_key) for i in incoming.get(del_key, ()))
+        connections_to_delete.update((del_key, o) for o in outgoing.get(del_key, ()))
 
         for key in connections_to_delete:
             del self.connections[key]
+            self.unindex_connection(key)
 
         del self.nodes[del_key]
 
@@ -389,6 +451,7 @@ class DefaultGenome(object):
         if self.connections:
             key = choice(list(self.connections.keys()))
             del self.connections[key]
+            self.unindex_connection(key)
 
     def distance(self, other, config):
         """
@@ -449,6 +512,25 @@ class DefaultGenome(object):
         num_enabled_connections = sum([1 for cg in self.connections.values() if cg.enabled])
         return len(self.nodes), num_enabled_connections
 
+    def structural_key(self):
+        """
+        Returns a hashable tuple of everything the genome's phenotype is built
+        from: its nodes' biases, responses, activations and aggregations, and
+        its enabled connections and their weights. Genomes with equal keys build
+        identical networks, whatever their keys or fitness; unlike hashes of it,
+        different genomes never share a key.
+        """
+        nodes = sorted((k, ng.bias, ng.response, ng.activation, ng.aggregation) for k, ng in self.nodes.items())
+        connections = sorted((k, cg.weight) for k, cg in self.connections.items() if cg.enabled)
+        return tuple(nodes), tuple(connections)
+
+    def structural_hash(self):
+        """
+        Returns hash(self.structural_key()). Like hash(), the value is only
+        meaningful within one process, and different genomes may collide.
+        """
+        return hash(self.structural_key())
+
     def __str__(self):
         s = f"Key: {self.key}\nFitness: {self.fitness}\nNodes:"
         for k, ng in self.nodes.items():
@@ -1,36 +1,57 @@
 """Directed graph algorithm implementations."""
 
 
-def creates_cycle(connections, test):
+def creates_cycle(connections, test, outgoing=None):
     """
     Returns true if the addition of the 'test' connection would create a cycle,
     assuming that no cycle already exists in the graph represented by 'connections'.
+    :param outgoing: optional node -> nodes it feeds index of connections, see adjacency;
+    with it the check only visits the nodes reachable from the test connection's output.
     """
     i, o = test
     if i == o:
         return True
 
-    visited = {o}
-    while True:
-        num_added = 0
-        for a, b in connections:
-            if a in visited and b not in visited:
-                if b == i:
-                    return True
+    if outgoing is None:
+        outgoing = adjacency(connections)[1]
 
+    # The connection closes a cycle if its input can already be reached from its output.
+    visited = {o}
+    stack = [o]
+    while stack:
+        for b in outgoing.get(stack.pop(), ()):
+            if b == i:
+                return True
+            if b not in visited:
                 visited.add(b)
-                num_added += 1
+                stack.append(b)
+
+    return False
 
-        if num_added == 0:
-            return False
 
+def adjacency(connections):
+    """
+    Indexes the connections by node.
+    :param connections: list of (input, output) connections in the network.
 
-def required_for_output(inputs, outputs, connections):
+    Returns (incoming, outgoing) dicts mapping each node to the list of nodes
+    feeding it and fed by it, in connection order.
+    """
+    incoming = {}
+    outgoing = {}
+    for a, b in connections:
+        incoming.setdefault(b, []).append(a)
+        outgoing.setdefault(a, []).append(b)
+    return incoming, outgoing
+
+
+def required_for_output(inputs, outputs, connections, incoming=None):
     """
     Collect the nodes whose state is required to compute the final network output(s).
     :param inputs: list of the input identifiers
     :param outputs: list of the output node identifiers
     :param connections: list of (input, output) connections in the network.
+    :param incoming: optional node -> source nodes index of connections, see adjacency.
     NOTE: It is assumed that the input identifier set and the node identifier set are disjoint.
     By convention, the output node ids are always the same as the output index.
 
@@ -38,21 +59,18 @@ def required_for_output(inputs, outputs, connections):
     """
     assert not set(inputs).intersection(outputs)
 
-    required = set(outputs)
-    s = set(outputs)
-    while 1:
-        # Find nodes not in s whose output is consumed by a node in s.
-        t = set(a for (a, b) in connections if b in s and a not in s)
-
-        if not t:
-            break
+    if incoming is None:
+        incoming = adjacency(connections)[0]
+    inputs = set(inputs)
 
-        layer_nodes = set(x for x in t if x not in inputs)
-        if not layer_nodes:
-            break
-
-        required = required.union(layer_nodes)
-        s = s.union(t)
+    # Walk backwards from the outputs, stopping at the inputs.
+    required = set(outputs)
+    stack = list(required)
+    while stack:
+        for a in incoming.get(stack.pop(), ()):
+            if a not in required and a not in inputs:
+                required.add(a)
+                stack.append(a)
 
     return required
 
@@ -68,25 +86,29 @@ def feed_forward_layers(inputs, outputs, connections):
     Note that the returned layers do not contain nodes whose output is ultimately
     never used to compute the final network output.
     """
+    incoming, outgoing = adjacency(connections)
+    required = required_for_output(inputs, outputs, connections, incoming)
 
-    required = required_for_output(inputs, outputs, connections)
-
+    # Kahn's algorithm, one layer at a time: a node joins the layer after the
+    # last of its inputs has been evaluated.
+    pending = dict((n, len(incoming.get(n, ()))) for n in required)
     layers = []
     s = set(inputs)
+    frontier = s
     while 1:
-        # Find candidate nodes c for the next layer.  These nodes should connect
-        # a node in s to a node not in s.
-        c = set(b for (a, b) in connections if a in s and b not in s)
-        # Keep only the used nodes whose entire input set is contained in s.
         t = set()
-        for n in c:
-            if n in required and all(a in s for (a, b) in connections if b == n):
-                t.add(n)
+        for a in frontier:
+            for b in outgoing.get(a, ()):
+                if b in pending and b not in s:
+                    pending[b] -= 1
+                    if not pending[b]:
+                        t.add(b)
 
         if not t:
             break
 
         layers.append(t)
         s = s.union(t)
+        frontier = t
 
     return layers
@@ -1,2 +1,5 @@
+from .batched import BatchedPopulationNetwork
+from .cache import NetworkCache
 from .feed_forward import FeedForwardNetwork
+from .matrix import MatrixFeedForwardNetwork
 from .recurrent import RecurrentNetwork
@@ -0,0 +1,185 @@
+"""
+Evaluates the feed-forward networks of a whole population in one call, by
+flattening them into a single value vector and running each layer as NumPy
+gathers and segment reductions over the links of every network at once.
+"""
+import numpy as np
+
+from .. import aggregations
+from .feed_forward import FeedForwardNetwork
+from .matrix import VECTOR_ACTIVATIONS
+
+# Aggregations evaluated with a ufunc reduction over each node's weighted inputs
+REDUCE_AGGREGATIONS = {
+    aggregations.sum_aggregation: np.add,
+    aggregations.mean_aggregation: np.add,
+    aggregations.product_aggregation: np.multiply,
+    aggregations.max_aggregation: np.maximum,
+    aggregations.min_aggregation: np.minimum,
+}
+
+
+class BatchedLayer(object):
+    """Every network's nodes at one depth, with their links sorted by node."""
+
+    def __init__(self, slots, sources, weights, starts, counts, biases, responses,
+                 reductions, means, medians, activation_groups, python_aggregations, python_activations):
+        self.slots = slots
+        self.sources = sources
+        self.weights = weights
+        self.starts = starts
+        self.counts = counts
+        # reduceat runs over every non-empty node's links at once
+        self.segment_starts = starts[counts > 0]
+        self.biases = biases
+        self.responses = responses
+        self.reductions = reductions
+        self.means = means
+        self.medians = medians
+        self.activation_groups = activation_groups
+        self.python_aggregations = python_aggregations
+        self.python_activations = python_activations
+
+
+class BatchedPopulationNetwork(object):
+    """
+    All of a population's FeedForwardNetworks packed into one evaluator.
+
+    Network j's inputs are row j of the matrix passed to activate, and its
+    outputs are row j of the result, so a frame of the game needs one call
+    instead of one per player.
+    """
+
+    def __init__(self, input_slots, output_slots, layers, num_values):
+        self.input_slots = input_slots
+        self.output_slots = output_slots
+        self.layers = layers
+        self.values = np.zeros(num_values)
+
+    def __len__(self):
+        return len(self.input_slots)
+
+    def activate(self, inputs):
+        """
+        Arguments:
+            inputs {array-like} -- (networks, num_inputs) matrix, one row per network
+
+        Returns:
+            np.ndarray -- (networks, num_outputs) matrix of outputs
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        if inputs.shape != self.input_slots.shape:
+            raise RuntimeError("Expected inputs of shape {0}, got {1}".format(self.input_slots.shape, inputs.shape))
+
+        values = self.values
+        values[self.input_slots] = inputs
+        for layer in self.layers:
+            weighted = values[layer.sources] * layer.weights
+            s = np.empty(len(layer.slots))
+            for ufunc, rows, segments in layer.reductions:
+                s[rows] = ufunc.reduceat(weighted, layer.segment_starts)[segments]
+            if layer.means.size:
+                s[layer.means] /= layer.counts[layer.means]
+            for count, rows in layer.medians:
+                segments = np.sort(weighted[layer.starts[rows, None] + np.arange(count)], axis=1)
+                if count <= 2:
+                    s[rows] = segments.sum(axis=1) / count
+                elif count % 2:
+                    s[rows] = segments[:, count // 2]
+                else:
+                    s[rows] = (segments[:, count // 2 - 1] + segments[:, count // 2]) / 2.0
+            for row, agg_func in layer.python_aggregations:
+                start = layer.starts[row]
+                s[row] = agg_func(weighted[start:start + layer.counts[row]].tolist())
+
+            z = layer.biases + layer.responses * s
+            for function, rows in layer.activation_groups:
+                z[rows] = function(z[rows])
+            for row, act_func in layer.python_activations:
+                z[row] = act_func(float(z[row]))
+            values[layer.slots] = z
+
+        return values[self.output_slots]
+
+    @staticmethod
+    def create(genomes, config):
+        """ Receives a list of genomes and returns a network evaluating all of them. """
+        return BatchedPopulationNetwork.from_networks([FeedForwardNetwork.create(g, config) for g in genomes])
+
+    @staticmethod
+    def from_networks(networks):
+        """ Packs FeedForwardNetworks, which must share their input and output counts. """
+        input_slots, output_slots = [], []
+        by_depth = {}
+        num_values = 0
+        for network in networks:
+            slots = {}
+            for key in network.input_nodes + network.output_nodes:
+                slots.setdefault(key, num_values + len(slots))
+            for node_eval in network.node_evals:
+                slots.setdefault(node_eval[0], num_values + len(slots))
+            num_values += len(slots)
+            input_slots.append([slots[key] for key in network.input_nodes])
+            output_slots.append([slots[key] for key in network.output_nodes])
+
+            # A node's layer is one past the deepest node feeding it; inputs are layer 0
+            depth = dict((key, 0) for key in network.input_nodes)
+            for node, act_func, agg_func, bias, response, links in network.node_evals:
+                depth[node] = 1 + max((depth.get(i, 0) for i, _ in links), default=0)
+                by_depth.setdefault(depth[node], []).append(
+                    (slots[node], act_func, agg_func, bias, response, [(slots[i], w) for i, w in links]))
+
+        layers = [BatchedPopulationNetwork.pack_layer(by_depth[depth]) for depth in sorted(by_depth)]
+        num_inputs = len(networks[0].input_nodes) if networks else 0
+        num_outputs = len(networks[0].output_nodes) if networks else 0
+        return BatchedPopulationNetwork(
+            np.array(input_slots, dtype=int).reshape(len(networks), num_inputs),
+            np.array(output_slots, dtype=int).reshape(len(networks), num_outputs),
+            layers,
+            num_values,
+        )
+
+    @staticmethod
+    def pack_layer(nodes):
+        """ Builds the arrays one depth of every network is evaluated from. """
+        counts = np.array([len(links) for _, _, _, _, _, links in nodes], dtype=int)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(int)
+        sources = np.array([i for _, _, _, _, _, links in nodes for i, _ in links], dtype=int)
+        weights = np.array([w for _, _, _, _, _, links in nodes for _, w in links], dtype=float)
+
+        reductions, means, medians, activation_groups = {}, [], {}, {}
+        python_aggregations, python_activations = [], []
+        for row, (_, act_func, agg_func, _, _, links) in enumerate(nodes):
+            if not links:
+                # A node without inputs aggregates nothing; leave it to its function
+                python_aggregations.append((row, agg_func))
+            elif agg_func in REDUCE_AGGREGATIONS:
+                reductions.setdefault(REDUCE_AGGREGATIONS[agg_func], []).append(row)
+                if agg_func is aggregations.mean_aggregation:
+                    means.append(row)
+            elif agg_func is aggregations.median_aggregation:
+                medians.setdefault(len(links), []).append(row)
+            else:
+                python_aggregations.append((row, agg_func))
+
+            if act_func in VECTOR_ACTIVATIONS:
+                activation_groups.setdefault(VECTOR_ACTIVATIONS[act_func], []).append(row)
+            else:
+                python_activations.append((row, act_func))
+
+        return BatchedLayer(
+            np.array([slot for slot, _, _, _, _, _ in nodes], dtype=int),
+            sources,
+            weights,
+            starts,
+            counts,
+            np.array([bias for _, _, _, bias, _, _ in nodes], dtype=float),
+            np.array([response for _, _, _, _, response, _ in nodes], dtype=float),
+            [(ufunc, np.array(rows), np.searchsorted(np.flatnonzero(counts), rows))
+             for ufunc, rows in reductions.items()],
+            np.array(means, dtype=int),
+            [(count, np.array(rows)) for count, rows in medians.items()],
+            [(function, np.array(rows)) for function, rows in activation_groups.items()],
+            python_aggregations,
+            python_activations,
+        )
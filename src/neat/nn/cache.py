@@ -0,0 +1,52 @@
+"""
+Keeps the networks built for recently seen genomes, so genomes carried over
+unchanged between generations (elites, clones of a single parent) do not have
+their phenotype rebuilt.
+"""
+from collections import OrderedDict
+
+from .feed_forward import FeedForwardNetwork
+
+
+class NetworkCache(object):
+    """
+    LRU cache of networks keyed by DefaultGenome.structural_key.
+
+    Genomes with the same structure share one network object, so create must
+    build networks that keep no state between activations, as
+    FeedForwardNetwork does.
+    """
+
+    def __init__(self, create=FeedForwardNetwork.create, size=300):
+        self.create = create
+        self.size = size
+        self.networks = OrderedDict()
+        self.config = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.networks)
+
+    def get(self, genome, config):
+        """ Returns the network for genome, building it only if no equal genome has been seen. """
+        if config is not self.config:
+            # Activation and aggregation names only mean something within one config
+            self.clear()
+            self.config = config
+
+        key = genome.structural_key()
+        network = self.networks.get(key)
+        if network is not None:
+            self.hits += 1
+            self.networks.move_to_end(key)
+            return network
+
+        self.misses += 1
+        network = self.networks[key] = self.create(genome, config)
+        if len(self.networks) > self.size:
+            self.networks.popitem(last=False)
+        return network
+
+    def clear(self):
+        self.networks.clear()
@@ -32,19 +32,20 @@ class FeedForwardNetwork(object):
         connections = [cg.key for cg in genome.connections.values() if cg.enabled]
 
         layers = feed_forward_layers(config.genome_config.input_keys, config.genome_config.output_keys, connections)
+
+        # Index each node's incoming links once instead of scanning every connection per node.
+        node_inputs = {}
+        for conn_key in connections:
+            inode, onode = conn_key
+            node_inputs.setdefault(onode, []).append((inode, genome.connections[conn_key].weight))
+
         node_evals = []
         for layer in layers:
             for node in layer:
-                inputs = []
-                for conn_key in connections:
-                    inode, onode = conn_key
-                    if onode == node:
-                        cg = genome.connections[conn_key]
-                        inputs.append((inode, cg.weight))
-
                 ng = genome.nodes[node]
                 aggregation_function = config.genome_config.aggregation_function_defs.get(ng.aggregation)
                 activation_function = config.genome_config.activation_defs.get(ng.activation)
-                node_evals.append((node, activation_function, aggregation_function, ng.bias, ng.response, inputs))
+                node_evals.append((node, activation_function, aggregation_function, ng.bias, ng.response,
+                                   node_inputs.get(node, [])))
 
         return FeedForwardNetwork(config.genome_config.input_keys, config.genome_config.output_keys, node_evals)
@@ -0,0 +1,144 @@
+"""
+Feed-forward networks compiled into per-layer weight matrices so activation
+runs as a few NumPy operations instead of a Python loop over every link.
+"""
+import numpy as np
+
+from .. import activations, aggregations
+from .feed_forward import FeedForwardNetwork
+
+
+def _clip(z, limit):
+    return np.clip(z, -limit, limit)
+
+
+# NumPy versions of the built-in activation functions, matching their clamping
+VECTOR_ACTIVATIONS = {
+    activations.sigmoid_activation: lambda z: 1.0 / (1.0 + np.exp(-_clip(5.0 * z, 60.0))),
+    activations.tanh_activation: lambda z: np.tanh(_clip(2.5 * z, 60.0)),
+    activations.sin_activation: lambda z: np.sin(_clip(5.0 * z, 60.0)),
+    activations.gauss_activation: lambda z: np.exp(-5.0 * _clip(z, 3.4) ** 2),
+    activations.relu_activation: lambda z: np.where(z > 0.0, z, 0.0),
+    activations.elu_activation: lambda z: np.where(z > 0.0, z, np.exp(np.minimum(z, 0.0)) - 1),
+    activations.lelu_activation: lambda z: np.where(z > 0.0, z, 0.005 * z),
+    activations.selu_activation: lambda z: np.where(
+        z > 0.0,
+        1.0507009873554804934193349852946 * z,
+        1.0507009873554804934193349852946 * 1.6732632423543772848170429916717 * (np.exp(np.minimum(z, 0.0)) - 1)),
+    activations.softplus_activation: lambda z: 0.2 * np.log(1 + np.exp(_clip(5.0 * z, 60.0))),
+    activations.identity_activation: lambda z: z,
+    activations.clamped_activation: lambda z: _clip(z, 1.0),
+    activations.inv_activation: lambda z: np.divide(1.0, z, out=np.zeros_like(z), where=z != 0.0),
+    activations.log_activation: lambda z: np.log(np.maximum(z, 1e-7)),
+    activations.exp_activation: lambda z: np.exp(_clip(z, 60.0)),
+    activations.abs_activation: np.abs,
+    activations.hat_activation: lambda z: np.maximum(0.0, 1 - np.abs(z)),
+    activations.square_activation: lambda z: z ** 2,
+    activations.cube_activation: lambda z: z ** 3,
+}
+
+# Aggregations that are a weighted sum of the inputs, scaled by a per-node divisor
+SUM_AGGREGATIONS = (aggregations.sum_aggregation, aggregations.mean_aggregation)
+
+
+class CompiledLayer(object):
+    """One feed-forward layer: matrix-form nodes plus any nodes evaluated one by one."""
+
+    def __init__(self, slots, weights, biases, activation_groups, python_nodes):
+        self.slots = slots
+        # Responses and mean divisors are folded into the weights
+        self.weights = weights
+        self.biases = biases
+        self.activation_groups = activation_groups
+        self.python_nodes = python_nodes
+
+
+class MatrixFeedForwardNetwork(object):
+    """
+    Drop-in replacement for FeedForwardNetwork whose layers are dense weight
+    matrices over a flat vector of node values.
+
+    Nodes using sum or mean aggregation and a built-in activation run as one
+    matrix product per layer; any other node (median, product, custom
+    functions) falls back to FeedForwardNetwork's per-node evaluation.
+    """
+
+    def __init__(self, inputs, outputs, layers, num_values, output_slots):
+        self.input_nodes = inputs
+        self.output_nodes = outputs
+        self.layers = layers
+        self.values = np.zeros(num_values)
+        self.output_slots = output_slots
+
+    def activate(self, inputs):
+        if len(self.input_nodes) != len(inputs):
+            raise RuntimeError("Expected {0:n} inputs, got {1:n}".format(len(self.input_nodes), len(inputs)))
+
+        values = self.values
+        values[:len(inputs)] = inputs
+        for layer in self.layers:
+            if layer.slots.size:
+                z = layer.weights.dot(values) + layer.biases
+                for function, rows in layer.activation_groups:
+                    z[rows] = function(z[rows])
+                values[layer.slots] = z
+            if layer.python_nodes:
+                known = values.tolist()
+                for slot, act_func, agg_func, bias, response, links in layer.python_nodes:
+                    s = agg_func([known[i] * w for i, w in links])
+                    values[slot] = act_func(bias + response * s)
+
+        return values[self.output_slots].tolist()
+
+    @staticmethod
+    def create(genome, config):
+        """ Receives a genome and returns its compiled phenotype. """
+        return MatrixFeedForwardNetwork.compile(FeedForwardNetwork.create(genome, config))
+
+    @staticmethod
+    def compile(network):
+        """ Turns the node evaluations of a FeedForwardNetwork into matrix-form layers. """
+        slots = {}
+        for key in network.input_nodes + network.output_nodes:
+            slots.setdefault(key, len(slots))
+        for node, _, _, _, _, _ in network.node_evals:
+            slots.setdefault(node, len(slots))
+
+        # A node's layer is one past the deepest node feeding it; inputs are layer 0
+        depth = dict((key, 0) for key in network.input_nodes)
+        by_layer = {}
+        for node_eval in network.node_evals:
+            node, _, _, _, _, links = node_eval
+            depth[node] = 1 + max((depth.get(i, 0) for i, _ in links), default=0)
+            by_layer.setdefault(depth[node], []).append(node_eval)
+
+        layers = []
+        for level in sorted(by_layer):
+            vector_nodes, python_nodes = [], []
+            for node, act_func, agg_func, bias, response, links in by_layer[level]:
+                if agg_func in SUM_AGGREGATIONS and act_func in VECTOR_ACTIVATIONS and links:
+                    vector_nodes.append((node, act_func, agg_func, bias, response, links))
+                else:
+                    python_nodes.append((slots[node], act_func, agg_func, bias, response,
+                                         [(slots[i], w) for i, w in links]))
+
+            weights = np.zeros((len(vector_nodes), len(slots)))
+            groups = {}
+            for row, (node, act_func, agg_func, bias, response, links) in enumerate(vector_nodes):
+                scale = response / len(links) if agg_func is aggregations.mean_aggregation else response
+                for i, w in links:
+                    weights[row, slots[i]] += w * scale
+                groups.setdefault(VECTOR_ACTIVATIONS[act_func], []).append(row)
+
+            layers.append(CompiledLayer(
+                np.array([slots[n[0]] for n in vector_nodes], dtype=int),
+                weights,
+                np.array([n[3] for n in vector_nodes], dtype=float),
+                # A layer sharing one activation applies it to the whole vector
+                [(function, np.array(rows) if len(groups) > 1 else slice(None))
+                 for function, rows in groups.items()],
+                python_nodes,
+            ))
+
+        output_slots = np.array([slots[key] for key in network.output_nodes], dtype=int)
+        return MatrixFeedForwardNetwork(network.input_nodes, network.output_nodes, layers, len(slots), output_slots)
@@ -2,7 +2,14 @@
 Runs evaluation functions in parallel subprocesses
 in order to evaluate multiple genomes at once.
 """
-from multiprocessing import Pool
+import pickle
+import time
+from multiprocessing import Pipe, Pool, Process, TimeoutError
+
+import numpy as np
+
+# What a PersistentEvaluator worker sends back: one (key, fitness) row per genome
+RESULT_DTYPE = np.dtype([('key', np.int64), ('fitness', np.float64)])
 
 
 class ParallelEvaluator(object):
@@ -28,3 +35,146 @@ class ParallelEvaluator(object):
         # assign the fitness back to each genome
         for job, (ignored_genome_id, genome) in zip(jobs, genomes):
             genome.fitness = job.get(timeout=self.timeout)
+
+
+def _persistent_worker(connection, eval_function, config):
+    """ Keeps the genomes it is sent and evaluates those named each generation. """
+    genomes = {}
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        new_genomes, keys = message
+        genomes.update(new_genomes)
+        # Genomes that have left the population are not sent again, so forget them
+        wanted = set(keys)
+        for key in [key for key in genomes if key not in wanted]:
+            del genomes[key]
+
+        try:
+            results = np.array([(key, eval_function(genomes[key], config)) for key in keys], dtype=RESULT_DTYPE)
+        except Exception as e:
+            connection.send(e)
+        else:
+            connection.send(results)
+    connection.close()
+
+
+class PersistentEvaluator(object):
+    """
+    Like ParallelEvaluator, but each worker process is given the config once
+    when it starts and keeps a copy of every genome it has been sent.
+
+    A genome always goes to the same worker (chosen by its key), and is only
+    sent again if it has changed since, judged by its structural_key (or, for
+    genomes without one, its pickled bytes), so each generation ships the new
+    offspring and not the elites or the config. Results come back as one
+    array of (key, fitness) rows per worker.
+    """
+
+    def __init__(self, num_workers, eval_function, config=None, timeout=None):
+        """
+        eval_function should take two arguments (a genome object and the
+        configuration) and return a single float (the genome's fitness).
+        Workers are started on the first evaluate, or now if config is given,
+        and restarted if evaluate is called with a different config. If every
+        worker has not answered within timeout seconds of evaluate sending the
+        genomes, the workers are killed and TimeoutError is raised.
+        """
+        self.num_workers = num_workers
+        self.eval_function = eval_function
+        self.timeout = timeout
+        self.config = None
+        self.workers = []
+        # For each worker, the keys of the genomes it holds and what they were when sent
+        self.held = []
+        self.sent = 0
+        if config is not None:
+            self.start(config)
+
+    def __del__(self):
+        self.stop()
+
+    def start(self, config):
+        """ Starts the worker processes, handing each of them config. """
+        self.stop()
+        self.config = config
+        for _ in range(self.num_workers):
+            connection, worker_connection = Pipe()
+            process = Process(target=_persistent_worker, args=(worker_connection, self.eval_function, config))
+            process.daemon = True
+            process.start()
+            worker_connection.close()
+            self.workers.append((process, connection))
+            self.held.append({})
+
+    def stop(self, terminate=False):
+        """ Stops the worker processes and waits for them to finish, or kills them if terminate. """
+        for process, connection in self.workers:
+            if terminate:
+                process.terminate()
+            else:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            connection.close()
+            process.join()
+        self.workers = []
+        self.held = []
+
+    @staticmethod
+    def version(genome):
+        """ What identifies a genome's current content, for deciding whether to resend it. """
+        structural_key = getattr(genome, 'structural_key', None)
+        if structural_key is not None:
+            return structural_key()
+        # Any change resends the genome, even one its fitness alone makes
+        return pickle.dumps(genome)
+
+    def evaluate(self, genomes, config):
+        if config is not self.config:
+            self.start(config)
+
+        batches = [([], {}) for _ in self.workers]
+        for genome_id, genome in genomes:
+            worker = genome_id % self.num_workers
+            new_genomes, versions = batches[worker]
+            held = self.held[worker]
+            version = versions[genome_id] = self.version(genome)
+            if genome_id not in held or held[genome_id] != version:
+                new_genomes.append((genome_id, genome))
+
+        for worker, (process, connection) in enumerate(self.workers):
+            new_genomes, versions = batches[worker]
+            connection.send((new_genomes, list(versions)))
+            self.sent += len(new_genomes)
+            self.held[worker] = versions
+
+        # assign the fitness back to each genome
+        genomes = dict(genomes)
+        errors = []
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        for process, connection in self.workers:
+            try:
+                if deadline is not None and not connection.poll(max(deadline - time.monotonic(), 0)):
+                    # A late answer would be taken for the next generation's, so
+                    # start afresh, without waiting for the busy workers
+                    self.stop(terminate=True)
+                    self.config = None
+                    raise TimeoutError()
+                results = connection.recv()
+            except (EOFError, ConnectionResetError):
+                # The worker has died, and the genomes it held with it
+                self.stop(terminate=True)
+                self.config = None
+                raise
+            if isinstance(results, Exception):
+                errors.append(results)
+                continue
+            for key, fitness in results.tolist():
+                genomes[key].fitness = fitness
+
+        # Every worker has answered, so the next evaluate is not thrown off by an error here
+        if errors:
+            raise errors[0]
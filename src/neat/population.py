@@ -1,4 +1,5 @@
 """Implements the core evolution algorithm."""
+import math
 
 from .math_util import mean
 from .reporting import ReporterSet
@@ -135,3 +136,107 @@ class Population(object):
             self.reporters.found_solution(self.config, self.generation, self.best_genome)
 
         return self.best_genome
+
+    def run_async(self, evaluator, n=None):
+        """
+        Runs steady-state evolution for at most n generations, a generation
+        being pop_size evaluations. If n is None, run until solution is found.
+
+        The evaluator evaluates batches of genomes in the background, and must provide:
+            1. capacity, the number of batches it works on at once.
+            2. submit(genomes, config), which starts evaluating a list of
+               (genome id, genome) tuples.
+            3. collect(), which waits for a submitted batch to finish and
+               returns its (genome id, fitness) tuples.
+
+        Each genome in a finished batch joins the population straight away,
+        replacing the genome DefaultReproduction.worst_member picks, and is
+        placed in a species by DefaultSpeciesSet.add. Offspring of the new population are
+        submitted in its place, so the evaluator never waits on the slowest
+        batch. The whole population is re-speciated and reported on once per
+        generation. Stagnation and complete extinction are not checked in this
+        mode.
+        """
+
+        if self.config.no_fitness_termination and (n is None):
+            raise RuntimeError("Cannot have no generational limit with no fitness termination")
+
+        pop_size = self.config.pop_size
+        batch_size = max(1, int(math.ceil(pop_size / evaluator.capacity)))
+
+        # Genomes without a fitness are evaluated before any offspring are bred
+        waiting = [(gid, g) for gid, g in self.population.items() if g.fitness is None]
+        self.population = dict((gid, g) for gid, g in self.population.items() if g.fitness is not None)
+        if self.population:
+            self.species.speciate(self.config, self.population, self.generation)
+        else:
+            self.species.species = {}
+            self.species.genome_to_species = {}
+
+        in_flight = {}
+        evaluated = 0
+        k = 0
+        running = n is None or n > 0
+        if running:
+            self.reporters.start_generation(self.generation)
+        while running or in_flight:
+            # Give the evaluator a batch for every one it has room for.
+            while running and len(in_flight) < evaluator.capacity:
+                if not waiting and self.population:
+                    waiting = list(self.reproduction.breed(self.config, self.species, batch_size).items())
+                if not waiting:
+                    break
+                batch, waiting = waiting[:batch_size], waiting[batch_size:]
+                evaluator.submit(batch, self.config)
+                in_flight.update(batch)
+
+            for gid, fitness in evaluator.collect():
+                g = in_flight.pop(gid)
+                g.fitness = fitness
+                if g.fitness is None:
+                    raise RuntimeError("Fitness not assigned to genome {}".format(g.key))
+
+                if len(self.population) >= pop_size:
+                    worst = self.reproduction.worst_member(self.species)
+                    del self.population[worst]
+                    self.species.remove(worst)
+                self.population[gid] = g
+                self.species.add(self.config, g, self.generation)
+                evaluated += 1
+
+                # Track the best genome ever seen.
+                if self.best_genome is None or g.fitness > self.best_genome.fitness:
+                    self.best_genome = g
+
+            if not running or evaluated < pop_size:
+                continue
+
+            # A generation's worth of genomes has been evaluated.
+            evaluated -= pop_size
+            k += 1
+            best = max(self.population.values(), key=lambda g: g.fitness)
+            self.reporters.post_evaluate(self.config, self.population, self.species, best)
+
+            if not self.config.no_fitness_termination:
+                # End if the fitness threshold is reached; batches already submitted still join.
+                fv = self.fitness_criterion(g.fitness for g in self.population.values())
+                if fv >= self.config.fitness_threshold:
+                    self.reporters.found_solution(self.config, self.generation, best)
+                    running = False
+                    continue
+
+            # Divide the population into species again.
+            self.species.speciate(self.config, self.population, self.generation)
+
+            self.reporters.end_generation(self.config, self.population, self.species)
+
+            self.generation += 1
+            if n is not None and k >= n:
+                running = False
+            else:
+                self.reporters.start_generation(self.generation)
+
+        if self.config.no_fitness_termination:
+            self.reporters.found_solution(self.config, self.generation, self.best_genome)
+
+        return self.best_genome
@@ -27,7 +27,8 @@ class DefaultReproduction(DefaultClassConfig):
         return DefaultClassConfig(param_dict,
                                   [ConfigParameter('elitism', int, 0),
                                    ConfigParameter('survival_threshold', float, 0.2),
-                                   ConfigParameter('min_species_size', int, 1)])
+                                   ConfigParameter('min_species_size', int, 1),
+                                   ConfigParameter('batch_mutation', bool, False)])
 
     def __init__(self, config, reporters, stagnation):
         # pylint: disable=super-init-not-called
@@ -137,6 +138,10 @@ class DefaultReproduction(DefaultClassConfig):
                                            pop_size, min_species_size)
 
         new_population = {}
+        # With batch_mutation, offspring are mutated together once every species has bred
+        batch_mutation = (self.reproduction_config.batch_mutation and
+                          hasattr(config.genome_type, 'mutate_many'))
+        offspring = []
         species.species = {}
         for spawn, s in zip(spawn_amounts, remaining_species):
             # If elitism is enabled, each species always at least gets to retain its elites.
@@ -180,9 +185,73 @@ class DefaultReproduction(DefaultClassConfig):
                 gid = next(self.genome_indexer)
                 child = config.genome_type(gid)
                 child.configure_crossover(parent1, parent2, config.genome_config)
-                child.mutate(config.genome_config)
+                if batch_mutation:
+                    offspring.append(child)
+                else:
+                    child.mutate(config.genome_config)
                 # TODO: if config.genome_config.feed_forward, no cycles should exist
                 new_population[gid] = child
                 self.ancestors[gid] = (parent1_id, parent2_id)
 
+        if offspring:
+            config.genome_type.mutate_many(offspring, config.genome_config)
+
         return new_population
+
+    def breed(self, config, species, count):
+        """
+        Produces count offspring of the current members of species, for steady-state
+        evolution. A parent species is drawn in proportion to its adjusted fitness,
+        then both parents from its fittest survival_threshold fraction. Stagnation
+        is not checked.
+        """
+        remaining_species = list(species.species.values())
+        all_fitnesses = [m.fitness for s in remaining_species for m in s.members.values()]
+        min_fitness = min(all_fitnesses)
+        fitness_range = max(1.0, max(all_fitnesses) - min_fitness)
+        adjusted_fitnesses = []
+        for s in remaining_species:
+            s.adjusted_fitness = (mean([m.fitness for m in s.members.values()]) - min_fitness) / fitness_range
+            adjusted_fitnesses.append(s.adjusted_fitness)
+        if not sum(adjusted_fitnesses) > 0:
+            adjusted_fitnesses = None
+
+        batch_mutation = (self.reproduction_config.batch_mutation and
+                          hasattr(config.genome_type, 'mutate_many'))
+        new_genomes = {}
+        for s in random.choices(remaining_species, weights=adjusted_fitnesses, k=count):
+            old_members = sorted(s.members.items(), reverse=True, key=lambda x: x[1].fitness)
+            repro_cutoff = int(math.ceil(self.reproduction_config.survival_threshold * len(old_members)))
+            old_members = old_members[:max(repro_cutoff, 2)]
+
+            parent1_id, parent1 = random.choice(old_members)
+            parent2_id, parent2 = random.choice(old_members)
+
+            gid = next(self.genome_indexer)
+            child = config.genome_type(gid)
+            child.configure_crossover(parent1, parent2, config.genome_config)
+            if not batch_mutation:
+                child.mutate(config.genome_config)
+            new_genomes[gid] = child
+            self.ancestors[gid] = (parent1_id, parent2_id)
+
+        if batch_mutation and new_genomes:
+            config.genome_type.mutate_many(list(new_genomes.values()), config.genome_config)
+
+        return new_genomes
+
+    def worst_member(self, species):
+        """
+        The key of the genome steady-state evolution replaces next: the lowest
+        fitness shared with its species, sparing each species' elites.
+        """
+        min_fitness = min(m.fitness for s in species.species.values() for m in s.members.values())
+        candidates = []
+        for s in species.species.values():
+            members = sorted(s.members.values(), reverse=True, key=lambda g: g.fitness)
+            candidates.extend(((m.fitness - min_fitness) / len(members), m.key)
+                              for m in members[self.reproduction_config.elitism:])
+        if not candidates:
+            # Every genome is an elite; give up the least fit of them
+            candidates = [(m.fitness, m.key) for s in species.species.values() for m in s.members.values()]
+        return min(candidates)[1]
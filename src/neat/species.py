@@ -1,8 +1,12 @@
 """Divides the population into species based on genomic distances."""
 from itertools import count
+from math import sqrt
+
+import numpy as np
 
 from .config import ConfigParameter, DefaultClassConfig
-from .math_util import mean, stdev
+from .genes import DefaultConnectionGene, DefaultNodeGene
+from .genome import DefaultGenome
 
 
 class Species(object):
@@ -24,23 +28,196 @@ class Species(object):
         return [m.fitness for m in self.members.values()]
 
 
+class GenomeArrays(object):
+    """
+    The genes of a set of genomes as arrays, one row per genome and one column
+    per node or connection key, so the distances from one genome to many can be
+    computed with NumPy instead of one gene at a time.
+    """
+
+    def __init__(self, genomes):
+        genomes = list(genomes)
+        self.rows = dict((id(g), i) for i, g in enumerate(genomes))
+        self.node_columns = {}
+        self.connection_columns = {}
+        for g in genomes:
+            for k in g.nodes:
+                self.node_columns.setdefault(k, len(self.node_columns))
+            for k in g.connections:
+                self.connection_columns.setdefault(k, len(self.connection_columns))
+
+        shape = (len(genomes), len(self.node_columns))
+        self.node_present = np.zeros(shape, dtype=bool)
+        self.bias = np.zeros(shape)
+        self.response = np.zeros(shape)
+        self.activation = np.zeros(shape, dtype=int)
+        self.aggregation = np.zeros(shape, dtype=int)
+        shape = (len(genomes), len(self.connection_columns))
+        self.connection_present = np.zeros(shape, dtype=bool)
+        self.weight = np.zeros(shape)
+        self.enabled = np.zeros(shape, dtype=bool)
+
+        # Activation and aggregation names are compared as integer codes
+        names = {}
+        for row, g in enumerate(genomes):
+            for k, ng in g.nodes.items():
+                col = self.node_columns[k]
+                self.node_present[row, col] = True
+                self.bias[row, col] = ng.bias
+                self.response[row, col] = ng.response
+                self.activation[row, col] = names.setdefault(ng.activation, len(names))
+                self.aggregation[row, col] = names.setdefault(ng.aggregation, len(names))
+            for k, cg in g.connections.items():
+                col = self.connection_columns[k]
+                self.connection_present[row, col] = True
+                self.weight[row, col] = cg.weight
+                self.enabled[row, col] = cg.enabled
+        self.node_count = self.node_present.sum(axis=1)
+        self.connection_count = self.connection_present.sum(axis=1)
+
+    @staticmethod
+    def supports(genomes, config):
+        """ True if DefaultGenome.distance, which these arrays reproduce, applies to every genome. """
+        return (config.node_gene_type is DefaultNodeGene
+                and config.connection_gene_type is DefaultConnectionGene
+                and all(type(g).distance is DefaultGenome.distance for g in genomes))
+
+    def distances(self, genome0, others, config):
+        """
+        Returns genome0.distance(g, config) for each g in others as an array.
+        Genes are summed in genome0's order, as DefaultGenome.distance does, so
+        the results are identical and not just close.
+        """
+        r = self.rows[id(genome0)]
+        rows = np.array([self.rows[id(g)] for g in others], dtype=int)
+
+        cols = np.array([self.node_columns[k] for k in genome0.nodes], dtype=int)
+        homologous = self.node_present[rows[:, None], cols]
+        d = (np.abs(self.bias[r, cols] - self.bias[rows[:, None], cols])
+             + np.abs(self.response[r, cols] - self.response[rows[:, None], cols]))
+        d = d + (self.activation[r, cols] != self.activation[rows[:, None], cols])
+        d = d + (self.aggregation[r, cols] != self.aggregation[rows[:, None], cols])
+        node_distance = self.combine(d * config.compatibility_weight_coefficient, homologous,
+                                     len(cols), self.node_count[rows], config)
+
+        cols = np.array([self.connection_columns[k] for k in genome0.connections], dtype=int)
+        homologous = self.connection_present[rows[:, None], cols]
+        d = np.abs(self.weight[r, cols] - self.weight[rows[:, None], cols])
+        d = d + (self.enabled[r, cols] != self.enabled[rows[:, None], cols])
+        connection_distance = self.combine(d * config.compatibility_weight_coefficient, homologous,
+                                           len(cols), self.connection_count[rows], config)
+
+        return node_distance + connection_distance
+
+    @staticmethod
+    def combine(gene_distances, homologous, count0, counts, config):
+        """ Adds up one kind of gene's distances and disjoint genes, normalised by the larger genome. """
+        gene_distances = np.where(homologous, gene_distances, 0.0)
+        if count0:
+            # accumulate adds left to right, like the loop in DefaultGenome.distance
+            total = np.add.accumulate(gene_distances, axis=1)[:, -1]
+        else:
+            total = np.zeros(len(counts))
+        matched = homologous.sum(axis=1)
+        disjoint = (count0 - matched) + (counts - matched)
+        max_genes = np.maximum(counts, count0)
+        return np.where(max_genes > 0,
+                        (total + config.compatibility_disjoint_coefficient * disjoint) / np.maximum(max_genes, 1),
+                        0.0)
+
+
 class GenomeDistanceCache(object):
-    def __init__(self, config):
+    """
+    Genetic distances between genomes, each pair stored once and kept across
+    generations for as long as both genomes are in use (elites and species
+    representatives). The mean and variance of the stored distances are kept
+    up to date as entries are added and evicted.
+    """
+
+    def __init__(self, config=None, arrays=None):
         self.distances = {}
+        # Genome each key's distances were computed for, and the keys it has a distance to
+        self.genomes = {}
+        self.partners = {}
         self.config = config
+        self.arrays = arrays
         self.hits = 0
         self.misses = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
 
-    def __call__(self, genome0, genome1):
+    def __len__(self):
+        return len(self.distances)
+
+    @staticmethod
+    def pair(g0, g1):
+        return (g0, g1) if g0 <= g1 else (g1, g0)
+
+    def variance(self):
+        return max(self.m2 / self.count, 0.0) if self.count else 0.0
+
+    def stdev(self):
+        return sqrt(self.variance())
+
+    def add(self, genome0, genome1, d):
+        g0, g1 = genome0.key, genome1.key
+        self.distances[self.pair(g0, g1)] = d
+        self.genomes[g0] = genome0
+        self.genomes[g1] = genome1
+        self.partners.setdefault(g0, set()).add(g1)
+        self.partners.setdefault(g1, set()).add(g0)
+        self.misses += 1
+
+        # Welford's update of the running mean and variance
+        self.count += 1
+        delta = d - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (d - self.mean)
+
+    def forget(self, key):
+        """ Evicts every distance involving the genome with this key. """
+        self.genomes.pop(key, None)
+        for other in self.partners.pop(key, ()):
+            if other != key:
+                self.partners[other].discard(key)
+            d = self.distances.pop(self.pair(key, other))
+
+            self.count -= 1
+            if not self.count:
+                self.mean = self.m2 = 0.0
+                continue
+            delta = d - self.mean
+            self.mean -= delta / self.count
+            self.m2 -= delta * (d - self.mean)
+
+    def prune(self, genomes):
+        """ Keeps only the distances between the given genomes, matched by identity and not just key. """
+        live = dict((g.key, g) for g in genomes)
+        for key, genome in list(self.genomes.items()):
+            if live.get(key) is not genome:
+                self.forget(key)
+
+    def precompute(self, genome0, genomes):
+        """
+        Computes the distances from genome0 to each of genomes that are not yet
+        known in one NumPy pass, if the cache was given GenomeArrays covering them.
+        """
+        if self.arrays is None:
+            return
         g0 = genome0.key
-        g1 = genome1.key
-        d = self.distances.get((g0, g1))
+        missing = [g for g in genomes if self.pair(g0, g.key) not in self.distances]
+        if not missing:
+            return
+        for g, d in zip(missing, self.arrays.distances(genome0, missing, self.config).tolist()):
+            self.add(genome0, g, d)
+
+    def __call__(self, genome0, genome1):
+        d = self.distances.get(self.pair(genome0.key, genome1.key))
         if d is None:
             # Distance is not already computed.
             d = genome0.distance(genome1, self.config)
-            self.distances[g0, g1] = d
-            self.distances[g1, g0] = d
-            self.misses += 1
+            self.add(genome0, genome1, d)
         else:
             self.hits += 1
 
@@ -57,6 +234,7 @@ class DefaultSpeciesSet(DefaultClassConfig):
         self.indexer = count(1)
         self.species = {}
         self.genome_to_species = {}
+        self.distances = GenomeDistanceCache()
 
     @classmethod
     def parse_config(cls, param_dict):
@@ -79,10 +257,14 @@ class DefaultSpeciesSet(DefaultClassConfig):
 
         # Find the best representatives for each existing species.
         unspeciated = set(population)
-        distances = GenomeDistanceCache(config.genome_config)
+        genomes = list(population.values()) + [s.representative for s in self.species.values()]
+        distances = self.distance_cache(config)
+        distances.prune(genomes)
+        distances.arrays = GenomeArrays(genomes) if GenomeArrays.supports(genomes, config.genome_config) else None
         new_representatives = {}
         new_members = {}
         for sid, s in self.species.items():
+            distances.precompute(s.representative, [population[gid] for gid in unspeciated])
             candidates = []
             for gid in unspeciated:
                 g = population[gid]
@@ -97,6 +279,8 @@ class DefaultSpeciesSet(DefaultClassConfig):
             unspeciated.remove(new_rid)
 
         # Partition population into species based on genetic similarity.
+        for rid in new_representatives.values():
+            distances.precompute(population[rid], [population[gid] for gid in unspeciated])
         while unspeciated:
             gid = unspeciated.pop()
             g = population[gid]
@@ -118,6 +302,7 @@ class DefaultSpeciesSet(DefaultClassConfig):
                 sid = next(self.indexer)
                 new_representatives[sid] = gid
                 new_members[sid] = [gid]
+                distances.precompute(g, [population[gid] for gid in unspeciated])
 
         # Update species collection based on new speciation.
         self.genome_to_species = {}
@@ -134,13 +319,58 @@ class DefaultSpeciesSet(DefaultClassConfig):
             member_dict = dict((gid, population[gid]) for gid in members)
             s.update(population[rid], member_dict)
 
+        # Only distances involving this generation's genomes are kept for the next one
+        distances.arrays = None
+        distances.prune(population.values())
+
         # Mean and std genetic distance info report
         if len(population) > 1:
-            gdmean = mean(distances.distances.values())
-            gdstdev = stdev(distances.distances.values())
+            gdmean = distances.mean
+            gdstdev = distances.stdev()
             self.reporters.info(
                 'Mean genetic distance {0:.3f}, standard deviation {1:.3f}'.format(gdmean, gdstdev))
 
+    def distance_cache(self, config):
+        """ The GenomeDistanceCache for config, replacing the one kept for another config. """
+        # Species sets restored from checkpoints written before the cache existed have none
+        distances = getattr(self, 'distances', None)
+        if distances is None or distances.config is not config.genome_config:
+            # Distances depend on the compatibility coefficients of the config
+            distances = self.distances = GenomeDistanceCache(config.genome_config)
+        return distances
+
+    def add(self, config, genome, generation):
+        """
+        Places one genome in the species with the most similar representative, or
+        in a new species it represents, without speciating the whole population.
+        Returns the species id.
+        """
+        distances = self.distance_cache(config)
+        candidates = []
+        for sid, s in self.species.items():
+            d = distances(s.representative, genome)
+            if d < self.species_set_config.compatibility_threshold:
+                candidates.append((d, sid))
+
+        if candidates:
+            ignored_sdist, sid = min(candidates, key=lambda x: x[0])
+            s = self.species[sid]
+        else:
+            sid = next(self.indexer)
+            s = self.species[sid] = Species(sid, generation)
+            s.update(genome, {})
+        s.members[genome.key] = genome
+        self.genome_to_species[genome.key] = sid
+        return sid
+
+    def remove(self, genome_key):
+        """ Takes a genome out of its species, dropping the species once it has no members. """
+        sid = self.genome_to_species.pop(genome_key)
+        s = self.species[sid]
+        del s.members[genome_key]
+        if not s.members:
+            del self.species[sid]
+
     def get_species_id(self, individual_id):
         return self.genome_to_species[individual_id]
 
@@ -1 +1,4 @@
-from .quadtree import QuadTree
\ No newline at end of file
+from .linear_quadtree import LinearQuadTree
+from .partitioned_index import PartitionedIndex
+from .quadtree import QuadTree
+from .spatial_hash_grid import SpatialHashGrid
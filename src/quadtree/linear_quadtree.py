@@ -0,0 +1,164 @@
+import numpy as np
+
+from ..assets import Rectangle, Vector2
+
+
+def spread_bits(values):
+    """ Spaces the low 16 bits of each value out to every other bit. """
+    values = values.astype(np.uint64) & 0xFFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    values = (values | (values << 1)) & 0x55555555
+    return values
+
+
+def morton_codes(cells_x, cells_y):
+    """ Z-order codes of integer cell coordinates, with x in the even bits. """
+    return spread_bits(cells_x) | (spread_bits(cells_y) << np.uint64(1))
+
+
+def concatenate_ranges(starts, ends):
+    """ np.concatenate of np.arange(start, end) for every pair, without a Python loop. """
+    lengths = ends - starts
+    total = lengths.sum()
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(total) + offsets
+
+
+class LinearQuadTree:
+    """ Quadtree stored as flat node arrays over points sorted by Morton code.
+
+    Every node covers one contiguous run of the sorted points, so the tree is
+    built level by level with NumPy and a query only has to gather ranges.
+    Build it with QuadTree.from_points.
+    """
+
+    def __init__(self, xs, ys, ids, boundary: Rectangle = None, capacity: int = 4, max_depth: int = 16):
+        """
+        Args:
+            xs (array-like): x-coordinates of the points.
+            ys (array-like): y-coordinates of the points.
+            ids (array-like): The id returned by queries for each point.
+            boundary (Rectangle): The area covered, grown to fit every point.
+            capacity (int): Points a node may hold before it is divided.
+            max_depth (int): Deepest level of the tree, at most 16.
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        ids = np.asarray(ids)
+        self.capacity = capacity
+        self.max_depth = min(max_depth, 16)
+
+        if boundary is None:
+            left, top, right, bottom = xs.min(initial=0), ys.min(initial=0), xs.max(initial=0), ys.max(initial=0)
+        else:
+            left = min(boundary.x, xs.min(initial=boundary.x))
+            top = min(boundary.y, ys.min(initial=boundary.y))
+            right = max(boundary.x + boundary.w, xs.max(initial=boundary.x))
+            bottom = max(boundary.y + boundary.h, ys.max(initial=boundary.y))
+        width = max(right - left, 1e-9)
+        height = max(bottom - top, 1e-9)
+        self.boundary = Rectangle(Vector2(left, top), Vector2(width, height))
+
+        cells = 1 << self.max_depth
+        cells_x = np.clip(((xs - left) / width * cells).astype(np.int64), 0, cells - 1)
+        cells_y = np.clip(((ys - top) / height * cells).astype(np.int64), 0, cells - 1)
+        codes = morton_codes(cells_x, cells_y)
+        order = np.argsort(codes, kind="stable")
+        self.codes = codes[order]
+        self.xs = xs[order]
+        self.ys = ys[order]
+        self.ids = ids[order]
+        self.build(width, height)
+
+    def build(self, width, height):
+        """ Creates the node arrays one level at a time. """
+        starts = [np.array([0])]
+        ends = [np.array([len(self.codes)])]
+        prefixes = [np.array([0], dtype=np.uint64)]
+        node_x = [np.array([self.boundary.x])]
+        node_y = [np.array([self.boundary.y])]
+        node_w = [np.array([width])]
+        node_h = [np.array([height])]
+        first_child = [np.array([-1])]
+
+        level_first = 0
+        for level in range(self.max_depth):
+            level_starts, level_ends = starts[-1], ends[-1]
+            split = np.flatnonzero(level_ends - level_starts > self.capacity)
+            if not split.size:
+                break
+            count = level_first + len(level_starts)
+            first_child[-1][split] = count + 4 * np.arange(len(split))
+
+            quadrants = np.arange(4, dtype=np.uint64)
+            child_prefixes = (prefixes[-1][split, None] * np.uint64(4) + quadrants).ravel()
+            shift = np.uint64(2 * (self.max_depth - level - 1))
+            child_starts = np.searchsorted(self.codes, child_prefixes << shift).reshape(-1, 4)
+            # Each child ends where the next one starts, the last where its parent ends
+            child_ends = np.column_stack((child_starts[:, 1:], level_ends[split]))
+            starts.append(child_starts.ravel())
+            ends.append(child_ends.ravel())
+            prefixes.append(child_prefixes)
+
+            child_w = node_w[-1][0] / 2
+            child_h = node_h[-1][0] / 2
+            # Quadrants 0-3 are nw, ne, sw, se: bit 0 is x, bit 1 is y
+            node_x.append((node_x[-1][split, None] + (np.arange(4) & 1) * child_w).ravel())
+            node_y.append((node_y[-1][split, None] + (np.arange(4) >> 1) * child_h).ravel())
+            node_w.append(np.full(4 * len(split), child_w))
+            node_h.append(np.full(4 * len(split), child_h))
+            first_child.append(np.full(4 * len(split), -1))
+            level_first = count
+
+        self.node_start = np.concatenate(starts)
+        self.node_end = np.concatenate(ends)
+        self.node_x = np.concatenate(node_x)
+        self.node_y = np.concatenate(node_y)
+        self.node_w = np.concatenate(node_w)
+        self.node_h = np.concatenate(node_h)
+        self.first_child = np.concatenate(first_child)
+
+    def query(self, boundary: Rectangle):
+        """ Returns the ids of the points within boundary, as an array in Morton order. """
+        left, top = boundary.x, boundary.y
+        right, bottom = left + boundary.w, top + boundary.h
+
+        found = []
+        frontier = np.array([0])
+        while frontier.size:
+            x0, y0 = self.node_x[frontier], self.node_y[frontier]
+            x1, y1 = x0 + self.node_w[frontier], y0 + self.node_h[frontier]
+            overlaps = (x0 <= right) & (x1 >= left) & (y0 <= bottom) & (y1 >= top)
+            inside = (x0 >= left) & (x1 <= right) & (y0 >= top) & (y1 <= bottom)
+
+            # Every point of a node inside the boundary is a hit
+            whole = frontier[inside]
+            found.append(concatenate_ranges(self.node_start[whole], self.node_end[whole]))
+
+            partial = frontier[overlaps & ~inside]
+            children = self.first_child[partial]
+            leaves = partial[children < 0]
+            points = concatenate_ranges(self.node_start[leaves], self.node_end[leaves])
+            xs, ys = self.xs[points], self.ys[points]
+            found.append(points[(xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)])
+
+            children = children[children >= 0]
+            frontier = (children[:, None] + np.arange(4)).ravel()
+
+        return self.ids[np.sort(np.concatenate(found))]
+
+    def draw(self, screen):
+        """ Draws the leaves of the quadtree """
+        for index in np.flatnonzero(self.first_child < 0):
+            Rectangle(
+                Vector2(self.node_x[index], self.node_y[index]),
+                Vector2(self.node_w[index], self.node_h[index])
+            ).draw(screen)
+
+    def __len__(self):
+        """Return the number of points in the quadtree."""
+        return len(self.ids)
@@ -0,0 +1,64 @@
+from ..assets import BoundaryShape, Particle, Rectangle, Vector2
+
+
+class PartitionedIndex:
+    """ One spatial index per particle type behind a single index surface.
+
+    Particles are filed by class name ("Player", "Food", ...), so a query for
+    one type never visits particles of another and no per-particle type check
+    is needed.
+    """
+
+    def __init__(self, boundary: Rectangle, create_index):
+        """
+        Args:
+            boundary (Rectangle): The area covered.
+            create_index (callable): Returns a new, empty QuadTree or
+                SpatialHashGrid for a type seen for the first time.
+        """
+        self.boundary = boundary
+        self.create_index = create_index
+        self.partitions = {}
+
+    def __str__(self):
+        """Return a string representation of every partition."""
+        return '\n'.join(f"{object_type}: {index}" for object_type, index in self.partitions.items())
+
+    def partition(self, particle: Particle):
+        """ The index particles of this particle's type are kept in """
+        object_type = type(particle).__name__
+        index = self.partitions.get(object_type)
+        if index is None:
+            index = self.partitions[object_type] = self.create_index()
+        return index
+
+    def insert(self, particle: Particle):
+        return self.partition(particle).insert(particle)
+
+    def remove(self, particle: Particle, position: Vector2 = None):
+        return self.partition(particle).remove(particle, position)
+
+    def move(self, particle: Particle, old_position: Vector2):
+        return self.partition(particle).move(particle, old_position)
+
+    def query(self, boundary: BoundaryShape, object_type = "Player", ordered: bool = True, limit: int = None):
+        """ Returns the particles of object_type within boundary, see QuadTree.query """
+        index = self.partitions.get(object_type)
+        return index.query(boundary, None, ordered, limit) if index is not None else []
+
+    def knn(self, position: Vector2, k: int, object_type = "Player", radius: float = 0,
+            boundary: Rectangle = None, max_radius: float = 0, exclude: Particle = None):
+        """ The k particles of object_type nearest to a circle, see QuadTree.knn """
+        index = self.partitions.get(object_type)
+        if index is None:
+            return []
+        return index.knn(position, k, None, radius, boundary, max_radius, exclude)
+
+    def draw(self, screen):
+        """ Draws every partition """
+        for index in self.partitions.values():
+            index.draw(screen)
+
+    def __len__(self):
+        """Return the number of particles across all partitions."""
+        return sum(len(index) for index in self.partitions.values())
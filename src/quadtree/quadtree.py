@@ -1,8 +1,8 @@
-import pygame
-from pygame.locals import *
-from pygame.math import Vector2
+import heapq
+import itertools
 
-from ..assets import BoundaryShape, Particle, Rectangle
+from ..assets import BoundaryShape, Particle, Rectangle, Vector2
+from .linear_quadtree import LinearQuadTree
 
 
 class QuadTree:
@@ -13,7 +13,23 @@ class QuadTree:
         self.divided = False
         self.depth = 10
 
-    
+    @classmethod
+    def from_points(cls, xs, ys, ids, boundary: Rectangle = None, capacity: int = 4) -> LinearQuadTree:
+        """ Bulk-loads a whole set of points into an array-backed quadtree
+
+        Args:
+            xs (array-like): x-coordinates of the points.
+            ys (array-like): y-coordinates of the points.
+            ids (array-like): The id returned by queries for each point,
+                e.g. its index in the world's arrays.
+            boundary (Rectangle): The area covered, the points' bounds if None.
+            capacity (int): Points a node may hold before it is divided.
+
+        Returns:
+            LinearQuadTree: A tree whose query returns arrays of ids.
+        """
+        return LinearQuadTree(xs, ys, ids, boundary, capacity)
+
     def __str__(self):
         """Return a string representation of this node, suitably formatted."""
         sp = ', '
@@ -63,17 +79,75 @@ class QuadTree:
             return True
         return False
     
-    def remove(self, particle: Particle):
-        """ Removes a game object from the quadtree """
-        if particle in self.particles:
-            self.particles.remove(particle)
+    def remove(self, particle: Particle, position: Vector2 = None):
+        """ Removes a game object from the quadtree
+
+        Args:
+            particle (Particle): The game object to remove.
+            position (Vector2): Where the object was inserted, if it has moved
+                since. Only nodes containing it are searched; None searches all.
+
+        Returns:
+            bool: True if the game object was removed, False otherwise.
+        """
+        path = self.find(particle, position)
+        if path is None:
+            return False
+        self.detach(path, particle)
+        return True
+
+    def move(self, particle: Particle, old_position: Vector2):
+        """ Relocates a game object that has moved from old_position
+
+        The object stays in its node while it remains inside that node's
+        boundary, otherwise it is removed and reinserted from the root.
+
+        Returns:
+            bool: True if the game object is in the quadtree after the move.
+        """
+        path = self.find(particle, old_position)
+        if path is None:
+            return False
+        if path[-1].boundary.contains(particle):
             return True
-        elif self.divided:
-            return self.nw.remove(particle) or \
-                    self.ne.remove(particle) or \
-                    self.sw.remove(particle) or \
-                    self.se.remove(particle) 
-        return False
+        self.detach(path, particle)
+        return self.insert(particle)
+
+    def find(self, particle: Particle, position: Vector2 = None):
+        """ Returns the nodes from this one down to the one holding particle, or None """
+        if any(p is particle for p in self.particles):
+            return [self]
+        if not self.divided:
+            return None
+        for child in (self.nw, self.ne, self.sw, self.se):
+            if position is not None and not child.boundary.contains_point(*position):
+                continue
+            path = child.find(particle, position)
+            if path is not None:
+                return [self] + path
+        return None
+
+    @staticmethod
+    def detach(path: list, particle: Particle):
+        """ Takes particle out of the last node of path and merges emptied nodes above it """
+        node = path[-1]
+        node.particles = [p for p in node.particles if p is not particle]
+        for node in reversed(path):
+            node.merge()
+
+    def merge(self):
+        """ Folds the children back into this node once they fit within its capacity """
+        if not self.divided:
+            return
+        children = (self.nw, self.ne, self.sw, self.se)
+        if any(child.divided for child in children):
+            return
+        if len(self.particles) + sum(len(child.particles) for child in children) > self.max_particles:
+            return
+        for child in children:
+            self.particles += child.particles
+        del self.nw, self.ne, self.sw, self.se
+        self.divided = False
 
     def divide(self):
         """ Divides the quadtree into four quadtrees """
@@ -95,34 +169,108 @@ class QuadTree:
 
         self.divided = True
 
-    def query(self, boundary: BoundaryShape, object_type = "Player"):
+    def query(self, boundary: BoundaryShape, object_type: str = "Player", ordered: bool = True, limit: int = None):
+        """ Returns the particles within boundary
 
-        particles = []
+        Args:
+            boundary (BoundaryShape): The area to search.
+            object_type (str): Only particles whose name contains it are
+                returned; None returns every particle. A PartitionedIndex
+                keeps one tree per type and passes None.
+            ordered (bool): Sort the result by distance from the centre of
+                boundary. Collision checks that don't care can skip the sort.
+            limit (int): If given, only the limit nearest particles are
+                selected, without sorting the rest.
+        """
+        particles = self.collect(boundary, [])
+        if object_type is not None:
+            particles = [particle for particle in particles if object_type in particle.name]
+        if not ordered:
+            return particles[:limit]
+        return self.query_ordered(boundary, particles, limit)
 
-        if boundary.intersects(self.boundary):
-            return particles
+    def collect(self, boundary: BoundaryShape, found: list) -> list:
+        """ Appends the particles within boundary to found, in no particular order
+
+        Walks the tree with an explicit stack so every level fills the same
+        list. Passing a reused list as found avoids allocating one per query.
+        """
+        if isinstance(boundary, Rectangle):
+            misses = lambda node: not boundary.overlaps(node.boundary)
+        else:
+            misses = lambda node: not boundary.intersects(node.boundary)
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if misses(node):
+                continue
+            for particle in node.particles:
+                if boundary.contains(particle):
+                    found.append(particle)
+            if node.divided:
+                stack += (node.nw, node.ne, node.sw, node.se)
+        return found
+
+    def knn(self, position: Vector2, k: int, object_type: str = "Player", radius: float = 0,
+            boundary: Rectangle = None, max_radius: float = 0, exclude: Particle = None):
+        """ Finds the k particles whose edges are nearest to a circle
+
+        Nodes are visited best-first, keyed by the smallest edge distance any
+        particle inside them could have, and the search stops as soon as k
+        particles have come off the heap.
+
+        Args:
+            position (Vector2): Centre of the circle to measure from.
+            k (int): Number of particles to return at most.
+            object_type (str): Only particles whose name contains it are returned; None for all.
+            radius (float): Radius of the circle to measure from.
+            boundary (Rectangle): If given, only particles within it are returned.
+            max_radius (float): No particle searched is bigger than this; the
+                ranking is only exact if it holds.
+            exclude (Particle): A particle never to return, e.g. the one searching.
+
+        Returns:
+            list: (edge distance, particle) pairs, nearest first. Overlapping
+                particles have an edge distance of 0; on ties particles at
+                least as big as the circle come first, as in
+                get_nearest_particle_distances.
+        """
+        x, y = position
+        counter = itertools.count()
+        heap = [(max(self.boundary.distance_to_point(x, y) - radius - max_radius, 0), False, next(counter), self)]
+        nearest = []
+        while heap and len(nearest) < k:
+            distance, _, _, item = heapq.heappop(heap)
+            if not isinstance(item, QuadTree):
+                nearest.append((distance, item))
+                continue
+            candidates = item.particles
+            if object_type is not None:
+                candidates = [particle for particle in candidates if object_type in particle.name]
+            for particle in candidates:
+                if particle is exclude:
+                    continue
+                if boundary is not None and not boundary.contains(particle):
+                    continue
+                edge_distance = max(particle.position.distance_to((x, y)) - radius - particle.radius, 0)
+                heapq.heappush(heap, (edge_distance, radius > particle.radius, next(counter), particle))
+            if item.divided:
+                for child in (item.nw, item.ne, item.sw, item.se):
+                    if boundary is not None and not boundary.overlaps(child.boundary):
+                        continue
+                    bound = max(child.boundary.distance_to_point(x, y) - radius - max_radius, 0)
+                    heapq.heappush(heap, (bound, False, next(counter), child))
+        return nearest
 
-        # ... and if this node has children, search them too.
-        if self.divided:
-            particles += self.nw.query(boundary, object_type)
-            particles += self.ne.query(boundary, object_type)
-            particles += self.sw.query(boundary, object_type)
-            particles += self.se.query(boundary, object_type)
-        
-        # Search this node's points to see if they lie within boundary ...
-        for particle in self.particles:
-            # Ensure that the check of the object type to the name only applies to subclasses of Particle that have a name field
-            assert(issubclass(type(particle), Particle))
-            if boundary.contains(particle):
-                if object_type in particle.name:
-                    particles.append(particle)
-        
-        return self.query_ordered(boundary, particles)
-    
     # Create function that takes boundary and list of particles and returns a list of particles ordered by distance from the center of the boundary
-    def query_ordered(self, boundary: BoundaryShape, particles: list):
+    def query_ordered(self, boundary: BoundaryShape, particles: list, limit: int = None):
         """Return a list of particles ordered by distance from the center of the boundary"""
-        return sorted(particles, key=lambda particle: particle.position.distance_to(boundary.center))
+        center = boundary.center if isinstance(boundary, Rectangle) else boundary.position
+        key = lambda particle: particle.position.distance_to(center)
+        if limit is not None and limit < len(particles):
+            return heapq.nsmallest(limit, particles, key=key)
+        return sorted(particles, key=key)
 
     def draw(self, screen):
         """ Draws the quadtree """
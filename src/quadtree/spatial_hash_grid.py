@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import math
+
+from ..assets import BoundaryShape, Particle, Player, Rectangle, Vector2
+
+
+class SpatialHashGrid:
+    """ Uniform grid of square cells, hashed by cell coordinates.
+
+    Has the same insert/remove/query surface as QuadTree but is meant to live
+    across frames: move re-buckets a particle in O(1) instead of rebuilding the
+    whole index.
+    """
+
+    def __init__(self, boundary: Rectangle, cell_size: float = None):
+        """
+        Args:
+            boundary (Rectangle): The area covered, used when drawing the grid.
+            cell_size (float): Side of a cell; defaults to half the players'
+                vision distance, so a vision query scans 3-4 cells per axis
+                and few particles outside the vision boundary.
+        """
+        self.boundary = boundary
+        self.cell_size = cell_size or Player.vision_distance // 2
+        self.cells = {}
+        # id(particle) -> cell key, so particles can be moved or removed
+        # without searching for them
+        self.particle_cells = {}
+
+    def __str__(self):
+        """Return a string representation of the grid's occupied cells."""
+        cells = ', '.join(
+            f"{key}: " + ', '.join(str(particle) for particle in cell.values())
+            for key, cell in sorted(self.cells.items())
+        )
+        return f"{self.boundary}, cell size {self.cell_size}" + (f"\n{cells}" if cells else "")
+
+    def cell_key(self, x, y) -> tuple:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, particle: Particle):
+        """ Inserts a game object into the grid
+
+        Returns:
+            bool: True if the game object was inserted, False if it already was.
+        """
+        if id(particle) in self.particle_cells:
+            return False
+        key = self.cell_key(particle.position.x, particle.position.y)
+        self.cells.setdefault(key, {})[id(particle)] = particle
+        self.particle_cells[id(particle)] = key
+        return True
+
+    def remove(self, particle: Particle, position: Vector2 = None):
+        """ Removes a game object from the grid, wherever it has moved since it was inserted """
+        key = self.particle_cells.pop(id(particle), None)
+        if key is None:
+            return False
+        cell = self.cells[key]
+        del cell[id(particle)]
+        if not cell:
+            del self.cells[key]
+        return True
+
+    def move(self, particle: Particle, old_position: Vector2 = None):
+        """ Re-buckets a particle after its position has changed.
+
+        The grid remembers each particle's cell, so old_position is accepted
+        for parity with QuadTree.move but not needed.
+
+        Returns:
+            bool: True if the particle is in the grid.
+        """
+        old_key = self.particle_cells.get(id(particle))
+        if old_key is None:
+            return False
+        key = self.cell_key(particle.position.x, particle.position.y)
+        if key != old_key:
+            self.remove(particle)
+            self.insert(particle)
+        return True
+
+    def query(self, boundary: BoundaryShape, object_type: str = "Player", ordered: bool = True, limit: int = None):
+        """ Returns the particles within boundary
+
+        Args:
+            boundary (BoundaryShape): The area to search.
+            object_type (str): Only particles whose name contains it are
+                returned; None returns every particle.
+            ordered (bool): Sort the result by distance from the centre of boundary.
+            limit (int): If given, only the limit nearest particles are selected.
+        """
+        if isinstance(boundary, Rectangle):
+            left, top = boundary.x, boundary.y
+            right, bottom = left + boundary.w, top + boundary.h
+        else:
+            x, y = boundary.position
+            left, top = x - boundary.radius, y - boundary.radius
+            right, bottom = x + boundary.radius, y + boundary.radius
+        min_cx, min_cy = self.cell_key(left, top)
+        max_cx, max_cy = self.cell_key(right, bottom)
+
+        particles = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    continue
+                particles += [particle for particle in cell.values() if boundary.contains(particle)]
+        if object_type is not None:
+            particles = [particle for particle in particles if object_type in particle.name]
+
+        if not ordered:
+            return particles[:limit]
+        center = boundary.center if isinstance(boundary, Rectangle) else boundary.position
+        key = lambda particle: particle.position.distance_to(center)
+        if limit is not None and limit < len(particles):
+            return heapq.nsmallest(limit, particles, key=key)
+        return sorted(particles, key=key)
+
+    def knn(self, position: Vector2, k: int, object_type: str = "Player", radius: float = 0,
+            boundary: Rectangle = None, max_radius: float = 0, exclude: Particle = None):
+        """ Finds the k particles whose edges are nearest to a circle
+
+        Same contract as QuadTree.knn: cells are visited best-first, keyed by
+        the smallest edge distance any particle inside them could have.
+
+        Returns:
+            list: (edge distance, particle) pairs, nearest first.
+        """
+        x, y = position
+        size = self.cell_size
+        if boundary is None:
+            keys = self.cells.keys()
+        else:
+            min_cx, min_cy = self.cell_key(boundary.x, boundary.y)
+            max_cx, max_cy = self.cell_key(boundary.x + boundary.w, boundary.y + boundary.h)
+            keys = [(cx, cy) for cx in range(min_cx, max_cx + 1) for cy in range(min_cy, max_cy + 1)
+                    if (cx, cy) in self.cells]
+
+        counter = itertools.count()
+        heap = []
+        for cx, cy in keys:
+            dx = max(cx * size - x, 0, x - (cx + 1) * size)
+            dy = max(cy * size - y, 0, y - (cy + 1) * size)
+            heap.append((max(math.hypot(dx, dy) - radius - max_radius, 0), False, next(counter), (cx, cy)))
+        heapq.heapify(heap)
+
+        nearest = []
+        while heap and len(nearest) < k:
+            distance, _, _, item = heapq.heappop(heap)
+            if not isinstance(item, tuple):
+                nearest.append((distance, item))
+                continue
+            candidates = self.cells[item].values()
+            if object_type is not None:
+                candidates = [particle for particle in candidates if object_type in particle.name]
+            for particle in candidates:
+                if particle is exclude:
+                    continue
+                if boundary is not None and not boundary.contains(particle):
+                    continue
+                edge_distance = max(particle.position.distance_to((x, y)) - radius - particle.radius, 0)
+                heapq.heappush(heap, (edge_distance, radius > particle.radius, next(counter), particle))
+        return nearest
+
+    def draw(self, screen):
+        """ Draws the occupied cells """
+        size = Vector2(self.cell_size, self.cell_size)
+        for cx, cy in self.cells:
+            Rectangle(Vector2(cx * self.cell_size, cy * self.cell_size), size).draw(screen)
+
+    def __len__(self):
+        """Return the number of particles in the grid."""
+        return len(self.particle_cells)
@@ -0,0 +1,6 @@
+"""Headless simulation of the game world, independent of pygame."""
+from ..assets import WorldState
+from .fitness_cache import FitnessCache
+from .multi_arena import MultiArenaEvaluator
+from .observer import BaseObserver
+from .simulation import Simulation
@@ -0,0 +1,89 @@
+"""
+Memoizes arena evaluations. With a fixed seed an arena is deterministic, so a
+roster of genomes that has been played before with the same seed gets its
+fitnesses back without being simulated again.
+"""
+from collections import Counter, OrderedDict
+
+
+class FitnessCache(object):
+    """
+    Remembers the fitnesses of seeded arenas, for MultiArenaEvaluator.
+
+    Genomes in an arena play together, so a genome's fitness is keyed by its
+    structural key, the arena's seed and its opponents (the keys of the whole
+    roster, in the order they were placed). The least recently used arenas
+    are forgotten once more than size are remembered.
+
+    Arenas are dealt at random, so a roster only comes round again if it is
+    put back together; find picks out the remembered rosters a generation
+    still has all the genomes of.
+    """
+
+    def __init__(self, size=1000, reporters=None):
+        """
+        Arguments:
+            size {int} -- Arenas remembered
+            reporters {ReporterSet} -- Told the hit and miss counts by report
+        """
+        self.size = size
+        self.reporters = reporters
+        self.fitnesses = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.fitnesses)
+
+    @staticmethod
+    def key(seed, genomes):
+        # A genome's slot in the roster stands in for its key, so clones
+        # placed in the same arena keep their own fitness
+        return seed, tuple(genome.structural_key() for _, genome in genomes)
+
+    def get(self, seed, genomes):
+        """ The fitnesses of an arena of (genome_id, genome) pairs played with seed, in order, or None. """
+        key = self.key(seed, genomes)
+        fitnesses = self.fitnesses.get(key)
+        if fitnesses is None:
+            self.misses += len(genomes)
+            return None
+        self.hits += len(genomes)
+        self.fitnesses.move_to_end(key)
+        return fitnesses
+
+    def find(self, genomes, seeds):
+        """ Puts the remembered arenas played with one of seeds back together from genomes.
+
+        Arguments:
+            genomes {iterable} -- (genome_id, genome) pairs to take the arenas from
+            seeds {iterable} -- Seeds of the arenas to look for
+
+        Returns:
+            list -- (seed, arena) pairs, each arena a list of (genome_id, genome)
+                pairs in the order it was played, for get. No seed or genome is
+                used twice, and more recently used arenas are found first.
+        """
+        available = {}
+        for pair in genomes:
+            available.setdefault(pair[1].structural_key(), []).append(pair)
+        seeds = set(seeds)
+        found = []
+        for seed, roster in reversed(self.fitnesses):
+            if seed not in seeds:
+                continue
+            if all(len(available.get(key, ())) >= count for key, count in Counter(roster).items()):
+                found.append((seed, [available[key].pop() for key in roster]))
+                seeds.remove(seed)
+        return found
+
+    def put(self, seed, genomes, fitnesses):
+        """ Remembers the fitnesses an arena of (genome_id, genome) pairs got when played with seed. """
+        self.fitnesses[self.key(seed, genomes)] = tuple(fitnesses)
+        if len(self.fitnesses) > self.size:
+            self.fitnesses.popitem(last=False)
+
+    def report(self):
+        if self.reporters is not None:
+            self.reporters.info("Fitness cache: {0} hits, {1} misses, {2} arenas remembered".format(
+                self.hits, self.misses, len(self.fitnesses)))
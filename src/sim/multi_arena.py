@@ -0,0 +1,207 @@
+"""
+Evaluates a generation as several headless arenas played side by side in a
+pool of worker processes. Players still compete for food and eat each other,
+but only against the genomes in their own arena.
+"""
+import queue
+import random
+from multiprocessing import Pool, TimeoutError
+
+import numpy as np
+
+from ..assets import SharedWorldState
+from . import simulation as simulation_module
+from .observer import BaseObserver
+from .simulation import Simulation
+
+
+class ClockObserver(BaseObserver):
+    """ Keeps a SharedWorldState's clock at the frame its simulation has reached. """
+
+    def update(self, simulation):
+        simulation.world.clock[0] = simulation.frame
+
+    def end(self, simulation):
+        simulation.world.clock[0] = simulation.frame
+        simulation.world.clock[1] = 1
+
+
+def reseed_worker():
+    """ Pool initializer giving each worker its own random and numpy streams.
+
+    Forked workers start with a copy of the parent's generator states, so
+    without it unseeded arenas played in different workers draw the same
+    numbers.
+    """
+    random.seed()
+    np.random.seed()
+
+
+def play_arena(genomes, config, width, height, fitness_function, seed=None, world_name=None):
+    """ Runs one arena to the end without rendering.
+
+    Arguments:
+        genomes {list} -- (genome_id, genome) pairs taking part
+        config {neat.config} -- The NEAT configuration
+        width {int} -- Arena width
+        height {int} -- Arena height
+        fitness_function {callable} -- Takes a Player at the end of the round and returns its fitness
+        seed {int} -- Seeds random and numpy before the arena is built, if given
+        world_name {str} -- Name of a SharedWorldState to play the arena in, so
+            another process can watch it
+
+    Returns:
+        list -- (genome_id, fitness) pairs, in the order of genomes
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    world = None
+    if world_name is not None:
+        world = SharedWorldState(len(genomes), simulation_module.NUM_FOOD, world_name)
+    simulation = Simulation.from_genomes(genomes, config, width, height, world)
+    if world is not None:
+        simulation.add_observer(ClockObserver())
+    simulation.run()
+    fitnesses = dict((player.id, fitness_function(player)) for player in simulation.players)
+
+    if world is not None:
+        # The players are views onto the shared block, so they go before it is closed
+        del simulation
+        world.close()
+    return [(genome_id, fitnesses[index]) for index, (genome_id, _) in enumerate(genomes)]
+
+
+def split_arenas(genomes, num_arenas, genome_to_species=None):
+    """ Deals genomes out to num_arenas arenas of near equal size.
+
+    With genome_to_species, members of a species are dealt out in turn so every
+    arena gets its share of each species; otherwise the deal is random.
+
+    Returns:
+        list -- One list of (genome_id, genome) pairs per non-empty arena
+    """
+    genomes = list(genomes)
+    if genome_to_species is None:
+        random.shuffle(genomes)
+    else:
+        genomes.sort(key=lambda pair: (genome_to_species.get(pair[0], -1), random.random()))
+    arenas = [genomes[start::num_arenas] for start in range(num_arenas)]
+    return [arena for arena in arenas if arena]
+
+
+class MultiArenaEvaluator(object):
+    def __init__(self, num_workers, num_arenas, width, height, fitness_function,
+                 species_set=None, seed=None, timeout=None, watch=None, watch_interval=1 / 30,
+                 fitness_cache=None):
+        """
+        fitness_function should be a module level function taking a Player at
+        the end of its round and returning its fitness; it is pickled to the
+        workers. If species_set is given, arenas are stratified by species.
+        With a seed, arena i is seeded with seed + i, so an evaluation is
+        repeatable, and if a FitnessCache is given as fitness_cache an arena
+        whose seed and roster have been played before is not played again.
+        Such arenas are put back together before the other genomes are dealt
+        out, so genomes carried over unchanged, like elites, keep their arena.
+
+        If watch is given, every arena is played in a SharedWorldState, and
+        while they run watch is called with the list of them about every
+        watch_interval seconds, to draw or record them without copying.
+        """
+        self.num_arenas = num_arenas
+        self.width = width
+        self.height = height
+        self.fitness_function = fitness_function
+        self.species_set = species_set
+        self.seed = seed
+        self.timeout = timeout
+        self.watch = watch
+        self.watch_interval = watch_interval
+        self.fitness_cache = fitness_cache
+        self.pool = Pool(processes=num_workers, initializer=reseed_worker)
+        # Arenas started with submit, and the results of those that have finished
+        self.submitted = 0
+        self.finished = queue.Queue()
+
+    def __del__(self):
+        self.pool.close()
+        self.pool.join()
+        self.pool.terminate()
+
+    def evaluate(self, genomes, config):
+        genome_to_species = self.species_set.genome_to_species if self.species_set is not None else None
+        genomes = dict(genomes)
+        jobs, worlds = [], []
+        try:
+            for seed, arena in self.arenas(genomes, genome_to_species):
+                if seed is not None and self.fitness_cache is not None:
+                    fitnesses = self.fitness_cache.get(seed, arena)
+                    if fitnesses is not None:
+                        for (genome_id, _), fitness in zip(arena, fitnesses):
+                            genomes[genome_id].fitness = fitness
+                        continue
+                world_name = None
+                if self.watch is not None:
+                    worlds.append(SharedWorldState(len(arena), simulation_module.NUM_FOOD))
+                    world_name = worlds[-1].name
+                jobs.append((seed, arena, self.pool.apply_async(
+                    play_arena, (arena, config, self.width, self.height, self.fitness_function, seed, world_name))))
+
+            if self.watch is not None:
+                for _, _, job in jobs:
+                    while not job.ready():
+                        self.watch(worlds)
+                        job.wait(self.watch_interval)
+                self.watch(worlds)
+
+            # assign the fitness back to each genome
+            for seed, arena, job in jobs:
+                results = job.get(timeout=self.timeout)
+                for genome_id, fitness in results:
+                    genomes[genome_id].fitness = fitness
+                if seed is not None and self.fitness_cache is not None:
+                    self.fitness_cache.put(seed, arena, [fitness for _, fitness in results])
+        finally:
+            for world in worlds:
+                world.close()
+        if self.fitness_cache is not None:
+            self.fitness_cache.report()
+
+    def arenas(self, genomes, genome_to_species=None):
+        """ Deals a dict of genomes out to (seed, arena) pairs, the seed None without self.seed. """
+        if self.seed is None:
+            return [(None, arena) for arena in split_arenas(genomes.items(), self.num_arenas, genome_to_species)]
+
+        seeds = [self.seed + index for index in range(self.num_arenas)]
+        replayed = []
+        if self.fitness_cache is not None:
+            replayed = self.fitness_cache.find(genomes.items(), seeds)
+        taken = set(genome_id for _, arena in replayed for genome_id, _ in arena)
+        rest = [(genome_id, genome) for genome_id, genome in genomes.items() if genome_id not in taken]
+        if rest and len(replayed) == len(seeds):
+            # Genomes would be left without an arena, so everyone is dealt out again
+            replayed, rest = [], list(genomes.items())
+        seeds = [seed for seed in seeds if seed not in set(seed for seed, _ in replayed)]
+        return replayed + list(zip(seeds, split_arenas(rest, len(seeds), genome_to_species)))
+
+    @property
+    def capacity(self):
+        """ Arenas played at once when evaluating asynchronously, see Population.run_async. """
+        return self.num_arenas
+
+    def submit(self, genomes, config):
+        """ Starts playing genomes as one arena; collect returns its results once it has finished. """
+        seed = self.seed + self.submitted if self.seed is not None else None
+        self.submitted += 1
+        self.pool.apply_async(play_arena, (genomes, config, self.width, self.height, self.fitness_function, seed),
+                              callback=self.finished.put, error_callback=self.finished.put)
+
+    def collect(self):
+        """ Waits for the next submitted arena to finish and returns its (genome_id, fitness) pairs. """
+        try:
+            results = self.finished.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError()
+        if isinstance(results, BaseException):
+            raise results
+        return results
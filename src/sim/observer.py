@@ -0,0 +1,17 @@
+"""
+Observers are notified as a Simulation runs. Rendering is implemented as an
+observer so the simulation itself never needs pygame or a display.
+"""
+
+
+class BaseObserver(object):
+    """Definition of the observer interface expected by Simulation."""
+
+    def start(self, simulation):
+        pass
+
+    def update(self, simulation):
+        pass
+
+    def end(self, simulation):
+        pass
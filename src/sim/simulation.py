@@ -0,0 +1,203 @@
+""" Headless world-step engine for a single arena of players and food. """
+import numpy as np
+
+import settings
+
+from ..assets import Food, Rectangle, Vector2, WorldState
+from ..getters import (FOOD_DETECTION, GAME_BORDER, PLAYER_DETECTION, get_knn_inputs,
+                       get_neat_components, get_spatial_index)
+from ..neat.nn import BatchedPopulationNetwork
+
+NUM_FOOD = settings.game["num_food"]
+SCORE_LIMIT = settings.game["max_score"]
+FRAME_LIMIT = settings.game["frame_limit"]
+# Every step advances game time by one fixed frame, however fast it runs
+TIMESTEP = 1 / settings.game["fps"]
+
+
+class Simulation:
+    """ Steps players, food, the quadtree, collisions, sensing and NN activation.
+
+    The players and food become views onto one WorldState, so collisions,
+    eating and punishment run in bulk. Nothing in here imports pygame; attach a
+    renderer with add_observer to watch the game.
+    """
+
+    def __init__(self, players, models, width, height, food=None, genomes=None, network=None, world=None):
+        """
+        Arguments:
+            players {list} -- Players taking part, indexed like models
+            models {list} -- One network per player, anything with activate(inputs)
+            width {int} -- Arena width
+            height {int} -- Arena height
+            food {list} -- Initial food, generated if not given
+            genomes {list} -- Genomes the players were created from, if any
+            network {BatchedPopulationNetwork} -- Evaluates every player's model
+                in one call; if None each model is activated in turn
+            world {WorldState} -- Holds the state of the players and food, such
+                as a SharedWorldState others can watch; a new one if None. It
+                must have a slot for every player and at least NUM_FOOD food slots
+        """
+        food = list(food) if food is not None else []
+        if world is None:
+            world = WorldState(len(players), max(NUM_FOOD, len(food)))
+        elif world.num_players != len(players) or world.num_food < max(NUM_FOOD, len(food)):
+            raise ValueError("A world with {0} player and {1} food slots cannot hold this arena".format(
+                world.num_players, world.num_food))
+        self.world = world
+        for index, player in enumerate(players):
+            player.attach(self.world, index)
+        for index, f in enumerate(food):
+            f.attach(self.world, index)
+        # Every food slot gets a view up front; eaten food is respawned in place
+        self.food = food + [Food(Vector2(0, 0), index, self.world, index)
+                            for index in range(len(food), self.world.num_food)]
+        self.world.food_active[len(food):] = False
+
+        self.players = players
+        self.models = models
+        self.network = network
+        self.genomes = genomes
+        self.width = width
+        self.height = height
+        self.area = Rectangle(Vector2(0, 0), Vector2(width, height))
+        self.frame = 0
+        self.observers = []
+        self.selected_nearby_players = None
+        self.selected_nearby_food = None
+        self.ensure_food()
+        # The spatial index of players and food, kept up to date between frames
+        self.quadtree = self.build_index()
+
+    @classmethod
+    def from_genomes(cls, genomes, config, width, height, world=None):
+        """ Create a simulation with one player per (genome_id, genome) pair. """
+        neat_components = get_neat_components(genomes, config, width, height)
+        return cls(
+            neat_components["players"],
+            neat_components["models"],
+            width,
+            height,
+            genomes=neat_components["genomes"],
+            network=BatchedPopulationNetwork.from_networks(neat_components["models"]),
+            world=world,
+        )
+
+    @property
+    def game_time(self) -> float:
+        """ Seconds of game time elapsed, derived from the frame counter. """
+        return round(self.frame * TIMESTEP, 2)
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def finished(self) -> bool:
+        """ The round ends on the frame limit, the score limit or when nobody is left. """
+        if not self.players:
+            return True
+        max_score = max(player.score for player in self.players)
+        return self.frame >= FRAME_LIMIT or max_score >= SCORE_LIMIT
+
+    def run(self):
+        """ Step the simulation until it is finished.
+
+        Returns:
+            list -- The players, with their end of round statistics
+        """
+        for observer in self.observers:
+            observer.start(self)
+
+        while not self.finished():
+            self.step()
+            for observer in self.observers:
+                observer.update(self)
+
+        for observer in self.observers:
+            observer.end(self)
+        return self.players
+
+    def step(self):
+        """ Advance the world by a single frame. """
+        self.frame += 1
+        world = self.world
+
+        eaters, victims = world.eat_players()
+        for eater_index, victim_index in zip(eaters, victims):
+            eater = self.players[eater_index]
+            self.players[victim_index].fail_reason += f"eaten by {eater.name} at {eater.score}"
+        eaten_food = world.eat_food()
+        world.punish(world.alive)
+
+        # Food stays in the index until eaten; only what changed is updated
+        quadtree = self.quadtree
+        for index in victims:
+            quadtree.remove(self.players[index])
+        for index in eaten_food:
+            quadtree.remove(self.food[index])
+
+        self.selected_nearby_players = None
+        self.selected_nearby_food = None
+
+        for player in self.players:
+            player.colliding = False
+
+        # Every living player senses the world as it stood at the start of the
+        # frame, then they all move together
+        moving = np.flatnonzero(world.alive)
+        outputs = np.empty(len(moving))
+        if self.network is not None:
+            sensors = np.zeros(self.network.input_slots.shape)
+        max_radius = world.radii.max(initial=0)
+        for slot, player_index in enumerate(moving):
+            player = self.players[player_index]
+            position, radius, vision = player.position, player.radius, player.vision_boundary
+            nearest_players = quadtree.knn(position, PLAYER_DETECTION, "Player", radius, vision, max_radius, player)
+            nearest_food = quadtree.knn(position, FOOD_DETECTION, "Food", radius, vision, Food.radius)
+
+            inputs = get_knn_inputs(player, nearest_players, nearest_food)
+            if self.network is not None:
+                sensors[player_index] = inputs
+            else:
+                output = self.models[player_index].activate(inputs)
+                player.nn_outputs = output
+                outputs[slot] = output[0]
+
+            if player.selected:
+                self.selected_nearby_players = [p for _, p in nearest_players]
+                self.selected_nearby_food = [f for _, f in nearest_food]
+
+        if self.network is not None:
+            # The whole population's networks run in one call
+            network_outputs = self.network.activate(sensors)
+            outputs = network_outputs[moving, 0]
+            for player_index in moving:
+                self.players[player_index].nn_outputs = network_outputs[player_index].tolist()
+
+        old_positions = world.positions[moving].tolist()
+        world.move_all(outputs, self.width, self.height, moving)
+        respawned_food = self.ensure_food()
+
+        for index, old_position in zip(moving, old_positions):
+            quadtree.move(self.players[index], old_position)
+        for index in respawned_food:
+            quadtree.insert(self.food[index])
+
+    def build_index(self):
+        """ Create a spatial index holding every living player and all food on the map. """
+        quadtree = get_spatial_index(self.area)
+        for index in np.flatnonzero(self.world.alive):
+            quadtree.insert(self.players[index])
+        for index in np.flatnonzero(self.world.food_active):
+            quadtree.insert(self.food[index])
+        return quadtree
+
+    def ensure_food(self):
+        """ Put eaten food back so the map always holds the configured amount.
+
+        Returns:
+            np.ndarray -- Indices of the food that was put back
+        """
+        return self.world.respawn_food(self.width, self.height, GAME_BORDER)
@@ -2,7 +2,6 @@ import random
 from math import sqrt
 
 import numpy as np
-import pygame
 
 
 # Adjust network output with random noise
@@ -0,0 +1,47 @@
+""" Configs and genomes shared by the tests. """
+import os
+import tempfile
+
+from src.neat import Config, DefaultGenome, DefaultReproduction, DefaultSpeciesSet, DefaultStagnation
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CONFIG_FILE = os.path.join(ROOT, 'config-feedforward.txt')
+
+
+def make_config(genome_type=DefaultGenome):
+    """ The repo's config-feedforward.txt, with its genome section read for genome_type. """
+    if genome_type is DefaultGenome:
+        return Config(DefaultGenome, DefaultReproduction, DefaultSpeciesSet, DefaultStagnation, CONFIG_FILE)
+
+    # Other genome types read the same parameters as DefaultGenome, from a section named after them
+    with open(CONFIG_FILE) as f:
+        text = f.read().replace('[DefaultGenome]', f'[{genome_type.__name__}]')
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(text)
+    try:
+        return Config(genome_type, DefaultReproduction, DefaultSpeciesSet, DefaultStagnation, f.name)
+    finally:
+        os.remove(f.name)
+
+
+def make_varied_config(genome_type=DefaultGenome):
+    """ make_config, with mutations that add nodes and change activations, aggregations and enabled flags. """
+    config = make_config(genome_type)
+    config.genome_config.node_add_prob = 0.5
+    config.genome_config.activation_options = ["relu", "sigmoid", "tanh"]
+    config.genome_config.activation_mutate_rate = 0.3
+    config.genome_config.aggregation_mutate_rate = 0.3
+    config.genome_config.enabled_mutate_rate = 0.2
+    return config
+
+
+def make_genomes(config, count, mutations):
+    """ count new DefaultGenomes keyed 0 to count - 1, each mutated the given number of times. """
+    genomes = []
+    for key in range(count):
+        genome = DefaultGenome(key)
+        genome.configure_new(config.genome_config)
+        for _ in range(mutations):
+            genome.mutate(config.genome_config)
+        genomes.append(genome)
+    return genomes
@@ -0,0 +1,100 @@
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from src.neat import ArrayGenome, Population
+from src.neat.graphs import creates_cycle
+from src.neat.nn import FeedForwardNetwork
+from tests.helpers import make_genomes, make_varied_config
+
+
+class TestArrayGenome(unittest.TestCase):
+    def setUp(self):
+        random.seed(19)
+        np.random.seed(19)
+        self.config = make_varied_config(ArrayGenome)
+        self.genome_config = self.config.genome_config
+        self.defaults = make_genomes(self.config, 12, 10)
+        self.genomes = [ArrayGenome.from_genome(g, self.genome_config) for g in self.defaults]
+
+    def assertConsistent(self, genome):
+        self.assertTrue(np.all(np.diff(genome.node_keys) > 0))
+        self.assertTrue(np.all(np.diff(genome.connection_codes) > 0))
+        self.assertEqual(len(genome.bias), len(genome.node_keys))
+        self.assertEqual(len(genome.aggregation), len(genome.node_keys))
+        self.assertEqual(len(genome.weight), len(genome.connection_codes))
+        self.assertEqual(len(genome.enabled), len(genome.connection_codes))
+        for key in genome.connections:
+            others = dict((k, None) for k in genome.connections if k != key)
+            self.assertFalse(creates_cycle(others, key))
+
+    def test_round_trip(self):
+        for default, genome in zip(self.defaults, self.genomes):
+            self.assertEqual(genome.to_genome().structural_hash(), default.structural_hash())
+            self.assertEqual(genome.size(), default.size())
+            self.assertEqual(str(genome), str(default))
+
+    def test_distance_matches_default_genome(self):
+        for default, genome in zip(self.defaults, self.genomes):
+            for other_default, other in zip(self.defaults, self.genomes):
+                self.assertAlmostEqual(genome.distance(other, self.genome_config),
+                                       default.distance(other_default, self.genome_config))
+
+    def test_network_matches_default_genome(self):
+        inputs = [random.uniform(-1, 1) for _ in self.genome_config.input_keys]
+        for default, genome in zip(self.defaults, self.genomes):
+            expected = FeedForwardNetwork.create(default, self.config).activate(inputs)
+            self.assertEqual(FeedForwardNetwork.create(genome, self.config).activate(inputs), expected)
+
+    def test_crossover_of_identical_parents_is_a_clone(self):
+        parent = self.genomes[0]
+        parent.fitness = 1.0
+        child = ArrayGenome(100)
+        child.configure_crossover(parent, parent, self.genome_config)
+        self.assertEqual(child.structural_hash(), parent.structural_hash())
+
+    def test_crossover_takes_genes_from_the_fittest_parent(self):
+        parent1, parent2 = self.genomes[:2]
+        parent1.fitness, parent2.fitness = 2.0, 1.0
+        child = ArrayGenome(100)
+        child.configure_crossover(parent1, parent2, self.genome_config)
+        self.assertEqual(set(child.connections), set(parent1.connections))
+        self.assertEqual(set(child.nodes), set(parent1.nodes))
+        for key, gene in child.connections.items():
+            values = {parent1.connections[key].weight}
+            if key in parent2.connections:
+                values.add(parent2.connections[key].weight)
+            self.assertIn(gene.weight, values)
+        self.assertConsistent(child)
+
+    @parameterized.expand([
+        ("combined", False),
+        ("single_structural", True),
+    ])
+    def test_mutate_keeps_arrays_consistent(self, _, single_structural):
+        self.genome_config.single_structural_mutation = single_structural
+        for genome in self.genomes:
+            for _ in range(20):
+                genome.mutate(self.genome_config)
+            self.assertConsistent(genome)
+            self.assertTrue(set(self.genome_config.output_keys) <= set(genome.nodes))
+
+    def test_population_evolves(self):
+        self.config.pop_size = 30
+        population = Population(self.config)
+
+        def evaluate(genomes, config):
+            for _, genome in genomes:
+                network = FeedForwardNetwork.create(genome, config)
+                genome.fitness = network.activate([1.0] * len(config.genome_config.input_keys))[0]
+
+        best = population.run(evaluate, 3)
+        self.assertIsInstance(best, ArrayGenome)
+        for genome in population.population.values():
+            self.assertConsistent(genome)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import copy
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from src.neat import DefaultGenome, DefaultReproduction, DefaultStagnation
+from src.neat.attributes import BoolAttribute, FloatAttribute, IntegerAttribute, StringAttribute
+from src.neat.genes import DefaultConnectionGene
+from src.neat.reporting import ReporterSet
+from tests.helpers import make_genomes, make_varied_config
+
+
+class AttributeConfig(object):
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class TestMutateValues(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(20)
+
+    @parameterized.expand([
+        ("mutate", 1.0, 0.0),
+        ("replace", 0.0, 1.0),
+        ("mixed", 0.6, 0.3),
+    ])
+    def test_float_rates_and_clamping(self, _, mutate_rate, replace_rate):
+        config = AttributeConfig(x_init_mean=5.0, x_init_stdev=1.0, x_init_type='gaussian',
+                                 x_mutate_rate=mutate_rate, x_replace_rate=replace_rate, x_mutate_power=10.0,
+                                 x_min_value=-2.0, x_max_value=2.0)
+        values = np.zeros(20000)
+        mutated = FloatAttribute('x').mutate_values(values, config)
+        self.assertTrue(np.all((mutated >= -2.0) & (mutated <= 2.0)))
+        self.assertAlmostEqual(np.mean(mutated != 0.0), mutate_rate + replace_rate, delta=0.02)
+        # Replacements are drawn around init_mean and clamped to max_value
+        self.assertAlmostEqual(np.mean(mutated == 2.0), replace_rate + mutate_rate * 0.42, delta=0.02)
+        self.assertTrue(np.all(values == 0.0))
+
+    def test_float_uniform_init(self):
+        config = AttributeConfig(x_init_mean=0.0, x_init_stdev=1.0, x_init_type='uniform',
+                                 x_min_value=-1.5, x_max_value=10.0)
+        values = FloatAttribute('x').init_values(config, 1000)
+        self.assertTrue(np.all((values >= -1.5) & (values <= 2.0)))
+
+    def test_integer(self):
+        config = AttributeConfig(x_mutate_rate=0.5, x_replace_rate=0.5, x_mutate_power=3.0,
+                                 x_min_value=0, x_max_value=4)
+        mutated = IntegerAttribute('x').mutate_values([2] * 1000, config)
+        self.assertEqual(mutated.dtype.kind, 'i')
+        self.assertEqual(set(mutated.tolist()), {0, 1, 2, 3, 4})
+
+    def test_bool_rate_depends_on_value(self):
+        config = AttributeConfig(x_mutate_rate=0.0, x_rate_to_true_add=0.0, x_rate_to_false_add=1.0)
+        values = np.array([True, False] * 5000)
+        mutated = BoolAttribute('x').mutate_values(values, config)
+        self.assertTrue(np.all(~mutated[1::2]))
+        # A mutated value is chosen at random, so about half stay True
+        self.assertAlmostEqual(np.mean(mutated[::2]), 0.5, delta=0.03)
+
+    def test_string(self):
+        config = AttributeConfig(x_mutate_rate=0.5, x_options=['a', 'b'])
+        mutated = StringAttribute('x').mutate_values(['c'] * 1000, config).tolist()
+        self.assertAlmostEqual(mutated.count('c') / 1000, 0.5, delta=0.05)
+        self.assertEqual(set(mutated), {'a', 'b', 'c'})
+
+
+class TestMutateMany(unittest.TestCase):
+    def setUp(self):
+        random.seed(20)
+        np.random.seed(20)
+        self.config = make_varied_config()
+        self.genomes = make_genomes(self.config, 40, 10)
+
+    def test_genes_keep_python_types(self):
+        DefaultGenome.mutate_many(self.genomes, self.config.genome_config)
+        for genome in self.genomes:
+            for gene in genome.connections.values():
+                self.assertIs(type(gene.weight), float)
+                self.assertIs(type(gene.enabled), bool)
+            for gene in genome.nodes.values():
+                self.assertIs(type(gene.bias), float)
+                self.assertIn(gene.activation, self.config.genome_config.activation_options)
+
+    def test_weights_mutate_at_the_configured_rate(self):
+        genes = [gene for genome in self.genomes for gene in genome.connections.values()]
+        before = [gene.weight for gene in genes]
+        DefaultConnectionGene.mutate_many(genes, self.config.genome_config)
+        changed = np.mean([gene.weight != w for gene, w in zip(genes, before)])
+        genome_config = self.config.genome_config
+        self.assertAlmostEqual(changed, genome_config.weight_mutate_rate + genome_config.weight_replace_rate,
+                               delta=0.1)
+
+    def test_structure_mutates_as_in_mutate(self):
+        # Structural mutations draw from the same random stream whichever way genomes are mutated
+        one_by_one = copy.deepcopy(self.genomes)
+        self.config.genome_config.node_indexer = None
+        random.seed(3)
+        for genome in one_by_one:
+            genome.mutate_structure(self.config.genome_config)
+        self.config.genome_config.node_indexer = None
+        random.seed(3)
+        DefaultGenome.mutate_many(self.genomes, self.config.genome_config)
+        self.assertEqual([set(g.connections) for g in self.genomes], [set(g.connections) for g in one_by_one])
+        self.assertEqual([set(g.nodes) for g in self.genomes], [set(g.nodes) for g in one_by_one])
+
+
+class TestBatchedReproduction(unittest.TestCase):
+    @parameterized.expand([
+        ("batched", True),
+        ("one_by_one", False),
+    ])
+    def test_reproduce(self, _, batch_mutation):
+        random.seed(21)
+        np.random.seed(21)
+        config = make_varied_config()
+        config.reproduction_config.batch_mutation = batch_mutation
+        reporters = ReporterSet()
+        reproduction = DefaultReproduction(config.reproduction_config, reporters,
+                                           DefaultStagnation(config.stagnation_config, reporters))
+        population = reproduction.create_new(config.genome_type, config.genome_config, config.pop_size)
+        species = config.species_set_type(config.species_set_config, reporters)
+        species.speciate(config, population, 0)
+        for genome in population.values():
+            genome.fitness = random.random()
+
+        new_population = reproduction.reproduce(config, species, config.pop_size, 1)
+        self.assertGreaterEqual(len(new_population), config.pop_size)
+        children = [g for key, g in new_population.items() if key not in population]
+        self.assertTrue(children)
+        # Offspring of the fully connected initial genomes have all been mutated
+        weights = set(round(gene.weight, 12) for g in population.values() for gene in g.connections.values())
+        for child in children:
+            self.assertTrue(any(round(gene.weight, 12) not in weights for gene in child.connections.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
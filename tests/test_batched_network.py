@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from src.neat.nn import BatchedPopulationNetwork, FeedForwardNetwork
+from tests.helpers import make_config, make_genomes
+
+
+class TestBatchedPopulationNetwork(unittest.TestCase):
+    def setUp(self):
+        random.seed(29)
+        self.config = make_config()
+        genome_config = self.config.genome_config
+        genome_config.activation_options = ["relu", "sigmoid", "tanh", "clamped", "identity", "gauss", "inv"]
+        genome_config.activation_mutate_rate = 0.5
+        genome_config.aggregation_mutate_rate = 0.3
+        genome_config.node_add_prob = 0.6
+
+    @parameterized.expand([
+        ("sum", ["sum"]),
+        ("median", ["median"]),
+        ("mixed", ["sum", "product", "mean", "median", "max", "min", "maxabs"]),
+    ])
+    def test_matches_feed_forward_networks(self, _, aggregations):
+        self.config.genome_config.aggregation_options = aggregations
+        genomes = make_genomes(self.config, 40, 20)
+        expected = [FeedForwardNetwork.create(genome, self.config) for genome in genomes]
+        batched = BatchedPopulationNetwork.create(genomes, self.config)
+
+        for _ in range(3):
+            inputs = np.random.uniform(-5, 5, (len(genomes), 11))
+            outputs = batched.activate(inputs)
+            self.assertEqual(outputs.shape, (len(genomes), 1))
+            for row, network in zip(range(len(genomes)), expected):
+                np.testing.assert_allclose(outputs[row], network.activate(inputs[row].tolist()), atol=1e-9)
+
+    def test_custom_activations_fall_back_to_per_node_evaluation(self):
+        self.config.genome_config.add_activation("halve", lambda z: z / 2)
+        self.config.genome_config.activation_options = ["halve"]
+        self.config.genome_config.activation_default = "halve"
+        genomes = make_genomes(self.config, 5, 5)
+        expected = [FeedForwardNetwork.create(genome, self.config) for genome in genomes]
+        batched = BatchedPopulationNetwork.from_networks(expected)
+        self.assertTrue(all(layer.python_activations for layer in batched.layers))
+
+        inputs = np.random.uniform(-5, 5, (len(genomes), 11))
+        outputs = batched.activate(inputs)
+        for row, network in enumerate(expected):
+            np.testing.assert_allclose(outputs[row], network.activate(inputs[row].tolist()))
+
+    def test_wrong_input_shape(self):
+        batched = BatchedPopulationNetwork.create(make_genomes(self.config, 2, 0), self.config)
+        with self.assertRaises(RuntimeError):
+            batched.activate(np.zeros((3, 11)))
+
+    def test_empty_population(self):
+        batched = BatchedPopulationNetwork.from_networks([])
+        self.assertEqual(len(batched), 0)
+        self.assertEqual(batched.activate(np.zeros((0, 0))).shape, (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
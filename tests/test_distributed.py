@@ -0,0 +1,136 @@
+import os
+import random
+import socket
+import tempfile
+import time
+import unittest
+from multiprocessing import Process
+
+from parameterized import parameterized
+
+from src.neat.distributed import MODE_PRIMARY, MODE_SECONDARY, DistributedEvaluator, adaptive_chunksize
+from tests.helpers import make_config, make_genomes
+from tests.test_parallel import output_fitness
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+AUTHKEY = b'sentient blobs'
+
+# The first secondary to evaluate genome 0 stalls on it, once, after creating this file
+STRAGGLER_MARKER = os.path.join(tempfile.gettempdir(), 'sentient_blobs_straggler_{0}'.format(os.getpid()))
+
+
+def straggling_fitness(genome, config):
+    if genome.key == 0:
+        try:
+            os.close(os.open(STRAGGLER_MARKER, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            pass
+        else:
+            time.sleep(3)
+    time.sleep(0.01)
+    return output_fitness(genome, config)
+
+
+def run_secondary(addr, eval_function):
+    evaluator = DistributedEvaluator(addr, AUTHKEY, eval_function, num_workers=1, mode=MODE_SECONDARY)
+    evaluator.start(exit_on_stop=False)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+class TestAdaptiveChunksize(unittest.TestCase):
+    @parameterized.expand([
+        ("unmeasured", 100, None, 1.0, 1, 1, 1),
+        ("unmeasured_pool", 100, None, 1.0, 4, 1, 4),
+        ("fills_chunk_time", 1000, 0.01, 1.0, 1, 1, 100),
+        ("pool_takes_more", 1000, 0.01, 1.0, 4, 1, 400),
+        ("two_chunks_per_secondary", 100, 0.01, 1.0, 1, 5, 10),
+        ("slow_genomes", 100, 5.0, 1.0, 1, 1, 1),
+        ("instant_genomes", 100, 0.0, 1.0, 1, 2, 25),
+    ])
+    def test_chunksize(self, name, num_tasks, genome_time, chunk_time, workers, nodes, expected):
+        self.assertEqual(adaptive_chunksize(num_tasks, genome_time, chunk_time, workers, nodes), expected)
+
+
+class TestDistributedEvaluator(unittest.TestCase):
+    def setUp(self):
+        random.seed(25)
+        self.config = make_config()
+        self.genomes = list(enumerate(make_genomes(self.config, 12, 5)))
+        for genome_id, genome in self.genomes:
+            genome.key = genome_id
+        self.addr = ('localhost', free_port())
+        self.secondaries = []
+
+    def start(self, eval_function, num_secondaries=3, **kwargs):
+        evaluator = DistributedEvaluator(self.addr, AUTHKEY, eval_function, mode=MODE_PRIMARY, **kwargs)
+        evaluator.start()
+        for _ in range(num_secondaries):
+            process = Process(target=run_secondary, args=(self.addr, eval_function))
+            process.daemon = True
+            process.start()
+            self.secondaries.append(process)
+        self.addCleanup(self.stop, evaluator)
+        return evaluator
+
+    def stop(self, evaluator):
+        evaluator.stop(wait=0.5)
+        for process in self.secondaries:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+        if os.path.exists(STRAGGLER_MARKER):
+            os.remove(STRAGGLER_MARKER)
+
+    def assert_fitnesses(self, genomes):
+        for genome_id, genome in genomes:
+            self.assertEqual(genome.fitness, output_fitness(genome, self.config))
+
+    @parameterized.expand([(1,), (5,), (None,)])
+    def test_fitnesses_match_serial_evaluation(self, chunksize):
+        evaluator = self.start(output_fitness, secondary_chunksize=chunksize)
+        evaluator.evaluate(self.genomes, self.config)
+        self.assert_fitnesses(self.genomes)
+
+    def test_chunk_size_adapts_to_measured_time(self):
+        evaluator = self.start(output_fitness, chunk_time=10.0)
+        evaluator.evaluate(self.genomes, self.config)
+        self.assertIsNotNone(evaluator.genome_time)
+        self.assertGreater(evaluator.genome_time, 0)
+        self.assertTrue(evaluator.secondaries)
+        self.assertTrue(all(workers == 1 for workers in evaluator.secondaries.values()))
+
+        # Fast genomes and a long chunk time make the largest chunks that still spread the load
+        for genome_id, genome in self.genomes:
+            genome.fitness = None
+        evaluator.evaluate(self.genomes, self.config)
+        self.assert_fitnesses(self.genomes)
+
+    def test_straggler_is_raced_by_a_copy(self):
+        evaluator = self.start(straggling_fitness, secondary_chunksize=1, straggler_factor=2.0)
+        begin = time.time()
+        evaluator.evaluate(self.genomes, self.config)
+        self.assertLess(time.time() - begin, 2.5)
+        self.assertGreaterEqual(evaluator.speculated, 1)
+        self.assert_fitnesses(self.genomes)
+
+        # The straggler's late result belongs to the last evaluation and is not taken for this one
+        others = list(enumerate(make_genomes(self.config, 6, 5), 100))
+        for genome_id, genome in others:
+            genome.key = genome_id
+        evaluator.evaluate(others, self.config)
+        self.assert_fitnesses(others)
+
+    def test_no_speculation_without_straggler_factor(self):
+        evaluator = self.start(output_fitness, secondary_chunksize=2, straggler_factor=None)
+        evaluator.evaluate(self.genomes, self.config)
+        self.assertEqual(evaluator.speculated, 0)
+        self.assert_fitnesses(self.genomes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import pygame
+
+from src.drawer import SimulationRenderer
+
+
+class TestSimulationRenderer(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.window = pygame.Surface((10, 10))
+
+    def test_draws_every_nth_step(self):
+        renderer = SimulationRenderer(self.window, 0, render_every=5)
+        drawn = [frame for frame in range(1, 21)
+                 if renderer.should_draw(SimpleNamespace(frame=frame), now=0)]
+        self.assertEqual(drawn, [5, 10, 15, 20])
+
+    def test_draws_on_wall_clock_interval(self):
+        renderer = SimulationRenderer(self.window, 0, render_every=5, render_interval=0.5)
+        renderer.last_draw_time = 10.0
+        simulation = SimpleNamespace(frame=5)
+        self.assertFalse(renderer.should_draw(simulation, now=10.2))
+        self.assertTrue(renderer.should_draw(simulation, now=10.5))
+
+    def test_events_are_handled_between_draws(self):
+        renderer = SimulationRenderer(self.window, 0, render_every=1000, event_interval=0.05)
+        renderer.last_event_time = 10.0
+        self.assertFalse(renderer.should_handle_events(now=10.01))
+        self.assertTrue(renderer.should_handle_events(now=10.05))
+
+        renderer = SimulationRenderer(self.window, 0, render_every=1000, event_interval=0)
+        simulation = SimpleNamespace(frame=0, players=[])
+        renderer.start(simulation)
+        with mock.patch("src.drawer.check_for_game_events") as check:
+            for frame in range(1, 6):
+                simulation.frame = frame
+                renderer.update(simulation)
+        self.assertEqual(check.call_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import copy
+import random
+import unittest
+
+import numpy as np
+
+from src.neat.reporting import BaseReporter, ReporterSet
+from src.sim import FitnessCache, MultiArenaEvaluator
+from src.sim import simulation as simulation_module
+from tests.helpers import make_config, make_genomes
+from tests.test_multi_arena import score_fitness
+
+
+class InfoReporter(BaseReporter):
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+class TestFitnessCache(unittest.TestCase):
+    def setUp(self):
+        random.seed(23)
+        self.config = make_config()
+        self.genomes = list(enumerate(make_genomes(self.config, 4, 5)))
+        self.fitnesses = [1.0, 2.0, 3.0, 4.0]
+
+    def clones(self):
+        return [(key + 10, copy.deepcopy(genome)) for key, genome in self.genomes]
+
+    def test_repeated_roster_is_remembered(self):
+        cache = FitnessCache()
+        self.assertIsNone(cache.get(7, self.genomes))
+        cache.put(7, self.genomes, self.fitnesses)
+
+        self.assertEqual(cache.get(7, self.clones()), tuple(self.fitnesses))
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_changed_opponent_misses(self):
+        cache = FitnessCache()
+        cache.put(7, self.genomes, self.fitnesses)
+        clones = self.clones()
+        next(iter(clones[-1][1].connections.values())).weight += 1
+
+        self.assertIsNone(cache.get(7, clones))
+
+    def test_order_and_seed_are_part_of_the_key(self):
+        cache = FitnessCache()
+        cache.put(7, self.genomes, self.fitnesses)
+
+        self.assertIsNone(cache.get(8, self.genomes))
+        self.assertIsNone(cache.get(7, self.genomes[::-1]))
+
+    def test_remembered_arenas_are_found_in_a_new_generation(self):
+        cache = FitnessCache()
+        cache.put(7, self.genomes[:2], self.fitnesses[:2])
+        cache.put(8, self.genomes[2:], self.fitnesses[2:])
+        changed = copy.deepcopy(self.genomes[3][1])
+        changed.nodes[0].bias += 1
+        generation = [self.clones()[3], (20, changed), self.clones()[1], self.clones()[0]]
+
+        found = cache.find(generation, [7, 8])
+        self.assertEqual([(seed, [key for key, _ in arena]) for seed, arena in found], [(7, [10, 11])])
+        self.assertEqual(cache.get(*found[0]), tuple(self.fitnesses[:2]))
+        self.assertEqual(cache.find(generation, [8]), [])
+
+    def test_least_recently_used_arena_is_forgotten(self):
+        cache = FitnessCache(size=1)
+        cache.put(7, self.genomes[:2], self.fitnesses[:2])
+        cache.put(7, self.genomes[2:], self.fitnesses[2:])
+
+        self.assertIsNone(cache.get(7, self.genomes[:2]))
+        self.assertEqual(len(cache), 1)
+
+    def test_counts_are_reported(self):
+        reporters = ReporterSet()
+        reporter = InfoReporter()
+        reporters.add(reporter)
+        cache = FitnessCache(reporters=reporters)
+        cache.get(7, self.genomes)
+        cache.put(7, self.genomes, self.fitnesses)
+        cache.get(7, self.clones())
+        cache.report()
+
+        self.assertEqual(reporter.messages[-1], "Fitness cache: 4 hits, 4 misses, 1 arenas remembered")
+
+
+class TestMultiArenaFitnessCache(unittest.TestCase):
+    def setUp(self):
+        random.seed(24)
+        # Short rounds keep the test fast; forked workers inherit the limit
+        self.frame_limit = simulation_module.FRAME_LIMIT
+        simulation_module.FRAME_LIMIT = 20
+        self.config = make_config()
+        self.genomes = list(enumerate(make_genomes(self.config, 9, 3)))
+        self.cache = FitnessCache()
+        self.evaluator = MultiArenaEvaluator(2, 3, 400, 300, score_fitness, seed=9, fitness_cache=self.cache)
+
+    def tearDown(self):
+        simulation_module.FRAME_LIMIT = self.frame_limit
+
+    def test_replayed_arenas_come_from_the_cache(self):
+        random.seed(5)
+        self.evaluator.evaluate(self.genomes, self.config)
+        played = [genome.fitness for _, genome in self.genomes]
+        self.assertEqual((self.cache.hits, self.cache.misses, len(self.cache)), (0, 9, 3))
+
+        clones = [(key, copy.deepcopy(genome)) for key, genome in self.genomes]
+        for _, genome in clones:
+            genome.fitness = None
+        random.seed(5)
+        self.evaluator.evaluate(clones, self.config)
+        self.assertEqual([genome.fitness for _, genome in clones], played)
+        self.assertEqual(self.cache.hits, 9)
+
+    def test_elites_carried_over_keep_their_arena(self):
+        self.evaluator.evaluate(self.genomes, self.config)
+        played = dict((key, genome.fitness) for key, genome in self.genomes)
+
+        # The next generation keeps all but one genome, in another order, and breeds a new one
+        elites = [(key, copy.deepcopy(genome)) for key, genome in self.genomes[1:]]
+        random.shuffle(elites)
+        child = copy.deepcopy(self.genomes[0][1])
+        child.nodes[0].bias += 1
+        generation = elites + [(9, child)]
+        for _, genome in generation:
+            genome.fitness = None
+        self.evaluator.evaluate(generation, self.config)
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (6, 12))
+        self.assertEqual(len(self.cache), 4)
+        replayed = [key for key, genome in elites if genome.fitness == played[key]]
+        self.assertGreaterEqual(len(replayed), 6)
+        self.assertTrue(all(genome.fitness is not None for _, genome in generation))
+
+    def test_random_state_is_left_to_evolution(self):
+        random.seed(5)
+        np.random.seed(5)
+        draws = []
+        for _ in range(2):
+            self.evaluator.evaluate(self.genomes, self.config)
+            draws.append((random.random(), np.random.random()))
+        self.assertNotEqual(draws[0], draws[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from src.neat.graphs import adjacency, creates_cycle, feed_forward_layers, required_for_output
+from src.neat.nn import FeedForwardNetwork
+from tests.helpers import make_config, make_genomes
+
+INPUTS = [-1, -2]
+OUTPUTS = [0]
+
+
+class TestGraphs(unittest.TestCase):
+    def test_adjacency_keeps_connection_order(self):
+        incoming, outgoing = adjacency([(-1, 1), (-2, 1), (1, 0), (-1, 0)])
+
+        self.assertEqual(incoming, {1: [-1, -2], 0: [1, -1]})
+        self.assertEqual(outgoing, {-1: [1, 0], -2: [1], 1: [0]})
+
+    @parameterized.expand([
+        ("direct", [(-1, 0), (-2, 0)], {0}),
+        ("hidden", [(-1, 1), (1, 0)], {0, 1}),
+        ("dead_end", [(-1, 1), (-1, 0), (0, 2)], {0}),
+        ("unreachable_hidden", [(3, 0), (-1, 0)], {0, 3}),
+    ])
+    def test_required_for_output(self, _, connections, expected):
+        self.assertEqual(required_for_output(INPUTS, OUTPUTS, connections), expected)
+
+    @parameterized.expand([
+        ("direct", [(-1, 0), (-2, 0)], [{0}]),
+        ("chain", [(-1, 1), (1, 2), (2, 0), (-2, 0)], [{1}, {2}, {0}]),
+        ("skip", [(-1, 1), (-2, 2), (1, 0), (2, 0), (-1, 0)], [{1, 2}, {0}]),
+        # A node is only evaluated once every node feeding it has been
+        ("unreachable_hidden", [(3, 0), (-1, 0)], []),
+        ("disconnected", [], []),
+    ])
+    def test_feed_forward_layers(self, _, connections, expected):
+        self.assertEqual(feed_forward_layers(INPUTS, OUTPUTS, connections), expected)
+
+    @parameterized.expand([
+        ("self_loop", (1, 1), True),
+        ("skip", (-1, 0), False),
+        ("closes_loop", (0, 1), True),
+        ("closes_long_loop", (0, -1), True),
+        ("parallel", (-2, 2), False),
+        ("through_hidden", (2, 1), True),
+    ])
+    def test_creates_cycle(self, _, test, expected):
+        connections = [(-1, 1), (1, 2), (2, 0), (-2, 0)]
+        self.assertEqual(creates_cycle(connections, test), expected)
+        self.assertEqual(creates_cycle(connections, test, adjacency(connections)[1]), expected)
+
+    def test_genome_index_follows_mutations(self):
+        random.seed(7)
+        config = make_config()
+        config.genome_config.node_add_prob = 0.5
+        config.genome_config.node_delete_prob = 0.3
+        config.genome_config.conn_add_prob = 0.9
+        config.genome_config.conn_delete_prob = 0.3
+        genome = make_genomes(config, 1, 0)[0]
+        genome.connection_index()
+        for _ in range(100):
+            genome.mutate(config.genome_config)
+            incoming, outgoing = adjacency(genome.connections)
+            index = genome.connection_index()
+            self.assertEqual(dict((k, v) for k, v in index[0].items() if v), dict((k, set(v)) for k, v in outgoing.items()))
+            self.assertEqual(dict((k, v) for k, v in index[1].items() if v), dict((k, set(v)) for k, v in incoming.items()))
+
+        # Feed-forward mutation never closes a cycle
+        for key in genome.connections:
+            self.assertFalse(creates_cycle([k for k in genome.connections if k != key], key))
+
+    def test_create_links_follow_connection_order(self):
+        random.seed(5)
+        config = make_config()
+        config.genome_config.node_add_prob = 0.6
+        for genome in make_genomes(config, 20, 20):
+            network = FeedForwardNetwork.create(genome, config)
+            for node, _, _, _, _, links in network.node_evals:
+                expected = [(i, cg.weight) for (i, o), cg in genome.connections.items() if o == node and cg.enabled]
+                self.assertEqual(links, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from src.neat.nn import FeedForwardNetwork, MatrixFeedForwardNetwork
+from tests.helpers import make_config, make_genomes
+
+
+class TestMatrixFeedForwardNetwork(unittest.TestCase):
+    def setUp(self):
+        random.seed(13)
+        self.config = make_config()
+        genome_config = self.config.genome_config
+        genome_config.activation_options = ["relu", "sigmoid", "tanh", "clamped", "identity", "gauss", "inv"]
+        genome_config.activation_mutate_rate = 0.5
+        genome_config.aggregation_mutate_rate = 0.3
+        genome_config.node_add_prob = 0.6
+
+    @parameterized.expand([
+        ("sum", ["sum"]),
+        ("mean", ["mean"]),
+        ("mixed", ["sum", "product", "mean", "median", "max"]),
+    ])
+    def test_matches_feed_forward_network(self, _, aggregations):
+        self.config.genome_config.aggregation_options = aggregations
+        for genome in make_genomes(self.config, 40, 20):
+            expected = FeedForwardNetwork.create(genome, self.config)
+            actual = MatrixFeedForwardNetwork.create(genome, self.config)
+            for _ in range(3):
+                inputs = [random.uniform(-5, 5) for _ in range(11)]
+                for a, e in zip(actual.activate(inputs), expected.activate(inputs)):
+                    self.assertAlmostEqual(a, e)
+
+    def test_exotic_aggregations_fall_back_to_per_node_evaluation(self):
+        self.config.genome_config.aggregation_options = ["median"]
+        genome = make_genomes(self.config, 1, 0)[0]
+        network = MatrixFeedForwardNetwork.create(genome, self.config)
+
+        self.assertEqual(len(network.layers), 1)
+        self.assertEqual(network.layers[0].slots.size, 0)
+        self.assertEqual(len(network.layers[0].python_nodes), 1)
+
+    def test_wrong_number_of_inputs(self):
+        network = MatrixFeedForwardNetwork.create(make_genomes(self.config, 1, 0)[0], self.config)
+        with self.assertRaises(RuntimeError):
+            network.activate([0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
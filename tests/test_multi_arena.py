@@ -0,0 +1,98 @@
+import random
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from src.neat import DefaultSpeciesSet
+from src.neat.reporting import ReporterSet
+from src.sim import MultiArenaEvaluator
+from src.sim import simulation as simulation_module
+from src.sim.multi_arena import play_arena, split_arenas
+from tests.helpers import make_config, make_genomes
+
+
+def score_fitness(player):
+    return player.score + player.food_eaten
+
+
+def draw(_):
+    return random.random(), float(np.random.random())
+
+
+class TestSplitArenas(unittest.TestCase):
+    def setUp(self):
+        random.seed(21)
+        self.genomes = [(key, None) for key in range(20)]
+
+    def test_random_split_covers_every_genome_once(self):
+        arenas = split_arenas(self.genomes, 3)
+        self.assertEqual([len(arena) for arena in arenas], [7, 7, 6])
+        self.assertEqual(sorted(key for arena in arenas for key, _ in arena), list(range(20)))
+
+    def test_species_are_spread_over_arenas(self):
+        genome_to_species = dict((key, 1 if key < 8 else 2) for key in range(20))
+        arenas = split_arenas(self.genomes, 4, genome_to_species)
+        for arena in arenas:
+            self.assertEqual(sum(genome_to_species[key] == 1 for key, _ in arena), 2)
+
+    def test_more_arenas_than_genomes(self):
+        self.assertEqual(len(split_arenas(self.genomes[:2], 4)), 2)
+
+
+class TestMultiArenaEvaluator(unittest.TestCase):
+    def setUp(self):
+        random.seed(21)
+        # Short rounds keep the test fast; forked workers inherit the limit
+        self.frame_limit = simulation_module.FRAME_LIMIT
+        simulation_module.FRAME_LIMIT = 20
+        self.config = make_config()
+        self.genomes = list(enumerate(make_genomes(self.config, 12, 3)))
+
+    def tearDown(self):
+        simulation_module.FRAME_LIMIT = self.frame_limit
+
+    def test_seeded_arena_is_repeatable(self):
+        first = play_arena(self.genomes[:4], self.config, 400, 300, score_fitness, seed=5)
+        second = play_arena(self.genomes[:4], self.config, 400, 300, score_fitness, seed=5)
+        self.assertEqual(first, second)
+        self.assertEqual([key for key, _ in first], [key for key, _ in self.genomes[:4]])
+
+    @parameterized.expand([
+        ("random", False),
+        ("stratified", True),
+    ])
+    def test_every_genome_gets_its_arena_fitness(self, _, stratified):
+        species_set = None
+        if stratified:
+            species_set = DefaultSpeciesSet(self.config.species_set_config, ReporterSet())
+            species_set.speciate(self.config, dict(self.genomes), 0)
+        evaluator = MultiArenaEvaluator(2, 3, 400, 300, score_fitness, species_set, seed=9)
+        for _, genome in self.genomes:
+            genome.fitness = None
+        evaluator.evaluate(self.genomes, self.config)
+        self.assertTrue(all(genome.fitness is not None for _, genome in self.genomes))
+
+        # With a seed, each arena's fitnesses are those it gets played alone
+        random.seed(21)
+        arenas = split_arenas(self.genomes, 3, species_set.genome_to_species if species_set else None)
+        random.seed(21)
+        evaluator.evaluate(self.genomes, self.config)
+        fitnesses = dict((key, genome.fitness) for key, genome in self.genomes)
+        for index, arena in enumerate(arenas):
+            expected = play_arena(arena, self.config, 400, 300, score_fitness, seed=9 + index)
+            self.assertEqual([(key, fitnesses[key]) for key, _ in arena], expected)
+
+    def test_workers_do_not_share_the_parents_random_state(self):
+        random.seed(3)
+        np.random.seed(3)
+        evaluator = MultiArenaEvaluator(2, 2, 400, 300, score_fitness)
+        parent = draw(None)
+        draws = evaluator.pool.map(draw, range(4), chunksize=1)
+        self.assertNotIn(parent[0], [r for r, _ in draws])
+        self.assertNotIn(parent[1], [n for _, n in draws])
+        self.assertEqual(len(set(draws)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
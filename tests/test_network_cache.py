@@ -0,0 +1,110 @@
+import copy
+import random
+import unittest
+
+from parameterized import parameterized
+
+from src.neat.nn import FeedForwardNetwork, NetworkCache
+from tests.helpers import make_config, make_genomes
+
+
+def change_weight(genome):
+    next(iter(genome.connections.values())).weight += 0.5
+
+
+def change_bias(genome):
+    genome.nodes[0].bias += 0.5
+
+
+def change_activation(genome):
+    genome.nodes[0].activation = "tanh"
+
+
+def disable_connection(genome):
+    next(iter(genome.connections.values())).enabled = False
+
+
+class TestStructuralHash(unittest.TestCase):
+    def setUp(self):
+        random.seed(17)
+        self.config = make_config()
+        self.genome = make_genomes(self.config, 1, 5)[0]
+
+    def test_clone_has_same_hash(self):
+        clone = copy.deepcopy(self.genome)
+        clone.key = self.genome.key + 1
+        clone.fitness = 10
+
+        self.assertEqual(clone.structural_hash(), self.genome.structural_hash())
+
+    @parameterized.expand([
+        ("weight", change_weight),
+        ("bias", change_bias),
+        ("activation", change_activation),
+        ("enabled", disable_connection),
+    ])
+    def test_change_alters_hash(self, _, change):
+        clone = copy.deepcopy(self.genome)
+        change(clone)
+
+        self.assertNotEqual(clone.structural_hash(), self.genome.structural_hash())
+
+    def test_key_is_the_content_the_hash_is_taken_of(self):
+        clone = copy.deepcopy(self.genome)
+        self.assertEqual(clone.structural_key(), self.genome.structural_key())
+        self.assertEqual(self.genome.structural_hash(), hash(self.genome.structural_key()))
+        change_weight(clone)
+        self.assertNotEqual(clone.structural_key(), self.genome.structural_key())
+
+    def test_disabled_connection_weight_is_ignored(self):
+        disable_connection(self.genome)
+        clone = copy.deepcopy(self.genome)
+        next(iter(clone.connections.values())).weight += 0.5
+
+        self.assertEqual(clone.structural_hash(), self.genome.structural_hash())
+
+
+class TestNetworkCache(unittest.TestCase):
+    def setUp(self):
+        random.seed(19)
+        self.config = make_config()
+        self.genomes = make_genomes(self.config, 3, 5)
+
+    def test_unchanged_genome_reuses_network(self):
+        cache = NetworkCache()
+        network = cache.get(self.genomes[0], self.config)
+        clone = copy.deepcopy(self.genomes[0])
+
+        self.assertIs(cache.get(clone, self.config), network)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_cached_network_matches_fresh_one(self):
+        cache = NetworkCache()
+        cache.get(self.genomes[0], self.config)
+        network = cache.get(copy.deepcopy(self.genomes[0]), self.config)
+        fresh = FeedForwardNetwork.create(self.genomes[0], self.config)
+
+        inputs = [random.uniform(-5, 5) for _ in range(11)]
+        self.assertEqual(network.activate(inputs), fresh.activate(inputs))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = NetworkCache(size=2)
+        cache.get(self.genomes[0], self.config)
+        cache.get(self.genomes[1], self.config)
+        cache.get(self.genomes[0], self.config)
+        cache.get(self.genomes[2], self.config)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIn(self.genomes[0].structural_key(), cache.networks)
+        self.assertNotIn(self.genomes[1].structural_key(), cache.networks)
+
+    def test_new_config_clears_cache(self):
+        cache = NetworkCache()
+        network = cache.get(self.genomes[0], self.config)
+
+        self.assertIsNot(cache.get(self.genomes[0], make_config()), network)
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
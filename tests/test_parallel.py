@@ -0,0 +1,140 @@
+import os
+import random
+import time
+import unittest
+from multiprocessing import TimeoutError
+
+from src.neat import PersistentEvaluator, Population
+from src.neat.nn import FeedForwardNetwork
+from tests.helpers import make_config, make_genomes
+
+
+def output_fitness(genome, config):
+    network = FeedForwardNetwork.create(genome, config)
+    return network.activate([0.5] * len(config.genome_config.input_keys))[0]
+
+
+def slow_fitness(genome, config):
+    time.sleep(0.2)
+    return 1.0
+
+
+def hanging_fitness(genome, config):
+    time.sleep(30)
+    return 1.0
+
+
+def failing_fitness(genome, config):
+    raise ValueError("no fitness for genome {0}".format(genome.key))
+
+
+def dying_fitness(genome, config):
+    os._exit(1)
+
+
+class PlainGenome(object):
+    """ A genome without structural_key, whose fitness is its value. """
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.fitness = None
+
+
+def value_fitness(genome, config):
+    return genome.value
+
+
+class TestPersistentEvaluator(unittest.TestCase):
+    def setUp(self):
+        random.seed(22)
+        self.config = make_config()
+        self.genomes = list(enumerate(make_genomes(self.config, 10, 5), 1))
+        self.evaluator = PersistentEvaluator(3, output_fitness, self.config)
+
+    def tearDown(self):
+        self.evaluator.stop()
+
+    def test_fitnesses_match_serial_evaluation(self):
+        self.evaluator.evaluate(self.genomes, self.config)
+        for _, genome in self.genomes:
+            self.assertEqual(genome.fitness, output_fitness(genome, self.config))
+
+    def test_only_new_or_changed_genomes_are_resent(self):
+        self.evaluator.evaluate(self.genomes, self.config)
+        self.assertEqual(self.evaluator.sent, 10)
+
+        changed = self.genomes[0][1]
+        changed.mutate(self.config.genome_config)
+        new = list(enumerate(make_genomes(self.config, 2, 5), 11))
+        self.evaluator.evaluate(self.genomes[:6] + new, self.config)
+        self.assertEqual(self.evaluator.sent, 13)
+        self.assertEqual(changed.fitness, output_fitness(changed, self.config))
+
+        # A genome that left the population is forgotten, so it is sent again when it returns
+        self.evaluator.evaluate(self.genomes, self.config)
+        self.assertEqual(self.evaluator.sent, 17)
+
+    def test_new_config_restarts_the_workers(self):
+        self.evaluator.evaluate(self.genomes, self.config)
+        processes = [process for process, _ in self.evaluator.workers]
+        config = make_config()
+        self.evaluator.evaluate(self.genomes, config)
+        self.assertEqual(self.evaluator.sent, 20)
+        self.assertFalse(any(process.is_alive() for process in processes))
+
+    def test_worker_errors_are_raised(self):
+        evaluator = PersistentEvaluator(2, failing_fitness, self.config)
+        with self.assertRaises(ValueError):
+            evaluator.evaluate(self.genomes, self.config)
+        evaluator.stop()
+
+    def test_genomes_without_structural_key_are_resent_when_changed(self):
+        evaluator = PersistentEvaluator(2, value_fitness, self.config)
+        genomes = [(key, PlainGenome(key, float(key))) for key in range(4)]
+        evaluator.evaluate(genomes, self.config)
+        genomes[0][1].value = 10.0
+        evaluator.evaluate(genomes, self.config)
+        self.assertEqual(genomes[0][1].fitness, 10.0)
+        evaluator.stop()
+
+    def test_dead_worker_is_raised_and_workers_restart(self):
+        evaluator = PersistentEvaluator(2, dying_fitness, self.config)
+        with self.assertRaises(EOFError):
+            evaluator.evaluate(self.genomes[:2], self.config)
+        self.assertEqual(evaluator.workers, [])
+        evaluator.eval_function = output_fitness
+        evaluator.evaluate(self.genomes[:2], self.config)
+        self.assertEqual(self.genomes[0][1].fitness, output_fitness(self.genomes[0][1], self.config))
+        evaluator.stop()
+
+    def test_timeout_restarts_the_workers(self):
+        evaluator = PersistentEvaluator(2, slow_fitness, self.config, timeout=0.05)
+        with self.assertRaises(TimeoutError):
+            evaluator.evaluate(self.genomes[:2], self.config)
+        self.assertEqual(evaluator.workers, [])
+        evaluator.timeout = None
+        evaluator.evaluate(self.genomes[:2], self.config)
+        self.assertEqual(self.genomes[0][1].fitness, 1.0)
+        evaluator.stop()
+
+    def test_timeout_does_not_wait_for_busy_workers(self):
+        evaluator = PersistentEvaluator(2, hanging_fitness, self.config, timeout=0.5)
+        processes = [process for process, _ in evaluator.workers]
+        begin = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            evaluator.evaluate(self.genomes[:4], self.config)
+        self.assertLess(time.monotonic() - begin, 2.0)
+        self.assertFalse(any(process.is_alive() for process in processes))
+
+    def test_population_runs(self):
+        self.config.pop_size = 20
+        population = Population(self.config)
+        best = population.run(self.evaluator.evaluate, 3)
+        self.assertEqual(best.fitness, output_fitness(best, self.config))
+        # Elites are kept in the workers, so fewer genomes are sent than evaluated
+        self.assertLess(self.evaluator.sent, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
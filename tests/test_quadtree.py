@@ -4,6 +4,7 @@ import sys
 import unittest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '../sentient_blobs/src/modules')))
+import numpy as np
 from parameterized import parameterized
 from pygame.math import Vector2
 
@@ -29,6 +30,34 @@ class TestQuadTree(unittest.TestCase):
         self.assertFalse(self.tree.particles)
         self.assertFalse(self.tree.remove(self.particle))
 
+    def test_remove_merges_emptied_children(self):
+        self.tree.insert(self.particle)
+        self.tree.insert(self.particle_2)
+        self.assertTrue(self.tree.divided)
+
+        self.assertTrue(self.tree.remove(self.particle, Vector2(25, 50)))
+
+        self.assertFalse(self.tree.divided)
+        self.assertEqual(self.tree.particles, [self.particle_2])
+
+    def test_move_within_node_keeps_particle_in_place(self):
+        self.tree.insert(self.particle)
+        self.tree.insert(self.particle_2)
+        self.particle_2.position = Vector2(80, 10)
+
+        self.assertTrue(self.tree.move(self.particle_2, Vector2(75, 50)))
+        self.assertEqual(self.tree.ne.particles, [self.particle_2])
+
+    def test_move_across_nodes_relocates_particle(self):
+        self.tree.insert(self.particle)
+        self.tree.insert(self.particle_2)
+        self.particle_2.position = Vector2(75, 80)
+
+        self.assertTrue(self.tree.move(self.particle_2, Vector2(75, 50)))
+
+        self.assertEqual(len(self.tree), 2)
+        self.assertEqual(self.tree.se.particles, [self.particle_2])
+
     def test_str(self):
         self.assertEqual(str(self.tree), "Rectangle: [0, 0], [100, 100]")
     
@@ -67,5 +96,75 @@ class TestQuadTree(unittest.TestCase):
         for i in range(num_particles):
             self.assertTrue(actual[i] in expected)
 
+    def test_query_sorts_once_or_not_at_all(self):
+        rng = np.random.default_rng(11)
+        area = Rectangle(Vector2(0, 0), Vector2(800, 600))
+        tree = QuadTree(area, 4)
+        food = [Food(Vector2(*point), i) for i, point in enumerate(rng.uniform(0, 600, (200, 2)))]
+        for f in food:
+            tree.insert(f)
+        boundary = Rectangle(Vector2(100, 100), Vector2(300, 200))
+        inside = [f for f in food if boundary.contains(f)]
+        by_distance = sorted(inside, key=lambda f: f.position.distance_to(boundary.center))
+
+        self.assertEqual([f.name for f in tree.query(boundary, "Food")], [f.name for f in by_distance])
+        self.assertEqual({f.name for f in tree.query(boundary, "Food", ordered=False)}, {f.name for f in inside})
+        self.assertEqual([f.name for f in tree.query(boundary, None, limit=3)], [f.name for f in by_distance[:3]])
+        # Without a type, only players are returned
+        self.assertEqual(tree.query(boundary), [])
+
+    @parameterized.expand([
+        ("centre", (400, 300), 120),
+        ("corner", (0, 0), 90),
+        ("small", (613, 127), 15),
+        ("everything", (400, 300), 1000),
+    ])
+    def test_circle_query_matches_brute_force(self, name, center, radius):
+        rng = np.random.default_rng(12)
+        area = Rectangle(Vector2(0, 0), Vector2(800, 600))
+        tree = QuadTree(area, 4)
+        food = [Food(Vector2(x, y), i) for i, (x, y) in enumerate(rng.uniform((0, 0), (800, 600), (300, 2)))]
+        for f in food:
+            tree.insert(f)
+        boundary = Circle(Vector2(*center), radius)
+        inside = {f.name for f in food if boundary.contains(f)}
+
+        self.assertTrue(tree.divided)
+        self.assertEqual({f.name for f in tree.query(boundary, "Food", ordered=False)}, inside)
+
+
+class TestQuadTreeFromPoints(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.xs = rng.uniform(0, 800, 300)
+        self.ys = rng.uniform(0, 600, 300)
+        self.area = Rectangle(Vector2(0, 0), Vector2(800, 600))
+
+    @parameterized.expand([
+        (1,),
+        (4,),
+        (32,),
+    ])
+    def test_query_returns_ids_within_boundary(self, capacity):
+        ids = np.arange(300) + 1000
+        tree = QuadTree.from_points(self.xs, self.ys, ids, self.area, capacity)
+
+        for x, y, w, h in [(0, 0, 800, 600), (100, 50, 210, 210), (-50, -50, 100, 100), (700, 500, 300, 300)]:
+            inside = (self.xs >= x) & (self.xs <= x + w) & (self.ys >= y) & (self.ys <= y + h)
+            actual = tree.query(Rectangle(Vector2(x, y), Vector2(w, h)))
+            self.assertEqual(sorted(actual), list(ids[inside]))
+
+    def test_nodes_respect_capacity(self):
+        tree = QuadTree.from_points(self.xs, self.ys, np.arange(300), self.area, 4)
+        leaves = tree.first_child < 0
+        self.assertEqual(len(tree), 300)
+        self.assertTrue(((tree.node_end - tree.node_start)[leaves] <= 4).all())
+        self.assertEqual((tree.node_end - tree.node_start)[leaves].sum(), 300)
+
+    def test_empty(self):
+        tree = QuadTree.from_points([], [], [], self.area)
+        self.assertEqual(len(tree.query(self.area)), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import random
+import unittest
+from multiprocessing import Process
+
+import numpy as np
+
+from src.assets import Player, SharedWorldState, Vector2, WorldState
+
+from src.sim import MultiArenaEvaluator, Simulation
+from src.sim import simulation as simulation_module
+from tests.helpers import make_config, make_genomes
+from tests.test_multi_arena import score_fitness
+
+
+def move_players(name):
+    world = SharedWorldState(3, 2, name)
+    world.positions[:] = [[1, 2], [3, 4], [5, 6]]
+    world.add_score(np.arange(3), [1, 2, 3])
+    world.clock[:] = [10, 1]
+    world.close()
+
+
+class FrameRecorder:
+    def __init__(self):
+        self.frames = []
+        self.players = []
+
+    def __call__(self, worlds):
+        self.frames.append([world.frame for world in worlds])
+        self.players.append([world.num_players for world in worlds])
+
+
+class TestSharedWorldState(unittest.TestCase):
+    def setUp(self):
+        self.world = SharedWorldState(3, 2)
+
+    def tearDown(self):
+        self.world.close()
+
+    def test_starts_like_a_world_state(self):
+        fresh = WorldState(3, 2)
+        for name in WorldState.PLAYER_ARRAYS + WorldState.FOOD_ARRAYS:
+            np.testing.assert_array_equal(getattr(self.world, name), getattr(fresh, name))
+        self.assertEqual((self.world.frame, self.world.finished), (0, False))
+
+    def test_other_processes_write_into_the_same_block(self):
+        process = Process(target=move_players, args=(self.world.name,))
+        process.start()
+        process.join()
+
+        np.testing.assert_array_equal(self.world.positions, [[1, 2], [3, 4], [5, 6]])
+        np.testing.assert_array_equal(self.world.scores, [1, 2, 3])
+        self.assertEqual((self.world.frame, self.world.finished), (10, True))
+
+    def test_snapshot_is_a_copy(self):
+        player = Player(Vector2(7, 8), 0, self.world, 0)
+        snapshot = self.world.snapshot()
+        player.position = Vector2(1, 1)
+        self.assertEqual(tuple(snapshot.positions[0]), (7, 8))
+        self.assertNotIsInstance(snapshot, SharedWorldState)
+
+    def test_simulation_plays_in_a_given_world(self):
+        players = [Player(Vector2(100, 100), 0), Player(Vector2(300, 300), 1)]
+        world = SharedWorldState(2, simulation_module.NUM_FOOD)
+        simulation = Simulation(players, [None, None], 400, 400, world=world)
+        self.assertIs(simulation.world, world)
+        self.assertEqual(tuple(world.positions[1]), (300, 300))
+        del simulation, players
+        world.close()
+
+    def test_simulation_rejects_a_world_of_the_wrong_size(self):
+        with self.assertRaises(ValueError):
+            Simulation([Player(Vector2(100, 100), 0)], [None], 400, 400, world=self.world)
+
+
+class TestWatchedArenas(unittest.TestCase):
+    def setUp(self):
+        random.seed(23)
+        self.frame_limit = simulation_module.FRAME_LIMIT
+        simulation_module.FRAME_LIMIT = 20
+        self.config = make_config()
+        self.genomes = list(enumerate(make_genomes(self.config, 9, 3)))
+
+    def tearDown(self):
+        simulation_module.FRAME_LIMIT = self.frame_limit
+
+    def test_watch_sees_every_arena_to_the_end(self):
+        recorder = FrameRecorder()
+        evaluator = MultiArenaEvaluator(2, 3, 400, 300, score_fitness, seed=4, watch=recorder, watch_interval=0.001)
+        random.seed(5)
+        evaluator.evaluate(self.genomes, self.config)
+        self.assertEqual(recorder.frames[-1], [20, 20, 20])
+        self.assertEqual(recorder.players[-1], [3, 3, 3])
+
+        # Watching changes nothing about the result
+        fitnesses = [genome.fitness for _, genome in self.genomes]
+        random.seed(5)
+        evaluator.watch = None
+        evaluator.evaluate(self.genomes, self.config)
+        self.assertEqual([genome.fitness for _, genome in self.genomes], fitnesses)
+
+
+if __name__ == '__main__':
+    unittest.main()
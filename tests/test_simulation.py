@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from src.assets import Player, Vector2
+from src.sim import BaseObserver, Simulation
+from src.sim import simulation as simulation_module
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class ConstantModel:
+    def __init__(self, output):
+        self.output = output
+        self.calls = 0
+
+    def activate(self, inputs):
+        self.calls += 1
+        return [self.output]
+
+
+class CountingObserver(BaseObserver):
+    def __init__(self):
+        self.started = False
+        self.updates = 0
+        self.ended = False
+
+    def start(self, simulation):
+        self.started = True
+
+    def update(self, simulation):
+        self.updates += 1
+
+    def end(self, simulation):
+        self.ended = True
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.players = [Player(Vector2(100, 100), 0), Player(Vector2(400, 400), 1)]
+        self.models = [ConstantModel(0.0), ConstantModel(0.5)]
+        self.simulation = Simulation(self.players, self.models, 800, 600)
+
+    def test_step_activates_and_moves_every_player(self):
+        start_x = self.players[0].position.x
+        self.simulation.step()
+
+        self.assertEqual(self.simulation.frame, 1)
+        self.assertEqual([m.calls for m in self.models], [1, 1])
+        self.assertNotEqual(self.players[0].position.x, start_x)
+        self.assertEqual(len(self.simulation.food), simulation_module.NUM_FOOD)
+
+    def test_game_time_follows_frames_not_wall_clock(self):
+        for _ in range(simulation_module.settings.game["fps"]):
+            self.simulation.step()
+        self.assertEqual(self.simulation.game_time, 1.0)
+
+    def test_failed_players_are_skipped(self):
+        self.players[1].failed = True
+        self.simulation.step()
+        self.assertEqual(self.models[1].calls, 0)
+
+    def test_index_tracks_living_players_and_food(self):
+        self.players[1].position = Vector2(103, 100)
+        self.players[0].add_score(20)
+        for _ in range(5):
+            self.simulation.step()
+
+        indexed = self.simulation.quadtree.query(self.simulation.area, "Player")
+        indexed += self.simulation.quadtree.query(self.simulation.area, "Food")
+        self.assertTrue(self.players[1].failed)
+        self.assertEqual(sorted(p.name for p in indexed),
+                         sorted([self.players[0].name] + [f.name for f in self.simulation.food]))
+
+    def test_run_stops_at_frame_limit_and_notifies_observers(self):
+        observer = CountingObserver()
+        self.simulation.add_observer(observer)
+        self.simulation.frame = simulation_module.FRAME_LIMIT - 3
+
+        self.simulation.run()
+
+        self.assertTrue(observer.started)
+        self.assertTrue(observer.ended)
+        self.assertEqual(observer.updates, 3)
+        self.assertTrue(self.simulation.finished())
+
+    def test_runs_without_pygame(self):
+        # Make any attempt to import pygame fail, then step a world.
+        script = (
+            "import sys\n"
+            "class Block:\n"
+            "    def find_spec(self, name, path=None, target=None):\n"
+            "        if name == 'pygame' or name.startswith('pygame.'):\n"
+            "            raise ImportError(name)\n"
+            "sys.meta_path.insert(0, Block())\n"
+            "from src.assets import Player, Vector2\n"
+            "from src.sim import Simulation\n"
+            "class Model:\n"
+            "    def activate(self, inputs):\n"
+            "        return [0.25]\n"
+            "sim = Simulation([Player(Vector2(50, 50), 0)], [Model()], 300, 300)\n"
+            "sim.step()\n"
+            "assert 'pygame' not in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from src.assets import *
+from src.getters import get_inputs, get_knn_inputs
+from src.quadtree import PartitionedIndex, QuadTree, SpatialHashGrid
+
+
+class TestSpatialHashGrid(unittest.TestCase):
+    def setUp(self):
+        self.boundary = Rectangle(Vector2(0, 0), Vector2(100, 100))
+        self.grid = SpatialHashGrid(self.boundary, 10)
+        self.player = Player(Vector2(25, 50), 0)
+
+    def test_insert(self):
+        self.assertTrue(self.grid.insert(self.player))
+        self.assertFalse(self.grid.insert(self.player))
+        self.assertEqual(self.grid.particle_cells[id(self.player)], (2, 5))
+        self.assertEqual(len(self.grid), 1)
+
+    def test_remove(self):
+        self.grid.insert(self.player)
+        self.assertTrue(self.grid.remove(self.player))
+        self.assertFalse(self.grid.cells)
+        self.assertFalse(self.grid.remove(self.player))
+
+    def test_move_rebuckets_particle(self):
+        self.grid.insert(self.player)
+        self.player.position = Vector2(95, 5)
+        self.assertTrue(self.grid.move(self.player))
+
+        self.assertEqual(list(self.grid.cells), [(9, 0)])
+        self.assertEqual(self.grid.query(Rectangle(Vector2(90, 0), Vector2(10, 10))), [self.player])
+
+    def test_default_cell_size_follows_vision_distance(self):
+        self.assertEqual(SpatialHashGrid(self.boundary).cell_size, Player.vision_distance // 2)
+
+    def test_partitions_keep_types_apart(self):
+        index = PartitionedIndex(self.boundary, lambda: SpatialHashGrid(self.boundary, 10))
+        food = Food(Vector2(25, 50), 0)
+        index.insert(self.player)
+        index.insert(food)
+
+        self.assertEqual(set(index.partitions), {"Player", "Food"})
+        self.assertEqual(index.query(self.boundary), [self.player])
+        self.assertEqual(index.query(self.boundary, "Food"), [food])
+        self.assertEqual([particle for _, particle in index.knn(Vector2(0, 0), 3, "Food")], [food])
+        self.assertEqual(index.query(self.boundary, "Enemy"), [])
+
+    @parameterized.expand([
+        ("Player",),
+        ("Food",),
+    ])
+    def test_query_matches_quadtree(self, particle_type):
+        random.seed(3)
+        area = Rectangle(Vector2(0, 0), Vector2(800, 600))
+        tree = QuadTree(area, 4)
+        grid = SpatialHashGrid(area)
+        particles = [Player(Vector2(random.uniform(0, 800), random.uniform(0, 600)), i) for i in range(60)]
+        particles += [Food(Vector2(random.uniform(0, 800), random.uniform(0, 600)), i) for i in range(200)]
+        for particle in particles:
+            tree.insert(particle)
+            grid.insert(particle)
+
+        for player in particles[:60]:
+            expected = tree.query(player.vision_boundary, particle_type)
+            actual = grid.query(player.vision_boundary, particle_type)
+            self.assertEqual([p.name for p in actual], [p.name for p in expected])
+
+
+class TestKnn(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+        self.area = Rectangle(Vector2(0, 0), Vector2(800, 600))
+        self.players = [Player(Vector2(random.uniform(0, 800), random.uniform(0, 600)), i) for i in range(80)]
+        for player in self.players:
+            player.add_score(random.randint(0, 40))
+        self.food = [Food(Vector2(random.uniform(0, 800), random.uniform(0, 600)), i) for i in range(300)]
+        self.max_radius = max(player.radius for player in self.players)
+
+    def build(self, index_type):
+        if index_type == "quadtree":
+            index = PartitionedIndex(self.area, lambda: QuadTree(self.area, 4))
+        else:
+            index = PartitionedIndex(self.area, lambda: SpatialHashGrid(self.area))
+        for particle in self.players + self.food:
+            index.insert(particle)
+        return index
+
+    @parameterized.expand([
+        ("quadtree",),
+        ("grid",),
+    ])
+    def test_knn_matches_range_query_inputs(self, index_type):
+        index = self.build(index_type)
+        for player in self.players:
+            vision = player.vision_boundary
+            expected = get_inputs(player, index.query(vision), index.query(vision, "Food"))
+
+            nearest_players = index.knn(player.position, 3, "Player", player.radius, vision, self.max_radius, player)
+            nearest_food = index.knn(player.position, 3, "Food", player.radius, vision, Food.radius)
+            actual = get_knn_inputs(player, nearest_players, nearest_food)
+
+            for a, e in zip(actual, expected):
+                self.assertAlmostEqual(float(a), float(e))
+
+    @parameterized.expand([
+        ("quadtree",),
+        ("grid",),
+    ])
+    def test_unbounded_knn_is_sorted_by_edge_distance(self, index_type):
+        index = self.build(index_type)
+        nearest = index.knn(Vector2(400, 300), 10, "Player", 5, max_radius=self.max_radius)
+
+        everyone = sorted(max(p.position.distance_to((400, 300)) - 5 - p.radius, 0) for p in self.players)
+        self.assertEqual(len(nearest), 10)
+        for (distance, _), expected in zip(nearest, everyone[:10]):
+            self.assertAlmostEqual(distance, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
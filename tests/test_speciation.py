@@ -0,0 +1,139 @@
+import copy
+import random
+import unittest
+
+from parameterized import parameterized
+
+from src.neat import DefaultGenome, DefaultSpeciesSet
+from src.neat.reporting import ReporterSet
+from src.neat.math_util import mean, stdev
+from src.neat.species import GenomeArrays, GenomeDistanceCache
+from tests.helpers import make_genomes, make_varied_config
+
+
+class PairwiseGenome(DefaultGenome):
+    """Overrides distance, so speciation falls back to comparing genomes one pair at a time."""
+
+    def distance(self, other, config):
+        return DefaultGenome.distance(self, other, config)
+
+
+class TestGenomeArrays(unittest.TestCase):
+    def setUp(self):
+        random.seed(31)
+        self.config = make_varied_config()
+        self.genomes = make_genomes(self.config, 30, 15)
+
+    def test_distances_are_identical_to_pairwise(self):
+        arrays = GenomeArrays(self.genomes)
+        for genome in self.genomes[:5]:
+            expected = [genome.distance(g, self.config.genome_config) for g in self.genomes]
+            self.assertEqual(arrays.distances(genome, self.genomes, self.config.genome_config).tolist(), expected)
+
+    def test_genome_without_genes(self):
+        empty = DefaultGenome(99)
+        arrays = GenomeArrays(self.genomes + [empty])
+        expected = [empty.distance(g, self.config.genome_config) for g in self.genomes + [empty]]
+        self.assertEqual(arrays.distances(empty, self.genomes + [empty], self.config.genome_config).tolist(),
+                         expected)
+
+    def test_supports_only_default_distance(self):
+        self.assertTrue(GenomeArrays.supports(self.genomes, self.config.genome_config))
+        self.assertFalse(GenomeArrays.supports([PairwiseGenome(0)], self.config.genome_config))
+
+
+class TestGenomeDistanceCache(unittest.TestCase):
+    def setUp(self):
+        random.seed(41)
+        self.config = make_varied_config()
+        self.genomes = make_genomes(self.config, 6, 10)
+        self.cache = GenomeDistanceCache(self.config.genome_config)
+        for i, g0 in enumerate(self.genomes):
+            for g1 in self.genomes[i:]:
+                self.cache(g0, g1)
+
+    def assert_statistics_match(self):
+        values = list(self.cache.distances.values())
+        self.assertAlmostEqual(self.cache.mean, mean(values))
+        self.assertAlmostEqual(self.cache.stdev(), stdev(values))
+
+    def test_each_pair_is_stored_once(self):
+        self.assertEqual(len(self.cache), 6 * 7 // 2)
+        d = self.cache(self.genomes[3], self.genomes[1])
+
+        self.assertEqual(d, self.cache.distances[1, 3])
+        self.assertEqual(len(self.cache), 6 * 7 // 2)
+        self.assertEqual(self.cache.hits, 1)
+        self.assert_statistics_match()
+
+    @parameterized.expand([
+        ("one", 5),
+        ("half", 3),
+        ("all", 0),
+    ])
+    def test_prune_evicts_missing_genomes(self, _, kept):
+        self.cache.prune(self.genomes[:kept])
+
+        self.assertEqual(len(self.cache), kept * (kept + 1) // 2)
+        self.assertEqual(set(self.cache.genomes), set(g.key for g in self.genomes[:kept]))
+        if kept:
+            self.assert_statistics_match()
+        else:
+            self.assertEqual((self.cache.count, self.cache.mean, self.cache.variance()), (0, 0.0, 0.0))
+
+    def test_prune_evicts_replaced_genome_with_same_key(self):
+        replacement = copy.deepcopy(self.genomes[0])
+        self.cache.prune([replacement] + self.genomes[1:])
+
+        self.assertNotIn(0, self.cache.genomes)
+        self.assertEqual(len(self.cache), 5 * 6 // 2)
+        self.assert_statistics_match()
+
+
+class TestSpeciate(unittest.TestCase):
+    def test_distances_survive_for_unchanged_genomes(self):
+        random.seed(43)
+        config = make_varied_config()
+        species_set = DefaultSpeciesSet(config.species_set_config, ReporterSet())
+        genomes = make_genomes(config, 40, 10)
+        population = dict((g.key, g) for g in genomes)
+        species_set.speciate(config, population, 0)
+
+        # Half the genomes carry over, as elites do
+        for g in make_genomes(config, 20, 10):
+            g.key += 40
+            population.pop(g.key - 40)
+            population[g.key] = g
+        kept = dict((pair, d) for pair, d in species_set.distances.distances.items()
+                    if pair[0] in population and pair[1] in population)
+        species_set.speciate(config, population, 1)
+
+        self.assertTrue(kept)
+        self.assertGreater(species_set.distances.hits, 0)
+        for pair, d in kept.items():
+            self.assertEqual(species_set.distances.distances[pair], d)
+        self.assertEqual(set(species_set.distances.genomes), set(population))
+
+    def test_species_match_pairwise_speciation(self):
+        random.seed(37)
+        config = make_varied_config()
+        config.species_set_config.compatibility_threshold = 1.5
+        vectorised = DefaultSpeciesSet(config.species_set_config, ReporterSet())
+        pairwise = DefaultSpeciesSet(config.species_set_config, ReporterSet())
+
+        for generation in range(4):
+            genomes = make_genomes(config, 60, 5 + 5 * generation)
+            population = dict((g.key, g) for g in genomes)
+            copies = {}
+            for g in genomes:
+                copy = PairwiseGenome(g.key)
+                copy.nodes, copy.connections = g.nodes, g.connections
+                copies[g.key] = copy
+
+            vectorised.speciate(config, population, generation)
+            pairwise.speciate(config, copies, generation)
+            self.assertEqual(vectorised.genome_to_species, pairwise.genome_to_species)
+
+
+if __name__ == "__main__":
+    unittest.main()
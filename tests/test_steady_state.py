@@ -0,0 +1,200 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from src.neat import DefaultGenome
+from src.neat.population import Population
+from src.neat.reporting import BaseReporter
+from src.sim import MultiArenaEvaluator
+from src.sim import simulation as simulation_module
+from tests.helpers import make_config, make_genomes
+from tests.test_multi_arena import score_fitness
+
+
+def make_steady_config(pop_size=30):
+    config = make_config()
+    config.pop_size = pop_size
+    config.no_fitness_termination = True
+    return config
+
+
+def genome_fitness(genome):
+    return float(sum(c.weight for c in genome.connections.values() if c.enabled))
+
+
+class ShuffledEvaluator(object):
+    """ Evaluates in process, finishing submitted batches in random order. """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.pending = []
+        self.batch_sizes = []
+
+    def submit(self, genomes, config):
+        self.pending.append(list(genomes))
+        self.batch_sizes.append(len(genomes))
+        assert len(self.pending) <= self.capacity
+
+    def collect(self):
+        batch = self.pending.pop(random.randrange(len(self.pending)))
+        return [(genome_id, genome_fitness(genome)) for genome_id, genome in batch]
+
+
+class CallRecorder(BaseReporter):
+    def __init__(self):
+        self.calls = []
+
+    def start_generation(self, generation):
+        self.calls.append(('start', generation))
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.calls.append(('post', len(population)))
+
+    def end_generation(self, config, population, species_set):
+        self.calls.append(('end', len(population)))
+
+
+class TestSpeciesSetAdd(unittest.TestCase):
+    def setUp(self):
+        random.seed(41)
+        self.config = make_steady_config()
+        self.population = Population(self.config)
+
+    def test_add_joins_species_of_nearest_representative(self):
+        species = self.population.species
+        genome = make_genomes(self.config, 1, 2)[0]
+        genome.key = 1000
+        sid = species.add(self.config, genome, 1)
+        self.assertIs(species.species[sid].members[1000], genome)
+        self.assertEqual(species.get_species_id(1000), sid)
+        distances = [(species.distances(s.representative, genome), i) for i, s in species.species.items()]
+        if min(distances)[0] < self.config.species_set_config.compatibility_threshold:
+            self.assertEqual(min(distances)[1], sid)
+
+    def test_distant_genome_founds_species(self):
+        species = self.population.species
+        self.config.species_set_config.compatibility_threshold = 0.0
+        genome = DefaultGenome(1000)
+        sid = species.add(self.config, genome, 1)
+        self.assertEqual(list(species.species[sid].members), [1000])
+        self.assertIs(species.species[sid].representative, genome)
+
+    def test_remove_drops_empty_species(self):
+        species = self.population.species
+        sid, s = next(iter(species.species.items()))
+        for key in list(s.members):
+            species.remove(key)
+            self.assertNotIn(key, species.genome_to_species)
+        self.assertNotIn(sid, species.species)
+
+
+class TestBreeding(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+        self.config = make_steady_config()
+        self.population = Population(self.config)
+        for genome in self.population.population.values():
+            genome.fitness = genome_fitness(genome)
+
+    @parameterized.expand([(True,), (False,)])
+    def test_breed_makes_new_genomes(self, batch_mutation):
+        reproduction = self.population.reproduction
+        reproduction.reproduction_config.batch_mutation = batch_mutation
+        offspring = reproduction.breed(self.config, self.population.species, 7)
+        self.assertEqual(len(offspring), 7)
+        for key, genome in offspring.items():
+            self.assertEqual(genome.key, key)
+            self.assertNotIn(key, self.population.population)
+            self.assertIsNone(genome.fitness)
+            for parent in reproduction.ancestors[key]:
+                self.assertIn(parent, self.population.population)
+
+    def test_worst_member_spares_elites(self):
+        reproduction = self.population.reproduction
+        species = self.population.species
+        worst = reproduction.worst_member(species)
+        s = species.species[species.get_species_id(worst)]
+        ranked = sorted(s.members.values(), reverse=True, key=lambda g: g.fitness)
+        elites = [g.key for g in ranked[:reproduction.reproduction_config.elitism]]
+        if len(s.members) > reproduction.reproduction_config.elitism:
+            self.assertNotIn(worst, elites)
+
+
+class TestRunAsync(unittest.TestCase):
+    def setUp(self):
+        random.seed(43)
+        self.config = make_steady_config()
+        self.population = Population(self.config)
+        self.recorder = CallRecorder()
+        self.population.add_reporter(self.recorder)
+
+    @parameterized.expand([(1,), (4,), (7,)])
+    def test_population_stays_evaluated_and_speciated(self, capacity):
+        evaluator = ShuffledEvaluator(capacity)
+        best = self.population.run_async(evaluator, 3)
+
+        population = self.population.population
+        self.assertEqual(len(population), self.config.pop_size)
+        self.assertTrue(all(g.fitness is not None for g in population.values()))
+        self.assertEqual(max(evaluator.batch_sizes), -(-self.config.pop_size // capacity))
+        self.assertGreaterEqual(best.fitness, max(g.fitness for g in population.values()))
+        # Every member is in exactly the species genome_to_species names
+        species = self.population.species
+        self.assertEqual(set(species.genome_to_species), set(population))
+        for sid, s in species.species.items():
+            for key in s.members:
+                self.assertEqual(species.genome_to_species[key], sid)
+        self.assertEqual(sum(len(s.members) for s in species.species.values()), self.config.pop_size)
+
+    def test_generations_are_reported(self):
+        self.population.run_async(ShuffledEvaluator(3), 2)
+        self.assertEqual(self.population.generation, 2)
+        size = self.config.pop_size
+        self.assertEqual(self.recorder.calls, [('start', 0), ('post', size), ('end', size),
+                                               ('start', 1), ('post', size), ('end', size)])
+
+    def test_offspring_replace_initial_population(self):
+        initial = set(self.population.population)
+        self.population.run_async(ShuffledEvaluator(3), 3)
+        self.assertLess(len(initial & set(self.population.population)), self.config.pop_size)
+
+    def test_stops_at_fitness_threshold(self):
+        self.config.no_fitness_termination = False
+        self.config.fitness_threshold = float('-inf')
+        self.population.run_async(ShuffledEvaluator(3), 5)
+        self.assertEqual(self.population.generation, 0)
+        self.assertEqual([call[0] for call in self.recorder.calls], ['start', 'post'])
+
+
+class TestMultiArenaEvaluatorAsync(unittest.TestCase):
+    def setUp(self):
+        random.seed(44)
+        # Short rounds keep the test fast; forked workers inherit the limit
+        self.frame_limit = simulation_module.FRAME_LIMIT
+        simulation_module.FRAME_LIMIT = 20
+        self.config = make_steady_config(12)
+
+    def tearDown(self):
+        simulation_module.FRAME_LIMIT = self.frame_limit
+
+    def test_submitted_arenas_are_collected(self):
+        evaluator = MultiArenaEvaluator(2, 3, 400, 300, score_fitness, seed=5)
+        genomes = list(enumerate(make_genomes(self.config, 6, 3)))
+        for start in range(0, 6, 2):
+            evaluator.submit(genomes[start:start + 2], self.config)
+        results = [evaluator.collect() for _ in range(3)]
+        self.assertEqual(sorted(key for batch in results for key, _ in batch), list(range(6)))
+        self.assertEqual(sorted(len(batch) for batch in results), [2, 2, 2])
+
+    def test_run_async_with_arenas(self):
+        population = Population(self.config)
+        evaluator = MultiArenaEvaluator(2, 3, 400, 300, score_fitness)
+        population.run_async(evaluator, 2)
+        self.assertEqual(population.generation, 2)
+        self.assertEqual(len(population.population), 12)
+        self.assertTrue(all(g.fitness is not None for g in population.population.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
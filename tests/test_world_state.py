@@ -0,0 +1,115 @@
+import math
+import unittest
+
+import numpy as np
+
+import settings
+from src.assets import Food, Player, Vector2, WorldState, check_collisions
+
+
+class TestWorldState(unittest.TestCase):
+    def setUp(self):
+        self.world = WorldState(3, 2)
+        self.players = [Player(Vector2(0, 0), i, self.world, i) for i in range(3)]
+
+    def test_player_is_a_view_onto_the_world(self):
+        player = self.players[1]
+        player.position.x = 12
+        player.position = Vector2(12, 34)
+        player.score = 7
+        player.failed = True
+
+        self.assertEqual(tuple(self.world.positions[1]), (12, 34))
+        self.assertEqual(self.world.scores[1], 7)
+        self.assertFalse(self.world.alive[1])
+
+    def test_attach_moves_state_into_another_world(self):
+        player = Player(Vector2(5, 6), 0)
+        player.add_score(3)
+        world = WorldState(2, 0)
+
+        player.attach(world, 1)
+
+        self.assertEqual(tuple(world.positions[1]), (5, 6))
+        self.assertEqual(world.scores[1], 3)
+        self.assertEqual(player.radius, settings.player["base_radius"] + 3)
+
+    def test_add_score_matches_single_player_rules(self):
+        self.world.scores[:] = [0, 59, 100]
+        self.world.add_score(np.arange(3), [1, 1, 10])
+
+        base = settings.player["base_radius"]
+        np.testing.assert_array_equal(self.world.scores, [1, 60, 110])
+        np.testing.assert_array_equal(self.world.radii, [base + 1, base + 60 + 1, base + 110 + 5])
+        np.testing.assert_array_equal(self.world.peak_scores, [1, 60, 110])
+
+    def test_move_all_steers_and_slows_players(self):
+        outputs = [-0.25, 0.5, 0.9]
+        self.world.positions[:] = [[50, 50], [10, 10], [100, 50]]
+        self.world.scores[:] = [0, 30, 500]
+
+        self.world.move_all(outputs, 200, 100)
+
+        for player, output, start in zip(self.players, outputs, [(50, 50), (10, 10), (100, 50)]):
+            angle = (output + 1) * math.pi
+            speed = max((1 - player.score / settings.player["speed_reduction_rate"]) * settings.player["max_speed"],
+                        settings.player["min_speed"])
+            self.assertEqual(player.speed, speed)
+            self.assertEqual(player.movement_angle, int(math.degrees(angle) % 360))
+            self.assertAlmostEqual(player.position.x, start[0] + math.cos(angle) * speed)
+            self.assertAlmostEqual(player.position.y, start[1] + math.sin(angle) * speed)
+        self.assertEqual(list(self.world.movement_changes), [1, 1, 1])
+
+    def test_move_all_wraps_around_the_map(self):
+        self.world.positions[:] = [[1, 50], [199, 50], [100, 99]]
+        # Left, right and down
+        self.world.move_all([0.0, -1.0, -0.5], 200, 100)
+        np.testing.assert_allclose(self.world.positions, [[200, 50], [0, 50], [100, 0]], atol=1e-9)
+
+    def test_punish_decays_and_floors_scores(self):
+        self.world.scores[:] = [10, 0.05, 0]
+        self.world.punish(self.world.alive)
+        np.testing.assert_allclose(self.world.scores, [10 * settings.player["score_reduction"], 0, 0])
+
+    def test_bigger_player_eats_touching_player(self):
+        self.world.positions[:] = [[0, 0], [3, 0], [500, 500]]
+        self.world.radii[:] = [20, 5, 5]
+        self.world.scores[1] = 4
+
+        eaters, victims = self.world.eat_players()
+
+        self.assertEqual(list(zip(eaters, victims)), [(0, 1)])
+        self.assertTrue(self.players[1].failed)
+        self.assertEqual(self.players[0].players_eaten, 1)
+        self.assertEqual(self.players[0].score, 4)
+
+    def test_similar_sized_players_do_not_eat(self):
+        self.world.positions[:] = [[0, 0], [3, 0], [500, 500]]
+        eaters, victims = self.world.eat_players()
+        self.assertEqual(len(victims), 0)
+        self.assertTrue(self.world.alive.all())
+
+    def test_food_goes_to_one_player(self):
+        food = [Food(Vector2(1, 0), i, self.world, i) for i in range(2)]
+        food[1].position = Vector2(900, 900)
+        self.world.positions[:] = [[0, 0], [2, 0], [500, 500]]
+
+        eaten = self.world.eat_food()
+
+        self.assertEqual(list(eaten), [0])
+        self.assertEqual(list(self.world.food_eaten), [0, 1, 0])
+        self.assertEqual(list(self.world.food_active), [False, True])
+
+    def test_respawned_food_avoids_players(self):
+        world = WorldState(1, 50)
+        world.positions[0] = [100, 100]
+        world.radii[0] = 60
+
+        world.respawn_food(200, 200, 0)
+
+        self.assertTrue(world.food_active.all())
+        self.assertFalse(check_collisions(world.food_positions, 20.0, world.positions, world.radii).any())
+
+
+if __name__ == "__main__":
+    unittest.main()